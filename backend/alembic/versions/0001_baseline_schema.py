@@ -0,0 +1,209 @@
+"""Baseline schema
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_baseline_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('tenant_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'], unique=False)
+    op.create_table('events',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('start_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('venue_name', sa.String(), nullable=True),
+    sa.Column('venue_address', sa.Text(), nullable=True),
+    sa.Column('expected_attendees', sa.Integer(), nullable=True),
+    sa.Column('max_attendees', sa.Integer(), nullable=True),
+    sa.Column('budget_total', sa.Float(), nullable=True),
+    sa.Column('budget_spent', sa.Float(), nullable=True),
+    sa.Column('brief_json', sa.JSON(), nullable=True),
+    sa.Column('created_by', sa.String(), nullable=False),
+    sa.Column('tenant_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_events_created_by'), 'events', ['created_by'], unique=False)
+    op.create_index(op.f('ix_events_name'), 'events', ['name'], unique=False)
+    op.create_index(op.f('ix_events_tenant_id'), 'events', ['tenant_id'], unique=False)
+    op.create_table('agents',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.Column('current_task', sa.Text(), nullable=True),
+    sa.Column('decisions', sa.JSON(), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_agents_event_id'), 'agents', ['event_id'], unique=False)
+    op.create_table('speakers',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('company', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('expertise', sa.JSON(), nullable=True),
+    sa.Column('session_title', sa.String(), nullable=True),
+    sa.Column('session_description', sa.Text(), nullable=True),
+    sa.Column('session_duration', sa.Integer(), nullable=True),
+    sa.Column('fee', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('travel_requirements', sa.JSON(), nullable=True),
+    sa.Column('dietary_restrictions', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_speakers_event_id'), 'speakers', ['event_id'], unique=False)
+    op.create_table('sponsors',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('contact_email', sa.String(), nullable=True),
+    sa.Column('contact_phone', sa.String(), nullable=True),
+    sa.Column('company_website', sa.String(), nullable=True),
+    sa.Column('sponsorship_level', sa.String(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('benefits', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('contract_signed', sa.Boolean(), nullable=True),
+    sa.Column('payment_received', sa.Boolean(), nullable=True),
+    sa.Column('logo_url', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sponsors_event_id'), 'sponsors', ['event_id'], unique=False)
+    op.create_table('venues',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('address', sa.Text(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=True),
+    sa.Column('price_per_day', sa.Float(), nullable=True),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('contact_email', sa.String(), nullable=True),
+    sa.Column('contact_phone', sa.String(), nullable=True),
+    sa.Column('amenities', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_venues_event_id'), 'venues', ['event_id'], unique=False)
+    op.create_table('agent_activities',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('agent_id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('requires_action', sa.Boolean(), nullable=True),
+    sa.Column('action_taken', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_agent_activities_agent_id'), 'agent_activities', ['agent_id'], unique=False)
+    op.create_index(op.f('ix_agent_activities_event_id'), 'agent_activities', ['event_id'], unique=False)
+    op.create_table('approvals',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('agent_id', sa.String(), nullable=False),
+    sa.Column('approver_id', sa.String(), nullable=True),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('comments', sa.Text(), nullable=True),
+    sa.Column('priority', sa.String(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ),
+    sa.ForeignKeyConstraint(['approver_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_approvals_agent_id'), 'approvals', ['agent_id'], unique=False)
+    op.create_index(op.f('ix_approvals_approver_id'), 'approvals', ['approver_id'], unique=False)
+    op.create_index(op.f('ix_approvals_event_id'), 'approvals', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_approvals_event_id'), table_name='approvals')
+    op.drop_index(op.f('ix_approvals_approver_id'), table_name='approvals')
+    op.drop_index(op.f('ix_approvals_agent_id'), table_name='approvals')
+    op.drop_table('approvals')
+    op.drop_index(op.f('ix_agent_activities_event_id'), table_name='agent_activities')
+    op.drop_index(op.f('ix_agent_activities_agent_id'), table_name='agent_activities')
+    op.drop_table('agent_activities')
+    op.drop_index(op.f('ix_venues_event_id'), table_name='venues')
+    op.drop_table('venues')
+    op.drop_index(op.f('ix_sponsors_event_id'), table_name='sponsors')
+    op.drop_table('sponsors')
+    op.drop_index(op.f('ix_speakers_event_id'), table_name='speakers')
+    op.drop_table('speakers')
+    op.drop_index(op.f('ix_agents_event_id'), table_name='agents')
+    op.drop_table('agents')
+    op.drop_index(op.f('ix_events_tenant_id'), table_name='events')
+    op.drop_index(op.f('ix_events_name'), table_name='events')
+    op.drop_index(op.f('ix_events_created_by'), table_name='events')
+    op.drop_table('events')
+    op.drop_index(op.f('ix_users_tenant_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,63 @@
+"""Composite, partial and trigram indexes for the hot query shapes
+
+Revision ID: 0002_query_indexes
+Revises: 0001_baseline_schema
+Create Date: 2026-10-17 00:00:00.000000
+
+Indexes are built CONCURRENTLY so the migration can run against a live database
+without blocking writes; each statement therefore runs outside a transaction.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_query_indexes"
+down_revision = "0001_baseline_schema"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # GET /events: tenant listing ordered by (created_at, id), optionally filtered by status
+    ("ix_events_tenant_created", "events", ["tenant_id", "created_at", "id"], {}),
+    ("ix_events_tenant_status_created", "events", ["tenant_id", "status", "created_at"], {}),
+    # GET /events?city=: ILIKE '%...%' cannot use a btree index
+    (
+        "ix_events_city_trgm", "events", ["city"],
+        {"postgresql_using": "gin", "postgresql_ops": {"city": "gin_trgm_ops"}}
+    ),
+    # GET /agents: agents of an event filtered by status and type, keyset ordered
+    ("ix_agents_event_status_type", "agents", ["event_id", "status", "type"], {}),
+    ("ix_agents_event_created", "agents", ["event_id", "created_at", "id"], {}),
+    # Running agents are a small, hot slice of the table
+    ("ix_agents_running", "agents", ["event_id"], {"postgresql_where": sa.text("status = 'running'")}),
+    # Approval queues per event
+    ("ix_approvals_event_status_created", "approvals", ["event_id", "status", "created_at"], {}),
+    ("ix_approvals_pending", "approvals", ["event_id", "created_at"], {"postgresql_where": sa.text("status = 'pending'")}),
+    # Activity feed per agent
+    ("ix_agent_activities_agent_created", "agent_activities", ["agent_id", "created_at"], {}),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **options
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""Agent workflow step checkpoints
+
+Revision ID: 0003_agent_checkpoints
+Revises: 0002_query_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_agent_checkpoints"
+down_revision = "0002_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('agent_checkpoints',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('agent_id', sa.String(), nullable=False),
+    sa.Column('step', sa.String(), nullable=False),
+    sa.Column('output', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('agent_id', 'step', name='uq_agent_checkpoints_agent_step')
+    )
+    op.create_index(op.f('ix_agent_checkpoints_agent_id'), 'agent_checkpoints', ['agent_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_agent_checkpoints_agent_id'), table_name='agent_checkpoints')
+    op.drop_table('agent_checkpoints')
@@ -14,6 +14,7 @@ from .marketing_ops import MarketingOpsAgent
 from .attendee_experience import AttendeeExperienceAgent
 from .logistics_travel import LogisticsTravelAgent
 from .risk_compliance import RiskComplianceAgent
+from .crew import CrewOrchestrator, AGENT_DEPENDENCIES
 
 __all__ = [
     "BaseAgent",
@@ -24,7 +25,9 @@ __all__ = [
     "MarketingOpsAgent",
     "AttendeeExperienceAgent",
     "LogisticsTravelAgent",
-    "RiskComplianceAgent"
+    "RiskComplianceAgent",
+    "CrewOrchestrator",
+    "AGENT_DEPENDENCIES"
 ]
 
 # Agent type mapping for easy instantiation
@@ -47,10 +50,10 @@ def create_agent(agent_type: str, agent_id: str, event_id: str) -> BaseAgent:
         agent_type: Type of agent to create
         agent_id: Unique identifier for the agent
         event_id: Event identifier the agent will work on
-        
+    
     Returns:
         BaseAgent: Instance of the specified agent type
-        
+    
     Raises:
         ValueError: If agent_type is not recognized
     """
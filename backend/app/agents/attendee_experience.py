@@ -1,11 +1,35 @@
 from typing import Dict, Any, List
 from langchain.schema import HumanMessage, SystemMessage
+from app.core.config import settings
 from .base_agent import BaseAgent
+from .networking_matcher import networking_matcher
+import asyncio
 import json
 
 class AttendeeExperienceAgent(BaseAgent):
     """AI agent responsible for managing attendee engagement and satisfaction."""
     
+    STEP_INPUTS = {
+        "analyze_attendee_needs": {"fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date")},
+        "design_attendee_experience": {
+            "fields": ("name", "description", "expected_attendees", "max_attendees", "city", "country", "start_date", "end_date", "venue_name", "budget_total", "brief_json"),
+            "steps": ("analyze_attendee_needs",)
+        },
+        # Networking formats follow the audience and schedule; spend is settled by hospitality
+        "plan_networking_activities": {
+            "fields": ("name", "description", "expected_attendees", "max_attendees", "start_date", "end_date", "venue_name", "brief_json"),
+            "steps": ("design_attendee_experience",),
+            "ignore": ("budget_total",)
+        },
+        "match_attendees": {"fields": ("brief_json",)},
+        "coordinate_hospitality_services": {"steps": ("design_attendee_experience",), "agents": ("venue_scout", "budget_controller")},
+        "create_communication_strategy": {
+            "fields": ("name", "start_date", "end_date", "city", "country", "venue_name", "venue_address", "brief_json"),
+            "steps": ("design_attendee_experience",),
+            "ignore": ("budget_total",)
+        },
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "attendee_experience")
     
@@ -31,30 +55,37 @@ class AttendeeExperienceAgent(BaseAgent):
         await self.update_progress(10, "Analyzing attendee needs and preferences...")
         
         # Step 1: Analyze attendee needs and preferences
-        attendee_analysis = await self._analyze_attendee_needs(event_data)
+        attendee_analysis = await self.run_step("analyze_attendee_needs", lambda: self._analyze_attendee_needs(event_data))
         await self.log_activity("Analyzed attendee needs", "info", attendee_analysis)
         
         await self.update_progress(25, "Designing attendee experience...")
         
         # Step 2: Design attendee experience
-        experience_design = await self._design_attendee_experience(event_data, attendee_analysis)
+        experience_design = await self.run_step("design_attendee_experience", lambda: self._design_attendee_experience(event_data, attendee_analysis))
         await self.log_activity("Designed attendee experience", "info", {"experience_type": experience_design.get("type", "Unknown")})
         
         await self.update_progress(40, "Planning networking activities...")
         
         # Step 3: Plan networking activities
-        networking_plan = await self._plan_networking_activities(experience_design, event_data)
+        networking_plan = await self.run_step("plan_networking_activities", lambda: self._plan_networking_activities(experience_design, event_data))
         await self.log_activity("Planned networking activities", "info", {"activity_count": len(networking_plan.get("activities", []))})
         
+        # Pair registered attendees for meetings and roundtables
+        attendees = (event_data.get("brief_json") or {}).get("attendees") or []
+        if attendees and settings.NETWORKING_MATCHING_ENABLED:
+            await self.update_progress(50, "Matching attendees for networking...")
+            matchmaking = await self.run_step("match_attendees", lambda: self._match_attendees(attendees))
+            networking_plan = {**networking_plan, "matchmaking": matchmaking}
+        
         await self.update_progress(60, "Coordinating hospitality services...")
         
         # Step 4: Coordinate hospitality services
-        hospitality_plan = await self._coordinate_hospitality_services(experience_design, other_agents_data)
+        hospitality_plan = await self.run_step("coordinate_hospitality_services", lambda: self._coordinate_hospitality_services(experience_design, other_agents_data))
         
         await self.update_progress(80, "Creating communication strategy...")
         
         # Step 5: Create communication strategy
-        communication_strategy = await self._create_communication_strategy(experience_design, event_data)
+        communication_strategy = await self.run_step("create_communication_strategy", lambda: self._create_communication_strategy(experience_design, event_data))
         
         await self.update_progress(90, "Requesting approval for experience plan...")
         
@@ -324,6 +355,11 @@ class AttendeeExperienceAgent(BaseAgent):
                 ]
             }
     
+    async def _match_attendees(self, attendees: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Plan 1:1 meetings and roundtables from attendee interests and goals."""
+        # Matching thousands of attendees is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(networking_matcher.match, attendees)
+    
     async def _plan_networking_activities(self, experience_design: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Plan networking activities and opportunities."""
         attendees = event_data.get('expected_attendees', 100)
@@ -1,18 +1,65 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable, AsyncIterator, Tuple
+from datetime import datetime, timezone
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
 from app.core.config import settings
+from app.core.llm_cache import llm_cache
+from app.core.llm_clients import llm_clients, llm_call_context
+from app.core.llm_singleflight import llm_singleflight
+from app.core.llm_rate_limit import llm_rate_limiters, estimate_tokens, estimate_text_tokens, is_rate_limit_error, UsageRecorder, PRIORITY_NORMAL
+from app.core.llm_router import llm_router
+from app.core.agent_events import agent_events
+from app.core.activity_buffer import activity_buffer
+from app.core.checkpoints import checkpoint_store
 import asyncio
 import logging
+import sys
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cap on concurrent fan-out LLM calls, shared by all agents
+_global_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+def get_global_llm_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide semaphore bounding concurrent fan-out LLM calls."""
+    global _global_llm_semaphore
+    if _global_llm_semaphore is None:
+        _global_llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return _global_llm_semaphore
+
+# Callbacks notified after every get_llm_response call (benchmarks, recorders)
+LLMCallObserver = Callable[[Dict[str, Any]], None]
+_llm_observers: List[LLMCallObserver] = []
+
+def add_llm_observer(observer: LLMCallObserver):
+    """Register a callback receiving a record of each agent LLM call."""
+    _llm_observers.append(observer)
+
+def remove_llm_observer(observer: LLMCallObserver):
+    """Unregister a callback added with add_llm_observer."""
+    if observer in _llm_observers:
+        _llm_observers.remove(observer)
+
+def _notify_llm_observers(call: Dict[str, Any]):
+    for observer in list(_llm_observers):
+        try:
+            observer(call)
+        except Exception as e:
+            logger.warning(f"LLM call observer failed: {str(e)}")
+
 class BaseAgent(ABC):
     """Base class for all AI agents in the conference planning system."""
     
+    # Inputs of each workflow step, keyed by run_step name in workflow order:
+    #   fields - event fields the step reads
+    #   steps  - earlier steps whose output it takes
+    #   agents - upstream agents whose results it reads from context["other_agents"]
+    #   ignore - event fields that reach it through earlier steps without affecting it
+    # Used by the re-planner to recompute only the steps an event edit affects.
+    STEP_INPUTS: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    
     def __init__(self, agent_id: str, event_id: str, agent_type: str):
         self.agent_id = agent_id
         self.event_id = event_id
@@ -22,24 +69,12 @@ class BaseAgent(ABC):
         self.current_task = ""
         self.decisions: List[Dict[str, Any]] = []
         self.metadata: Dict[str, Any] = {}
+        self._checkpoints: Dict[str, Any] = {}
+        self._llm_semaphore = asyncio.Semaphore(settings.AGENT_LLM_CONCURRENCY)
         
-        # Initialize LLM clients
-        self.openai_client = None
-        self.anthropic_client = None
-        
-        if settings.OPENAI_API_KEY:
-            self.openai_client = ChatOpenAI(
-                model="gpt-4-turbo-preview",
-                temperature=0.1,
-                api_key=settings.OPENAI_API_KEY
-            )
-        
-        if settings.ANTHROPIC_API_KEY:
-            self.anthropic_client = ChatAnthropic(
-                model="claude-3-sonnet-20240229",
-                temperature=0.1,
-                api_key=settings.ANTHROPIC_API_KEY
-            )
+        # Shared LLM clients (created once per process and reused by every agent)
+        self.openai_client = llm_clients.get_openai()
+        self.anthropic_client = llm_clients.get_anthropic()
     
     @abstractmethod
     async def execute_workflow(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -51,36 +86,67 @@ class BaseAgent(ABC):
         """Get the system prompt for this agent. Must be implemented by subclasses."""
         pass
     
-    async def start_workflow(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Start the agent workflow with proper status tracking."""
+    async def start_workflow(self, context: Dict[str, Any], resume: bool = False) -> Dict[str, Any]:
+        """Start the agent workflow with proper status tracking.
+        
+        With resume, steps checkpointed by an earlier run of this agent (interrupted, failed,
+        or completed and since re-planned) are skipped and their saved outputs reused.
+        """
         try:
             self.status = "running"
             self.progress = 0
             self.current_task = "Initializing workflow..."
+            await self.publish_status()
             
-            logger.info(f"Starting {self.agent_type} workflow for event {self.event_id}")
+            self._checkpoints = {}
+            if settings.CHECKPOINTS_ENABLED:
+                if resume:
+                    self._checkpoints = await checkpoint_store.load(self.agent_id)
+                else:
+                    # A fresh run must not pick up a previous run's steps later
+                    await checkpoint_store.clear(self.agent_id)
             
-            # Execute the main workflow
+            if self._checkpoints:
+                logger.info(f"Resuming {self.agent_type} workflow for event {self.event_id} after {len(self._checkpoints)} completed steps")
+            else:
+                logger.info(f"Starting {self.agent_type} workflow for event {self.event_id}")
+            
+            # Execute the main workflow; checkpoints are kept so a later event edit
+            # only recomputes the steps it affects (see app.agents.replanning)
             result = await self.execute_workflow(context)
             
             self.status = "completed"
             self.progress = 100
             self.current_task = "Workflow completed successfully"
+            await self.publish_status()
             
             logger.info(f"Completed {self.agent_type} workflow for event {self.event_id}")
             
             return result
-            
+        
         except Exception as e:
             self.status = "error"
             self.current_task = f"Error: {str(e)}"
+            await self.publish_status()
             logger.error(f"Error in {self.agent_type} workflow: {str(e)}")
             raise
     
+    async def run_step(self, step: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a workflow step and checkpoint its output, or reuse the output saved by an earlier run."""
+        if step in self._checkpoints:
+            logger.info(f"Skipping {self.agent_type} step {step} for agent {self.agent_id}: restored from checkpoint")
+            return self._checkpoints[step]
+        
+        output = await func()
+        if settings.CHECKPOINTS_ENABLED:
+            await checkpoint_store.save(self.agent_id, step, output)
+        return output
+    
     async def request_approval(self, approval_data: Dict[str, Any]) -> str:
         """Request human approval for a decision."""
         self.status = "waiting_approval"
         self.current_task = "Waiting for human approval"
+        await self.publish_status()
         
         # Create approval record
         approval = {
@@ -92,8 +158,19 @@ class BaseAgent(ABC):
             "created_at": datetime.utcnow().isoformat()
         }
         
-        # TODO: Save approval to database
-        # await self.save_approval(approval)
+        if settings.ACTIVITY_PERSISTENCE_ENABLED:
+            activity_buffer.add_approval({
+                "id": approval["id"],
+                "event_id": self.event_id,
+                "agent_id": self.agent_id,
+                "type": approval["type"],
+                "status": "pending",
+                "title": f"{self.agent_type.replace('_', ' ').title()} approval: {approval_data.get('type', 'decision')}",
+                "description": approval_data.get("reasoning"),
+                "data": approval_data,
+                "priority": "normal",
+                "created_at": datetime.now(timezone.utc)
+            })
         
         logger.info(f"Requesting approval for {self.agent_type} agent")
         
@@ -120,6 +197,12 @@ class BaseAgent(ABC):
         self.progress = max(0, min(100, progress))
         self.current_task = task
         
+        await self.publish_update({
+            "type": "progress",
+            "progress": self.progress,
+            "current_task": self.current_task
+        })
+        
         logger.debug(f"{self.agent_type} agent progress: {progress}% - {task}")
     
     async def log_activity(self, message: str, activity_type: str = "info", data: Optional[Dict[str, Any]] = None):
@@ -133,25 +216,348 @@ class BaseAgent(ABC):
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # TODO: Save activity to database
-        # await self.save_activity(activity)
+        if settings.ACTIVITY_PERSISTENCE_ENABLED:
+            activity_buffer.add_activity({
+                "id": str(uuid.uuid4()),
+                "agent_id": self.agent_id,
+                "event_id": self.event_id,
+                "type": activity_type,
+                "message": message,
+                "data": activity["data"],
+                "requires_action": False,
+                "action_taken": False,
+                "created_at": datetime.now(timezone.utc)
+            })
+        
+        await self.publish_update({**activity, "type": "activity", "activity_type": activity_type})
         
         logger.info(f"{self.agent_type} activity: {message}")
     
-    async def get_llm_response(self, messages: List[BaseMessage], use_anthropic: bool = False) -> str:
-        """Get a response from the LLM."""
+    async def publish_update(self, message: Dict[str, Any]):
+        """Push a live update to WebSocket subscribers of this agent and its event."""
+        await agent_events.publish(self.agent_id, self.event_id, message)
+    
+    async def publish_status(self):
+        """Push the agent's current status to live subscribers."""
+        await self.publish_update({
+            "type": "status",
+            "status": self.status,
+            "progress": self.progress,
+            "current_task": self.current_task
+        })
+    
+    def _llm_providers(self, use_anthropic: bool = False) -> List[Tuple[str, Any]]:
+        """Get the available (provider, client) pairs, preferred provider first."""
+        providers = [("openai", self.openai_client), ("anthropic", self.anthropic_client)]
+        if use_anthropic:
+            providers.reverse()
+        
+        available = [(provider, client) for provider, client in providers if client]
+        if not available:
+            raise Exception("No LLM client available")
+        return available
+    
+    def _select_llm_client(self, use_anthropic: bool = False) -> Tuple[Any, str]:
+        """Pick the LLM client and provider name for a call."""
+        provider, client = self._llm_providers(use_anthropic)[0]
+        return client, provider
+    
+    @staticmethod
+    def _model_name(client: Any) -> str:
+        return getattr(client, "model_name", None) or getattr(client, "model", "unknown")
+    
+    async def get_llm_response(
+        self,
+        messages: List[BaseMessage],
+        use_anthropic: bool = False,
+        use_cache: bool = True,
+        priority: int = PRIORITY_NORMAL,
+        step: Optional[str] = None
+    ) -> str:
+        """Get a response from the LLM, served from the response cache when possible.
+        
+        Lower priority values are scheduled first when the provider's rate budget is contended.
+        With both providers configured, the call is routed (hedged or failed over) between them.
+        The step defaults to the name of the calling method and is reported to LLM call observers.
+        """
+        step = step or sys._getframe(1).f_code.co_name
+        context_token = llm_call_context.set({"agent_type": self.agent_type, "agent_id": self.agent_id, "step": step})
+        call: Dict[str, Any] = {
+            "agent_type": self.agent_type,
+            "agent_id": self.agent_id,
+            "event_id": self.event_id,
+            "step": step,
+            "provider": None,
+            "model": None,
+            "cached": False,
+            "provider_latency": None,
+            "error": None
+        }
+        started = time.perf_counter()
+        content: Optional[str] = None
+        
         try:
-            if use_anthropic and self.anthropic_client:
-                response = await self.anthropic_client.ainvoke(messages)
-                return response.content
-            elif self.openai_client:
-                response = await self.openai_client.ainvoke(messages)
-                return response.content
-            else:
-                raise Exception("No LLM client available")
+            content = await self._get_llm_response(messages, use_anthropic, use_cache, priority, call)
+            return content
         except Exception as e:
+            call["error"] = str(e)
             logger.error(f"Error getting LLM response: {str(e)}")
             raise
+        finally:
+            llm_call_context.reset(context_token)
+            if _llm_observers:
+                if content is None and call["error"] is None:
+                    call["error"] = "cancelled"
+                call.update({
+                    "messages": messages,
+                    "response": content,
+                    "latency": time.perf_counter() - started,
+                    "prompt_tokens": estimate_tokens(messages, call["model"]),
+                    "completion_tokens": estimate_text_tokens(content, call["model"]) if content else 0
+                })
+                _notify_llm_observers(call)
+    
+    async def _get_llm_response(
+        self,
+        messages: List[BaseMessage],
+        use_anthropic: bool,
+        use_cache: bool,
+        priority: int,
+        call: Dict[str, Any]
+    ) -> str:
+        providers = self._llm_providers(use_anthropic)
+        clients = dict(providers)
+        primary_provider, primary_client = providers[0]
+        call["provider"], call["model"] = primary_provider, self._model_name(primary_client)
+        prompt_key = llm_cache.make_key(call["model"], getattr(primary_client, "temperature", None), messages)
+        use_cache = use_cache and settings.LLM_CACHE_ENABLED
+        
+        if use_cache:
+            cached = await llm_cache.get(prompt_key)
+            if cached is not None:
+                call["cached"] = True
+                return cached
+        
+        async def attempt(provider: str, is_hedge: bool, started: asyncio.Event) -> str:
+            client = clients[provider]
+            timing: Dict[str, float] = {}
+            # Only the primary streams tokens, so a hedge never interleaves with it on the socket
+            content = await self._fetch_llm_response(
+                messages, client, provider, self._model_name(client), priority,
+                stream=not is_hedge, timing=timing, started=started
+            )
+            call["provider"], call["model"] = provider, self._model_name(client)
+            call["provider_latency"] = timing.get("latency")
+            return content
+        
+        async def fetch() -> str:
+            content = await llm_router.call([provider for provider, _ in providers], attempt)
+            if use_cache:
+                # Cache under the model that answered, so a hedge win is never served as the primary's answer
+                answered = clients[call["provider"]]
+                await llm_cache.set(llm_cache.make_key(call["model"], getattr(answered, "temperature", None), messages), content)
+            return content
+        
+        if settings.LLM_SINGLEFLIGHT_ENABLED:
+            # Identical prompts already in flight share one provider call
+            return await llm_singleflight.run(prompt_key, fetch)
+        return await fetch()
+    
+    async def _fetch_llm_response(
+        self,
+        messages: List[BaseMessage],
+        client: Any,
+        provider: str,
+        model: str,
+        priority: int = PRIORITY_NORMAL,
+        stream: bool = True,
+        timing: Optional[Dict[str, float]] = None,
+        started: Optional[asyncio.Event] = None
+    ) -> str:
+        """Make the provider call for a prompt within its rate budget, retrying after 429s.
+        
+        The provider round-trip time of the successful call is stored in timing["latency"],
+        and started is set once the first request is sent to the provider.
+        """
+        if not settings.LLM_RATE_LIMIT_ENABLED:
+            content, _ = await self._call_llm(messages, client, provider, stream, timing, started)
+            return content
+        
+        limiter = llm_rate_limiters.get(provider, model)
+        prompt_tokens = estimate_tokens(messages, model)
+        reserved = prompt_tokens + settings.LLM_COMPLETION_TOKENS_ESTIMATE
+        
+        for attempt in range(settings.LLM_RATE_LIMIT_MAX_RETRIES + 1):
+            await limiter.acquire(reserved, priority)
+            try:
+                content, used_tokens = await self._call_llm(messages, client, provider, stream, timing, started)
+            except BaseException as e:
+                rate_limited = isinstance(e, Exception) and is_rate_limit_error(e)
+                # Errors, timeouts and cancelled hedges return their reservation; a request that
+                # reached the provider is still charged its prompt, a rejected one nothing
+                sent = started is not None and started.is_set()
+                limiter.release_unused(reserved, prompt_tokens if sent and not rate_limited else 0)
+                if not rate_limited or attempt == settings.LLM_RATE_LIMIT_MAX_RETRIES:
+                    raise
+                # The limiter pauses the queue, so the retry waits in acquire()
+                response = getattr(e, "response", None)
+                limiter.record_rate_limit(getattr(response, "headers", None))
+                continue
+            
+            limiter.record_success()
+            # Give back the reservation the response did not use
+            if used_tokens is None:
+                used_tokens = prompt_tokens + estimate_text_tokens(content, model)
+            limiter.release_unused(reserved, used_tokens)
+            return content
+    
+    async def _call_llm(
+        self,
+        messages: List[BaseMessage],
+        client: Any,
+        provider: str,
+        stream: bool = True,
+        timing: Optional[Dict[str, float]] = None,
+        started: Optional[asyncio.Event] = None
+    ) -> Tuple[str, Optional[int]]:
+        """Make one provider call, streaming tokens when enabled.
+        
+        Returns the content and the total tokens the provider reported, if it did.
+        """
+        if stream and settings.LLM_STREAM_RESPONSES:
+            return "".join([delta async for delta in self._stream_llm(messages, client, provider, timing, started)]), None
+        
+        usage = UsageRecorder()
+        async with llm_clients.get_semaphore(provider):
+            if started is not None:
+                started.set()
+            sent_at = time.perf_counter()
+            response = await client.ainvoke(messages, config={"callbacks": [usage]})
+            self._record_round_trip(provider, time.perf_counter() - sent_at, timing)
+        return response.content, usage.total_tokens
+    
+    @staticmethod
+    def _record_round_trip(provider: str, seconds: float, timing: Optional[Dict[str, float]]):
+        llm_router.record_latency(provider, seconds)
+        if timing is not None:
+            timing["latency"] = seconds
+    
+    async def stream_llm_response(self, messages: List[BaseMessage], use_anthropic: bool = False) -> AsyncIterator[str]:
+        """Stream a response from the LLM, publishing each token delta to live subscribers."""
+        client, provider = self._select_llm_client(use_anthropic)
+        async for delta in self._stream_llm(messages, client, provider):
+            yield delta
+    
+    async def _stream_llm(
+        self,
+        messages: List[BaseMessage],
+        client: Any,
+        provider: str,
+        timing: Optional[Dict[str, float]] = None,
+        started: Optional[asyncio.Event] = None
+    ) -> AsyncIterator[str]:
+        stream_id = uuid.uuid4().hex
+        buffered: List[str] = []
+        flushed_at = time.monotonic()
+        publishing: Optional[asyncio.Task] = None
+        
+        def publish(message: Dict[str, Any]):
+            # Publish in the background, each message after the previous one, so
+            # subscribers never hold up the stream or the provider slot
+            nonlocal publishing
+            previous = publishing
+            
+            async def send():
+                if previous is not None:
+                    await previous
+                try:
+                    await self.publish_update(message)
+                except Exception as e:
+                    logger.warning(f"Failed to publish token deltas: {str(e)}")
+            
+            publishing = asyncio.create_task(send())
+        
+        def flush():
+            nonlocal flushed_at
+            if buffered:
+                publish({
+                    "type": "token",
+                    "stream_id": stream_id,
+                    "current_task": self.current_task,
+                    "delta": "".join(buffered)
+                })
+                buffered.clear()
+            flushed_at = time.monotonic()
+        
+        async with llm_clients.get_semaphore(provider):
+            if started is not None:
+                started.set()
+            sent_at = time.perf_counter()
+            async for chunk in client.astream(messages):
+                delta = chunk.content
+                if not delta:
+                    continue
+                
+                # Coalesce deltas into one message per interval or token count
+                buffered.append(delta)
+                if len(buffered) >= settings.LLM_STREAM_FLUSH_TOKENS or time.monotonic() - flushed_at >= settings.LLM_STREAM_FLUSH_SECONDS:
+                    flush()
+                yield delta
+            self._record_round_trip(provider, time.perf_counter() - sent_at, timing)
+        
+        flush()
+        publish({"type": "token_end", "stream_id": stream_id})
+        await publishing
+    
+    async def iter_concurrent(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Run an async function over items concurrently, yielding (index, result) as each completes.
+        
+        Concurrency is bounded by the process-wide semaphore and by either the
+        per-agent semaphore or, when given, a dedicated limit for this batch.
+        When fan-out is disabled the items are processed sequentially.
+        """
+        items = list(items)
+        
+        if not settings.LLM_FANOUT_ENABLED:
+            for index, item in enumerate(items):
+                yield index, await func(item)
+            return
+        
+        agent_semaphore = asyncio.Semaphore(limit) if limit else self._llm_semaphore
+        global_semaphore = get_global_llm_semaphore()
+        
+        async def run(index: int, item: Any) -> Tuple[int, Any]:
+            async with agent_semaphore:
+                async with global_semaphore:
+                    return index, await func(item)
+        
+        tasks = [asyncio.ensure_future(run(index, item)) for index, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def map_concurrent(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """Run an async function over items concurrently, returning results in input order."""
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        
+        async for index, result in self.iter_concurrent(func, items, limit):
+            results[index] = result
+        
+        return results
     
     def get_agent_state(self) -> Dict[str, Any]:
         """Get the current state of the agent."""
@@ -0,0 +1,276 @@
+"""
+Budget Allocation for OrchestrateX
+
+This module splits an event budget across spending categories without an LLM. Each
+category has a minimum and maximum share of the budget, a need derived from per-attendee
+benchmarks, a priority, and possibly costs already committed by other agents (the chosen
+venue, the speaker lineup). The allocator first covers every category's floor, then fills
+needs in priority order (splitting proportionally within a priority level), which is the
+optimal solution of this bounded, weighted linear program. Budget left once all needs are
+met goes to contingency and the rest is reported as savings. When commitments leave too
+little for every floor, the uncommitted part of the floors is scaled down to fit; only
+commitments that alone exceed the total make the allocation infeasible.
+
+Category bounds are cached, so when a single input changes only that category's bounds
+are recomputed before the fill pass is rerun, and the categories that moved are reported.
+"""
+
+import logging
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+from .venue_ranking import parse_number
+
+logger = logging.getLogger(__name__)
+
+# Default categories: share bounds of the total budget, need per attendee and priority
+DEFAULT_CATEGORIES: Dict[str, Dict[str, Any]] = {
+    "venue_facilities": {
+        "min_share": 0.25, "max_share": 0.45, "per_attendee": 60.0, "priority": 5,
+        "items": ["Venue rental", "Setup/teardown", "Insurance"],
+        "justification": "Primary event space and facilities"
+    },
+    "speakers_entertainment": {
+        "min_share": 0.10, "max_share": 0.30, "per_attendee": 35.0, "priority": 4,
+        "items": ["Speaker fees", "Travel expenses", "Materials"],
+        "justification": "Quality content and engagement"
+    },
+    "catering_refreshments": {
+        "min_share": 0.08, "max_share": 0.20, "per_attendee": 45.0, "priority": 4,
+        "items": ["Meals", "Coffee breaks", "Special dietary needs"],
+        "justification": "Attendee experience and comfort"
+    },
+    "marketing_promotion": {
+        "min_share": 0.08, "max_share": 0.18, "per_attendee": 20.0, "priority": 3,
+        "items": ["Digital marketing", "Print materials", "Social media"],
+        "justification": "Event promotion and awareness"
+    },
+    "technology_av": {
+        "min_share": 0.04, "max_share": 0.12, "per_attendee": 15.0, "priority": 3,
+        "items": ["AV equipment", "WiFi", "Streaming services"],
+        "justification": "Technical infrastructure"
+    },
+    "staffing_operations": {
+        "min_share": 0.04, "max_share": 0.12, "per_attendee": 15.0, "priority": 2,
+        "items": ["Event staff", "Security", "Coordination"],
+        "justification": "Event execution and safety"
+    },
+    "contingency": {
+        "min_share": 0.05, "max_share": 0.10, "per_attendee": 0.0, "priority": 1,
+        "items": ["Emergency fund", "Unforeseen expenses"],
+        "justification": "Risk mitigation and flexibility"
+    },
+}
+
+# Category receiving budget left over once every need is met
+RESERVE_CATEGORY = "contingency"
+
+# Benchmark keys of the requirements analysis and the categories they price
+BENCHMARK_KEYS = {
+    "venue_per_attendee": "venue_facilities",
+    "speaker_per_attendee": "speakers_entertainment",
+    "catering_per_attendee": "catering_refreshments",
+    "marketing_per_attendee": "marketing_promotion",
+    "technology_per_attendee": "technology_av",
+    "staffing_per_attendee": "staffing_operations",
+}
+
+def benchmarks_from_requirements(requirements: Dict[str, Any]) -> Dict[str, float]:
+    """Per-attendee needs by category from a requirements analysis' industry_benchmarks."""
+    benchmarks: Dict[str, float] = {}
+    for key, value in (requirements.get("industry_benchmarks") or {}).items():
+        category = BENCHMARK_KEYS.get(key)
+        if category is not None and isinstance(value, (int, float)) and value >= 0:
+            benchmarks[category] = float(value)
+    return benchmarks
+
+def _amount(value: Any) -> float:
+    number = parse_number(value)
+    return 0.0 if math.isnan(number) else number
+
+def committed_costs(other_agents_data: Dict[str, Any], event_days: int = 1) -> Dict[str, float]:
+    """Costs by category already committed by the venue scout and speaker outreach results."""
+    committed: Dict[str, float] = {}
+    
+    venue = (other_agents_data.get("venue_scout") or {}).get("top_venue") or {}
+    costs = venue.get("cost_breakdown") or {}
+    daily_rate = _amount(costs.get("daily_rate")) or _amount((venue.get("venue_data") or {}).get("daily_rate"))
+    if daily_rate:
+        committed["venue_facilities"] = daily_rate * max(event_days, 1)
+    if _amount(costs.get("catering")):
+        committed["catering_refreshments"] = _amount(costs.get("catering"))
+    
+    lineup = (other_agents_data.get("speaker_outreach") or {}).get("proposed_lineup") or {}
+    speaker_cost = _amount(lineup.get("total_cost")) or sum(
+        _amount(speaker.get("estimated_fee"))
+        for group in ("keynote_speakers", "panel_speakers", "workshop_leaders")
+        for speaker in lineup.get(group) or ()
+        if isinstance(speaker, dict)
+    )
+    if speaker_cost:
+        committed["speakers_entertainment"] = speaker_cost
+    
+    return committed
+
+class BudgetAllocator:
+    """Bounded, priority-weighted allocation of a total budget across categories."""
+    
+    def __init__(
+        self,
+        total: float,
+        attendees: int,
+        categories: Optional[Dict[str, Dict[str, Any]]] = None,
+        benchmarks: Optional[Dict[str, float]] = None,
+        committed: Optional[Dict[str, float]] = None
+    ):
+        self.total = float(total)
+        self.attendees = max(int(attendees or 0), 0)
+        self.categories = {name: dict(spec) for name, spec in (categories or DEFAULT_CATEGORIES).items()}
+        self.benchmarks = dict(benchmarks or {})
+        self.committed = {name: float(amount) for name, amount in (committed or {}).items() if name in self.categories}
+        
+        # Per-category (floor, need, ceiling), refreshed only for categories whose inputs change
+        self._bounds: Dict[str, Tuple[float, float, float]] = {}
+        self._tiers: List[List[str]] = self._priority_tiers()
+        self.allocation: Dict[str, float] = {}
+        self.solves = 0
+    
+    def _priority_tiers(self) -> List[List[str]]:
+        tiers: Dict[int, List[str]] = {}
+        for name, spec in self.categories.items():
+            tiers.setdefault(spec.get("priority", 1), []).append(name)
+        return [tiers[priority] for priority in sorted(tiers, reverse=True)]
+    
+    def _category_bounds(self, name: str) -> Tuple[float, float, float]:
+        spec = self.categories[name]
+        floor = max(spec["min_share"] * self.total, self.committed.get(name, 0.0))
+        ceiling = max(spec["max_share"] * self.total, self.committed.get(name, 0.0))
+        per_attendee = self.benchmarks.get(name, spec.get("per_attendee", 0.0))
+        need = min(max(per_attendee * self.attendees, floor), ceiling)
+        return floor, need, ceiling
+    
+    def solve(self) -> Dict[str, Any]:
+        """Allocate the budget, reusing the cached bounds of unchanged categories."""
+        for name in self.categories:
+            if name not in self._bounds:
+                self._bounds[name] = self._category_bounds(name)
+        
+        allocation = {name: bounds[0] for name, bounds in self._bounds.items()}
+        remaining = self.total - sum(allocation.values())
+        if remaining < 0:
+            allocation = self._fit_floors(allocation)
+            remaining = self.total - sum(allocation.values())
+        
+        # Fill needs tier by tier; a tier that cannot be filled shares what is left pro rata
+        for tier in self._tiers:
+            if remaining <= 0:
+                break
+            gaps = {name: self._bounds[name][1] - allocation[name] for name in tier}
+            gap_total = sum(gap for gap in gaps.values() if gap > 0)
+            if gap_total <= 0:
+                continue
+            fill = min(1.0, remaining / gap_total)
+            for name, gap in gaps.items():
+                if gap > 0:
+                    allocation[name] += gap * fill
+            remaining -= gap_total * fill
+        
+        if remaining > 0 and RESERVE_CATEGORY in allocation:
+            topup = min(remaining, self._bounds[RESERVE_CATEGORY][2] - allocation[RESERVE_CATEGORY])
+            if topup > 0:
+                allocation[RESERVE_CATEGORY] += topup
+                remaining -= topup
+        
+        self.allocation = allocation
+        self.solves += 1
+        return self.result(remaining)
+    
+    def _fit_floors(self, floors: Dict[str, float]) -> Dict[str, float]:
+        """Scale down the uncommitted part of each floor so the floors fit in the total."""
+        committed = {name: min(self.committed.get(name, 0.0), floor) for name, floor in floors.items()}
+        flexible = sum(floors.values()) - sum(committed.values())
+        available = self.total - sum(committed.values())
+        if available < 0:
+            logger.warning(f"Committed costs exceed the total budget by {-available:,.2f}")
+        else:
+            logger.warning(f"Budget floors and commitments exceed the total budget; scaling uncommitted floors to {available:,.2f}")
+        scale = max(available, 0.0) / flexible if flexible > 0 else 0.0
+        return {name: committed[name] + (floor - committed[name]) * scale for name, floor in floors.items()}
+    
+    def update(
+        self,
+        total: Optional[float] = None,
+        attendees: Optional[int] = None,
+        benchmarks: Optional[Dict[str, float]] = None,
+        committed: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Change some inputs and re-solve, reporting which allocations moved."""
+        previous = dict(self.allocation)
+        
+        if total is not None and float(total) != self.total or attendees is not None and int(attendees) != self.attendees:
+            # Every category's bounds depend on these
+            self.total = float(total) if total is not None else self.total
+            self.attendees = int(attendees) if attendees is not None else self.attendees
+            self._bounds.clear()
+        for name, value in (benchmarks or {}).items():
+            if name in self.categories and self.benchmarks.get(name) != value:
+                self.benchmarks[name] = float(value)
+                self._bounds.pop(name, None)
+        for name, amount in (committed or {}).items():
+            if name in self.categories and self.committed.get(name) != amount:
+                self.committed[name] = float(amount)
+                self._bounds.pop(name, None)
+        
+        result = self.solve()
+        result["changes"] = {
+            name: round(amount - previous.get(name, 0.0), 2)
+            for name, amount in self.allocation.items()
+            if abs(amount - previous.get(name, 0.0)) >= 0.01
+        }
+        return result
+    
+    def result(self, unallocated: float) -> Dict[str, Any]:
+        """Describe the current allocation as a budget."""
+        allocated = sum(self.allocation.values())
+        categories = {}
+        for name, amount in self.allocation.items():
+            floor, need, ceiling = self._bounds[name]
+            spec = self.categories[name]
+            categories[name] = {
+                "allocation": round(amount, 2),
+                "share": round(amount / self.total, 4) if self.total else 0.0,
+                "need": round(need, 2),
+                "committed": round(self.committed.get(name, 0.0), 2),
+                "min": round(floor, 2),
+                "max": round(ceiling, 2),
+                "items": spec.get("items", []),
+                "justification": spec.get("justification", "")
+            }
+        
+        return {
+            "allocated": round(allocated, 2),
+            "unallocated": round(max(unallocated, 0.0), 2),
+            "overrun": round(max(0.0, -unallocated), 2),
+            "feasible": unallocated >= -0.01,
+            "categories": categories
+        }
+    
+    def inputs(self) -> Dict[str, Any]:
+        """The allocator's inputs, JSON-serializable, to rebuild it with from_inputs."""
+        return {
+            "total": self.total,
+            "attendees": self.attendees,
+            "categories": self.categories,
+            "benchmarks": self.benchmarks,
+            "committed": self.committed
+        }
+    
+    @classmethod
+    def from_inputs(cls, inputs: Dict[str, Any]) -> "BudgetAllocator":
+        return cls(
+            total=inputs["total"],
+            attendees=inputs["attendees"],
+            categories=inputs.get("categories"),
+            benchmarks=inputs.get("benchmarks"),
+            committed=inputs.get("committed")
+        )
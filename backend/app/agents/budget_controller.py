@@ -1,11 +1,30 @@
 from typing import Dict, Any, List
 from langchain.schema import HumanMessage, SystemMessage
+from app.core.config import settings
 from .base_agent import BaseAgent
+from .budget_allocation import BudgetAllocator, benchmarks_from_requirements, committed_costs
+from .budget_simulation import budget_simulator, budget_categories, months_until
+from .event_dates import event_days
+from .venue_ranking import parse_number
+import asyncio
 import json
+import math
+import zlib
 
 class BudgetControllerAgent(BaseAgent):
     """AI agent responsible for managing event budgets and financial planning."""
     
+    STEP_INPUTS = {
+        "analyze_budget_requirements": {"fields": ("name", "description", "expected_attendees", "budget_total", "start_date", "end_date", "city", "country")},
+        "create_initial_budget": {"fields": ("expected_attendees", "budget_total", "start_date", "end_date"), "steps": ("analyze_budget_requirements",)},
+        "optimize_budget_allocation": {"steps": ("create_initial_budget",), "agents": ("venue_scout", "speaker_outreach")},
+        "create_financial_projections": {
+            "fields": ("name", "description", "expected_attendees", "max_attendees", "budget_total", "start_date", "end_date", "city", "country", "brief_json"),
+            "steps": ("optimize_budget_allocation",)
+        },
+        "identify_cost_savings": {"steps": ("optimize_budget_allocation",)},
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "budget_controller")
     
@@ -31,30 +50,31 @@ class BudgetControllerAgent(BaseAgent):
         await self.update_progress(10, "Analyzing event requirements...")
         
         # Step 1: Analyze event requirements
-        requirements = await self._analyze_budget_requirements(event_data)
+        requirements = await self.run_step("analyze_budget_requirements", lambda: self._analyze_budget_requirements(event_data))
         await self.log_activity("Analyzed budget requirements", "info", requirements)
         
         await self.update_progress(25, "Creating initial budget...")
         
         # Step 2: Create initial budget
-        initial_budget = await self._create_initial_budget(requirements, event_data)
+        initial_budget = await self.run_step("create_initial_budget", lambda: self._create_initial_budget(requirements, event_data))
         await self.log_activity("Created initial budget", "info", {"total_budget": initial_budget.get("total", 0)})
         
         await self.update_progress(40, "Optimizing budget allocation...")
         
         # Step 3: Optimize budget allocation
-        optimized_budget = await self._optimize_budget_allocation(initial_budget, other_agents_data)
-        await self.log_activity("Optimized budget allocation", "info", {"optimization_savings": initial_budget.get("total", 0) - optimized_budget.get("total", 0)})
+        optimized_budget = await self.run_step("optimize_budget_allocation", lambda: self._optimize_budget_allocation(initial_budget, other_agents_data))
+        savings = max(initial_budget.get("total", 0) - optimized_budget.get("total", 0), 0)
+        await self.log_activity("Optimized budget allocation", "info", {"optimization_savings": savings})
         
         await self.update_progress(60, "Creating financial projections...")
         
         # Step 4: Create financial projections
-        projections = await self._create_financial_projections(optimized_budget, event_data)
+        projections = await self.run_step("create_financial_projections", lambda: self._create_financial_projections(optimized_budget, event_data))
         
         await self.update_progress(80, "Identifying cost-saving opportunities...")
         
         # Step 5: Identify cost-saving opportunities
-        cost_savings = await self._identify_cost_savings(optimized_budget)
+        cost_savings = await self.run_step("identify_cost_savings", lambda: self._identify_cost_savings(optimized_budget))
         
         await self.update_progress(90, "Requesting approval for budget plan...")
         
@@ -64,6 +84,8 @@ class BudgetControllerAgent(BaseAgent):
             "optimized_budget": optimized_budget,
             "projections": projections,
             "cost_savings": cost_savings,
+            "feasible": optimized_budget.get("feasible", True),
+            "overrun": optimized_budget.get("overrun", 0.0),
             "reasoning": "Comprehensive budget plan with optimizations and cost savings"
         })
         
@@ -82,7 +104,7 @@ class BudgetControllerAgent(BaseAgent):
             "optimized_budget": optimized_budget,
             "projections": projections,
             "cost_savings": cost_savings,
-            "total_savings": initial_budget.get("total", 0) - optimized_budget.get("total", 0)
+            "total_savings": savings
         }
     
     async def _analyze_budget_requirements(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -148,6 +170,9 @@ class BudgetControllerAgent(BaseAgent):
         attendees = event_data.get('expected_attendees', 100)
         total_budget = event_data.get('budget_total', 50000)
         
+        if settings.BUDGET_ALLOCATOR_ENABLED:
+            return self._allocate_initial_budget(requirements, event_data)
+        
         messages = [
             SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=f"""
@@ -229,8 +254,30 @@ class BudgetControllerAgent(BaseAgent):
                 }
             }
     
+    def _allocate_initial_budget(self, requirements: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Split the budget across categories by share bounds and per-attendee benchmarks."""
+        total_budget = event_data.get('budget_total') or 50000
+        allocator = BudgetAllocator(
+            total=total_budget,
+            attendees=event_data.get('expected_attendees') or 100,
+            benchmarks=benchmarks_from_requirements(requirements)
+        )
+        allocation = allocator.solve()
+        
+        # The allocator inputs let the optimization step re-solve with committed costs
+        return {
+            **allocation,
+            "id": f"budget_{self.agent_id}",
+            "total": total_budget,
+            "event_days": event_days(event_data),
+            "allocation_inputs": allocator.inputs()
+        }
+    
     async def _optimize_budget_allocation(self, initial_budget: Dict[str, Any], other_agents_data: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize budget allocation based on other agents' data."""
+        if settings.BUDGET_ALLOCATOR_ENABLED and initial_budget.get("allocation_inputs"):
+            return self._reallocate_budget(initial_budget, other_agents_data)
+        
         messages = [
             SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=f"""
@@ -273,8 +320,27 @@ class BudgetControllerAgent(BaseAgent):
             optimized["savings"] = initial_budget.get("total", 0) * 0.05
             return optimized
     
+    def _reallocate_budget(self, initial_budget: Dict[str, Any], other_agents_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Re-solve the initial allocation with the venue and speaker costs other agents committed."""
+        allocator = BudgetAllocator.from_inputs(initial_budget["allocation_inputs"])
+        allocator.solve()
+        allocation = allocator.update(committed=committed_costs(other_agents_data, initial_budget.get("event_days", 1)))
+        
+        original_total = initial_budget.get("total", 0)
+        return {
+            **allocation,
+            "id": f"optimized_budget_{self.agent_id}",
+            "total": allocation["allocated"],
+            "original_total": original_total,
+            "savings": round(max(original_total - allocation["allocated"], 0.0), 2),
+            "allocation_inputs": allocator.inputs()
+        }
+    
     async def _create_financial_projections(self, budget: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create financial projections and forecasts."""
+        if settings.BUDGET_SIMULATION_ENABLED:
+            return await self._simulate_financial_projections(budget, event_data)
+        
         attendees = event_data.get('expected_attendees', 100)
         
         messages = [
@@ -331,6 +397,69 @@ class BudgetControllerAgent(BaseAgent):
                 }
             }
     
+    async def _simulate_financial_projections(self, budget: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Project finances with a Monte Carlo simulation and have the LLM explain the results."""
+        brief = event_data.get('brief_json') or {}
+        # A free event's fee of 0 is a real fee; only a missing one falls back to the default
+        registration_fee = brief.get('registration_fee')
+        if registration_fee is None:
+            registration_fee = brief.get('ticket_price')
+        registration_fee = parse_number(registration_fee)
+        
+        # Seeded per event so reruns and re-plans report the same distribution
+        simulation = await asyncio.to_thread(
+            budget_simulator.simulate,
+            budget_categories(budget),
+            event_data.get('expected_attendees', 100),
+            event_data.get('budget_total') or budget.get("total", 0),
+            event_data.get('max_attendees'),
+            months_until(event_data.get('start_date')),
+            None if math.isnan(registration_fee) else registration_fee,
+            zlib.crc32(self.event_id.encode("utf-8"))
+        )
+        
+        break_even_attendees = simulation["break_even_attendees"] or {}
+        projections = {
+            **simulation,
+            "break_even": {
+                "probability": simulation["break_even_probability"],
+                "attendees_needed": break_even_attendees.get("p50")
+            },
+            "profit_loss": {
+                "best_case": simulation["profit"]["p95"],
+                "likely_case": simulation["profit"]["p50"],
+                "worst_case": simulation["profit"]["p5"]
+            }
+        }
+        projections["narrative"] = await self._narrate_financial_projections(projections)
+        return projections
+    
+    async def _narrate_financial_projections(self, projections: Dict[str, Any]) -> Dict[str, Any]:
+        """Explain simulated financial projections in plain terms."""
+        messages = [
+            SystemMessage(content=self.get_system_prompt()),
+            HumanMessage(content=f"""
+            These financial projections come from a Monte Carlo simulation of {projections['scenarios']:,} scenarios
+            (percentiles p5-p95 across scenarios):
+            {json.dumps(projections, indent=2)}
+            
+            Explain them for the event organizers without changing any numbers:
+            1. A short summary of the financial outlook and break-even likelihood
+            2. The key drivers of the outcome
+            3. The main financial risks
+            4. Recommendations to improve the odds of breaking even
+            
+            Return as a JSON object with summary, key_drivers, risks and recommendations.
+            """)
+        ]
+        
+        response = await self.get_llm_response(messages)
+        
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            return {"summary": response.strip()}
+    
     async def _identify_cost_savings(self, budget: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Identify potential cost-saving opportunities."""
         messages = [
@@ -0,0 +1,233 @@
+"""
+Budget Simulation for OrchestrateX
+
+This module projects an event's finances with a vectorized Monte Carlo simulation. Each
+scenario samples attendance, the average registration fee paid, sponsorship deals closed
+and per-category cost overruns (with a shared overrun factor), all as NumPy arrays over
+100k+ scenarios at once. The result gives break-even probability, profit and loss
+percentiles and monthly cash position bands in well under a second, for the budget agent
+to report and the LLM to narrate.
+"""
+
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Cost categories whose spend scales with attendance
+VARIABLE_COST_KEYWORDS = ("catering", "refreshment", "food", "beverage", "swag", "material")
+
+# Typical overrun volatility (lognormal sigma) by category keyword; others use the default
+OVERRUN_SIGMA_BY_KEYWORD = {
+    "venue": 0.05,
+    "speaker": 0.10,
+    "marketing": 0.15,
+    "technology": 0.20,
+    "av": 0.20,
+    "catering": 0.10,
+    "staff": 0.12,
+    "travel": 0.20,
+}
+
+def _overrun_sigma(category: str, default: float) -> float:
+    name = category.lower()
+    for keyword, sigma in OVERRUN_SIGMA_BY_KEYWORD.items():
+        if keyword in name:
+            return sigma
+    return default
+
+def budget_categories(budget: Dict[str, Any]) -> Dict[str, float]:
+    """Planned spend per category of a budget, read from its category allocations."""
+    categories: Dict[str, float] = {}
+    for name, category in (budget.get("categories") or {}).items():
+        value = category.get("allocation") if isinstance(category, dict) else category
+        try:
+            categories[name] = float(value)
+        except (TypeError, ValueError):
+            continue
+    if not categories and budget.get("total"):
+        categories["general"] = float(budget["total"])
+    return categories
+
+def months_until(start_date: Any, now: Optional[datetime] = None) -> int:
+    """Whole months from now until the event starts, between 1 and 12 (3 if unknown)."""
+    try:
+        start = datetime.fromisoformat(str(start_date))
+    except ValueError:
+        return 3
+    now = now or datetime.now(timezone.utc if start.tzinfo else None)
+    return min(max(math.ceil((start - now).days / 30), 1), 12)
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    return {f"p{q}": round(float(value), 2) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+class BudgetSimulator:
+    """Vectorized Monte Carlo projection of event revenue, costs and cash flow."""
+    
+    def __init__(
+        self,
+        scenarios: int = 100000,
+        registration_fee: float = 200.0,
+        fee_discount_range: Tuple[float, float, float] = (0.70, 0.90, 1.00),
+        attendance_sigma: float = 0.25,
+        sponsorship_share: float = 0.30,
+        sponsorship_deals: int = 8,
+        sponsorship_close_rate: float = 0.5,
+        sponsorship_close_concentration: float = 6.0,
+        exhibitor_share: float = 0.10,
+        other_revenue_share: float = 0.05,
+        default_overrun_sigma: float = 0.12,
+        overrun_correlation: float = 0.3
+    ):
+        self.scenarios = scenarios
+        self.registration_fee = registration_fee  # list price per attendee
+        self.fee_discount_range = fee_discount_range  # triangular share of the list price actually paid
+        self.attendance_sigma = attendance_sigma  # lognormal spread of turnout around expected attendees
+        self.sponsorship_share = sponsorship_share  # sponsorship pipeline as a share of the budget
+        self.sponsorship_deals = sponsorship_deals
+        self.sponsorship_close_rate = sponsorship_close_rate  # mean close rate
+        self.sponsorship_close_concentration = sponsorship_close_concentration  # lower means less certain close rates
+        self.exhibitor_share = exhibitor_share
+        self.other_revenue_share = other_revenue_share
+        self.default_overrun_sigma = default_overrun_sigma
+        self.overrun_correlation = overrun_correlation  # weight of the overrun factor shared by all categories
+    
+    def simulate(
+        self,
+        categories: Dict[str, float],
+        expected_attendees: int,
+        budget_total: float,
+        max_attendees: Optional[int] = None,
+        months: int = 3,
+        registration_fee: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Simulate the event's finances and summarize the scenario distribution."""
+        started = time.perf_counter()
+        n = self.scenarios
+        if registration_fee is None:
+            registration_fee = self.registration_fee
+        rng = np.random.default_rng(seed)
+        expected_attendees = max(int(expected_attendees or 0), 1)
+        
+        # Revenue: turnout, fee actually paid, sponsorship deals closed, exhibitors
+        attendance = expected_attendees * rng.lognormal(-self.attendance_sigma ** 2 / 2, self.attendance_sigma, n)
+        if max_attendees:
+            attendance = np.minimum(attendance, max_attendees)
+        attendance = np.floor(attendance)
+        low, mode, high = self.fee_discount_range
+        fee_paid = registration_fee * rng.triangular(low, mode, high, n)
+        registration = attendance * fee_paid
+        
+        concentration = self.sponsorship_close_concentration
+        close_rate = rng.beta(self.sponsorship_close_rate * concentration, (1 - self.sponsorship_close_rate) * concentration, n)
+        deal_value = budget_total * self.sponsorship_share / max(self.sponsorship_deals, 1)
+        sponsorship = rng.binomial(self.sponsorship_deals, close_rate) * deal_value
+        exhibitors = budget_total * self.exhibitor_share * rng.uniform(0.6, 1.1, n)
+        other = np.full(n, budget_total * self.other_revenue_share)
+        revenue = registration + sponsorship + exhibitors + other
+        
+        # Costs: lognormal overruns per category around a shared factor; contingency is a
+        # reserve against overruns rather than planned spend
+        shared = rng.standard_normal(n)
+        rho = self.overrun_correlation
+        costs = np.zeros(n)
+        variable_costs = np.zeros(n)
+        planned = 0.0
+        contingency = 0.0
+        category_spend: Dict[str, Dict[str, float]] = {}
+        
+        for name, allocation in categories.items():
+            if "contingency" in name.lower():
+                contingency += allocation
+                continue
+            sigma = _overrun_sigma(name, self.default_overrun_sigma)
+            z = rho * shared + math.sqrt(1 - rho ** 2) * rng.standard_normal(n)
+            spend = allocation * np.exp(sigma * z - sigma ** 2 / 2)
+            if any(keyword in name.lower() for keyword in VARIABLE_COST_KEYWORDS):
+                spend *= attendance / expected_attendees
+                variable_costs += spend
+            costs += spend
+            planned += allocation
+            category_spend[name] = _percentiles(spend)
+        
+        profit = revenue - costs
+        overrun = np.maximum(costs - planned, 0.0)
+        
+        # Break-even attendance: fixed costs less other revenue over the margin per attendee
+        margin = fee_paid - variable_costs / np.maximum(attendance, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            needed = (costs - variable_costs - sponsorship - exhibitors - other) / margin
+        needed = np.where(margin > 0, np.maximum(needed, 0), np.inf)
+        
+        # Cash position: costs are paid 30% up front and the rest evenly, registrations
+        # arrive increasingly toward the event, other revenue evenly
+        months = max(int(months), 1)
+        cost_schedule = np.full(months, 0.7 / months)
+        cost_schedule[0] += 0.3
+        registration_schedule = np.arange(1, months + 1, dtype=float)
+        registration_schedule /= registration_schedule.sum()
+        even_schedule = np.full(months, 1.0 / months)
+        cash = np.cumsum(
+            np.outer(registration, registration_schedule)
+            + np.outer(sponsorship + exhibitors + other, even_schedule)
+            - np.outer(costs, cost_schedule),
+            axis=1
+        )
+        cash_bands = np.percentile(cash, (5, 50, 95), axis=0)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"Simulated {n} budget scenarios in {elapsed * 1000:.0f}ms")
+        
+        finite_needed = needed[np.isfinite(needed)]
+        return {
+            "scenarios": n,
+            "assumptions": {
+                "expected_attendees": expected_attendees,
+                "registration_fee": registration_fee,
+                "sponsorship_pipeline": round(budget_total * self.sponsorship_share, 2),
+                "sponsorship_close_rate": self.sponsorship_close_rate,
+                "planned_costs": round(planned, 2),
+                "contingency": round(contingency, 2)
+            },
+            "revenue": _percentiles(revenue),
+            "revenue_breakdown": {
+                "registration_fees": _percentiles(registration),
+                "sponsorships": _percentiles(sponsorship),
+                "exhibitor_fees": _percentiles(exhibitors),
+                "other_revenue": round(budget_total * self.other_revenue_share, 2)
+            },
+            "costs": _percentiles(costs),
+            "cost_breakdown": category_spend,
+            "profit": _percentiles(profit),
+            "expected_profit": round(float(profit.mean()), 2),
+            "break_even_probability": round(float((profit >= 0).mean()), 4),
+            "break_even_attendees": _percentiles(finite_needed) if finite_needed.size else None,
+            "attendance": _percentiles(attendance),
+            "overrun_probability": round(float((overrun > 0).mean()), 4),
+            "contingency_shortfall_probability": round(float((overrun > contingency).mean()), 4),
+            "cash_flow": {
+                f"month_{month + 1}": {
+                    "p5": round(float(cash_bands[0, month]), 2),
+                    "p50": round(float(cash_bands[1, month]), 2),
+                    "p95": round(float(cash_bands[2, month]), 2)
+                }
+                for month in range(months)
+            },
+            "peak_funding_need": _percentiles(np.maximum(-cash.min(axis=1), 0)),
+            "elapsed_ms": round(elapsed * 1000, 1)
+        }
+
+# Shared budget simulator
+budget_simulator = BudgetSimulator(
+    scenarios=settings.BUDGET_SIMULATION_SCENARIOS,
+    registration_fee=settings.BUDGET_SIMULATION_REGISTRATION_FEE
+)
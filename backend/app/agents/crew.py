@@ -0,0 +1,153 @@
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Callable
+from .base_agent import BaseAgent
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upstream agents whose finished output each agent reads from context["other_agents"]
+AGENT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "venue_scout": (),
+    "speaker_outreach": (),
+    "sponsorship_manager": (),
+    "risk_compliance": (),
+    "budget_controller": ("venue_scout", "speaker_outreach"),
+    "marketing_ops": ("venue_scout", "speaker_outreach", "sponsorship_manager"),
+    "logistics_travel": ("venue_scout", "speaker_outreach"),
+    "attendee_experience": ("venue_scout", "budget_controller"),
+}
+
+class CrewSkipped(Exception):
+    """Raised when an agent cannot run because an upstream agent did not complete."""
+    pass
+
+class CrewOrchestrator:
+    """Runs a crew of agents for one event, starting each agent as soon as its inputs are ready."""
+    
+    def __init__(
+        self,
+        event_id: str,
+        agent_types: Optional[Iterable[str]] = None,
+        agent_ids: Optional[Dict[str, str]] = None,
+        dependencies: Optional[Dict[str, Tuple[str, ...]]] = None,
+        agent_factory: Optional[Callable[[str, str, str], BaseAgent]] = None
+    ):
+        if agent_factory is None:
+            from . import create_agent as agent_factory
+        
+        self.event_id = event_id
+        self.dependencies = dependencies if dependencies is not None else AGENT_DEPENDENCIES
+        self.agent_types = list(agent_types) if agent_types is not None else list(self.dependencies)
+        self.agent_ids = agent_ids or {}
+        self.agent_factory = agent_factory
+        self.agents: Dict[str, BaseAgent] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._run_started = 0.0
+        self.execution_order = self._resolve_order()
+    
+    def _resolve_order(self) -> List[str]:
+        """Topologically sort the crew, ignoring dependencies outside of it."""
+        for agent_type in self.agent_types:
+            if agent_type not in self.dependencies:
+                raise ValueError(f"No dependencies declared for agent type: {agent_type}")
+        
+        crew = set(self.agent_types)
+        order: List[str] = []
+        visiting: set = set()
+        visited: set = set()
+        
+        def visit(agent_type: str, path: List[str]):
+            if agent_type in visited:
+                return
+            if agent_type in visiting:
+                raise ValueError(f"Circular agent dependency: {' -> '.join(path + [agent_type])}")
+            visiting.add(agent_type)
+            for dependency in self.dependencies[agent_type]:
+                if dependency in crew:
+                    visit(dependency, path + [agent_type])
+            visiting.discard(agent_type)
+            visited.add(agent_type)
+            order.append(agent_type)
+        
+        for agent_type in self.agent_types:
+            visit(agent_type, [])
+        
+        return order
+    
+    def get_agent(self, agent_type: str) -> BaseAgent:
+        """Get (creating on first use) the agent instance for a crew member."""
+        if agent_type not in self.agents:
+            agent_id = self.agent_ids.get(agent_type, f"{self.event_id}_{agent_type}")
+            self.agents[agent_type] = self.agent_factory(agent_type, agent_id, self.event_id)
+        return self.agents[agent_type]
+    
+    async def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the crew, passing each agent's output to the agents that depend on it."""
+        started = self._run_started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        for agent_type in self.execution_order:
+            upstream = {
+                dependency: tasks[dependency]
+                for dependency in self.dependencies[agent_type]
+                if dependency in tasks
+            }
+            tasks[agent_type] = asyncio.create_task(self._run_agent(agent_type, context, upstream))
+        
+        try:
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        skipped: List[str] = []
+        
+        for agent_type, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, CrewSkipped):
+                skipped.append(agent_type)
+            elif isinstance(outcome, BaseException):
+                errors[agent_type] = str(outcome)
+            else:
+                results[agent_type] = outcome
+        
+        wall_time = time.perf_counter() - started
+        logger.info(f"Crew for event {self.event_id} finished in {wall_time:.2f}s ({len(results)}/{len(tasks)} agents completed)")
+        
+        return {
+            "status": "completed" if not errors and not skipped else "partial",
+            "event_id": self.event_id,
+            "results": results,
+            "errors": errors,
+            "skipped": skipped,
+            "execution_order": self.execution_order,
+            "timings": self.timings,
+            "wall_time": wall_time
+        }
+    
+    async def _run_agent(self, agent_type: str, context: Dict[str, Any], upstream: Dict[str, asyncio.Task]) -> Dict[str, Any]:
+        """Wait for upstream agents, then run this agent with their outputs."""
+        if upstream:
+            await asyncio.wait(upstream.values())
+        
+        other_agents = dict(context.get("other_agents", {}))
+        for dependency, task in upstream.items():
+            if task.cancelled() or task.exception() is not None:
+                raise CrewSkipped(f"{agent_type} skipped: upstream agent {dependency} did not complete")
+            other_agents[dependency] = task.result()
+        
+        agent_context = dict(context)
+        agent_context["other_agents"] = other_agents
+        
+        agent = self.get_agent(agent_type)
+        started = time.perf_counter()
+        try:
+            return await agent.start_workflow(agent_context)
+        finally:
+            self.timings[agent_type] = {
+                "start_offset": started - self._run_started,
+                "duration": time.perf_counter() - started
+            }
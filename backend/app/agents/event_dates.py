@@ -0,0 +1,18 @@
+"""
+Event Dates for OrchestrateX
+
+This module holds date helpers shared by the agents that size their plans by how long an
+event runs (venue costs, budget commitments, session scheduling).
+"""
+
+from datetime import datetime
+from typing import Dict, Any
+
+def event_days(event_data: Dict[str, Any]) -> int:
+    """Number of days the event runs, counting both start and end day (1 if unknown)."""
+    try:
+        start = datetime.fromisoformat(str(event_data["start_date"])).date()
+        end = datetime.fromisoformat(str(event_data["end_date"])).date()
+    except (KeyError, ValueError):
+        return 1
+    return max((end - start).days + 1, 1)
@@ -6,6 +6,23 @@ import json
 class LogisticsTravelAgent(BaseAgent):
     """AI agent responsible for managing event logistics, travel arrangements, and operational coordination."""
     
+    STEP_INPUTS = {
+        "analyze_logistics_requirements": {"fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date", "venue_name")},
+        "plan_travel_arrangements": {
+            "fields": ("expected_attendees", "city", "country", "start_date", "end_date", "venue_name", "venue_address"),
+            "agents": ("venue_scout", "speaker_outreach")
+        },
+        "coordinate_vendor_services": {
+            "fields": ("expected_attendees", "city", "country", "start_date", "end_date", "venue_name", "venue_address", "budget_total"),
+            "steps": ("analyze_logistics_requirements",)
+        },
+        "create_operational_plans": {"steps": ("analyze_logistics_requirements", "plan_travel_arrangements", "coordinate_vendor_services")},
+        "plan_incident_response": {
+            "fields": ("name", "expected_attendees", "city", "country", "start_date", "end_date", "venue_name", "venue_address"),
+            "steps": ("create_operational_plans",)
+        },
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "logistics_travel")
     
@@ -31,30 +48,30 @@ class LogisticsTravelAgent(BaseAgent):
         await self.update_progress(10, "Analyzing logistics requirements...")
         
         # Step 1: Analyze logistics requirements
-        logistics_analysis = await self._analyze_logistics_requirements(event_data)
+        logistics_analysis = await self.run_step("analyze_logistics_requirements", lambda: self._analyze_logistics_requirements(event_data))
         await self.log_activity("Analyzed logistics requirements", "info", logistics_analysis)
         
         await self.update_progress(25, "Planning travel arrangements...")
         
         # Step 2: Plan travel arrangements
-        travel_plan = await self._plan_travel_arrangements(event_data, other_agents_data)
+        travel_plan = await self.run_step("plan_travel_arrangements", lambda: self._plan_travel_arrangements(event_data, other_agents_data))
         await self.log_activity("Planned travel arrangements", "info", {"travel_plan_id": travel_plan.get("id", "Unknown")})
         
         await self.update_progress(40, "Coordinating vendor services...")
         
         # Step 3: Coordinate vendor services
-        vendor_coordination = await self._coordinate_vendor_services(logistics_analysis, event_data)
+        vendor_coordination = await self.run_step("coordinate_vendor_services", lambda: self._coordinate_vendor_services(logistics_analysis, event_data))
         await self.log_activity("Coordinated vendor services", "info", {"vendor_count": len(vendor_coordination.get("vendors", []))})
         
         await self.update_progress(60, "Creating operational plans...")
         
         # Step 4: Create operational plans
-        operational_plans = await self._create_operational_plans(logistics_analysis, travel_plan, vendor_coordination)
+        operational_plans = await self.run_step("create_operational_plans", lambda: self._create_operational_plans(logistics_analysis, travel_plan, vendor_coordination))
         
         await self.update_progress(80, "Planning incident response...")
         
         # Step 5: Plan incident response
-        incident_response = await self._plan_incident_response(operational_plans, event_data)
+        incident_response = await self.run_step("plan_incident_response", lambda: self._plan_incident_response(operational_plans, event_data))
         
         await self.update_progress(90, "Requesting approval for logistics plan...")
         
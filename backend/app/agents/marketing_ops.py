@@ -6,6 +6,23 @@ import json
 class MarketingOpsAgent(BaseAgent):
     """AI agent responsible for managing event marketing and promotion strategies."""
     
+    STEP_INPUTS = {
+        "analyze_target_audience": {"fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date")},
+        "develop_marketing_strategy": {
+            "fields": ("name", "description", "expected_attendees", "budget_total", "city", "country", "start_date", "end_date", "brief_json"),
+            "steps": ("analyze_target_audience",)
+        },
+        "create_marketing_campaigns": {
+            "fields": ("name", "description", "start_date", "end_date", "city", "country", "brief_json"),
+            "steps": ("develop_marketing_strategy",)
+        },
+        "plan_content_calendar": {"fields": ("name", "start_date", "end_date"), "steps": ("create_marketing_campaigns",)},
+        "coordinate_with_agents": {
+            "steps": ("create_marketing_campaigns",),
+            "agents": ("venue_scout", "speaker_outreach", "sponsorship_manager")
+        },
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "marketing_ops")
     
@@ -31,30 +48,30 @@ class MarketingOpsAgent(BaseAgent):
         await self.update_progress(10, "Analyzing event and target audience...")
         
         # Step 1: Analyze event and target audience
-        audience_analysis = await self._analyze_target_audience(event_data)
+        audience_analysis = await self.run_step("analyze_target_audience", lambda: self._analyze_target_audience(event_data))
         await self.log_activity("Analyzed target audience", "info", audience_analysis)
         
         await self.update_progress(25, "Developing marketing strategy...")
         
         # Step 2: Develop marketing strategy
-        marketing_strategy = await self._develop_marketing_strategy(event_data, audience_analysis)
+        marketing_strategy = await self.run_step("develop_marketing_strategy", lambda: self._develop_marketing_strategy(event_data, audience_analysis))
         await self.log_activity("Developed marketing strategy", "info", {"strategy_type": marketing_strategy.get("type", "Unknown")})
         
         await self.update_progress(40, "Creating marketing campaigns...")
         
         # Step 3: Create marketing campaigns
-        campaigns = await self._create_marketing_campaigns(marketing_strategy, event_data)
+        campaigns = await self.run_step("create_marketing_campaigns", lambda: self._create_marketing_campaigns(marketing_strategy, event_data))
         await self.log_activity("Created marketing campaigns", "info", {"campaign_count": len(campaigns)})
         
         await self.update_progress(60, "Planning content calendar...")
         
         # Step 4: Plan content calendar
-        content_calendar = await self._plan_content_calendar(campaigns, event_data)
+        content_calendar = await self.run_step("plan_content_calendar", lambda: self._plan_content_calendar(campaigns, event_data))
         
         await self.update_progress(80, "Coordinating with other agents...")
         
         # Step 5: Coordinate with other agents
-        coordination_plan = await self._coordinate_with_agents(other_agents_data, campaigns)
+        coordination_plan = await self.run_step("coordinate_with_agents", lambda: self._coordinate_with_agents(other_agents_data, campaigns))
         
         await self.update_progress(90, "Requesting approval for marketing plan...")
         
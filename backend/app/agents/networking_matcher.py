@@ -0,0 +1,324 @@
+"""
+Networking Matchmaking for OrchestrateX
+
+This module pairs attendees for 1:1 meetings and seats them at roundtables. Attendee
+interests and goals become rows of a sparse matrix whose row products are profile
+similarities. Comparing every pair is out of reach at 10k+ attendees, so candidate pairs
+come from locality-sensitive hashing: signed random projections split into bands, with
+attendees sharing a band's hash sorted next to each other and compared within a small
+window. Only each attendee's best candidates are kept; they are greedily booked into
+meeting slots, best pairs first, never twice and within every attendee's meeting limit.
+Roundtables group attendees by a different top interest each round without seating
+anyone with the same person twice. Bands can be hashed in parallel worker processes.
+"""
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Iterable, Sequence, Set, Tuple
+import numpy as np
+from scipy import sparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Topic of roundtables mixing attendees without a common interest
+MIXED_TOPIC = "Open discussion"
+
+def _tags(value: Any) -> Dict[str, float]:
+    """Weighted tags of an interests or goals field: a list of tags or a tag-to-weight map."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, str):
+        items = ((value, 1.0),)
+    else:
+        items = ((tag, 1.0) for tag in value or ())
+    tags: Dict[str, float] = {}
+    for tag, weight in items:
+        name = str(tag).strip().lower()
+        if name and float(weight) > 0:
+            tags[name] = tags.get(name, 0.0) + float(weight)
+    return tags
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+def _pair_keys(first: np.ndarray, second: np.ndarray, count: int) -> np.ndarray:
+    """One int64 key per unordered attendee pair."""
+    low = np.minimum(first, second).astype(np.int64)
+    high = np.maximum(first, second).astype(np.int64)
+    return low * count + high
+
+def _band_candidates(features: sparse.csr_matrix, planes: np.ndarray, window: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate pairs of one LSH band: attendees hashed alike and sorted within the window.
+    
+    A module-level function so worker processes can run it.
+    """
+    bits = (features @ planes) > 0
+    keys = bits.astype(np.int64) @ (1 << np.arange(planes.shape[1], dtype=np.int64))
+    # A random tie-break spreads large buckets over different windows in each band
+    jitter = np.random.default_rng(seed).random(len(keys))
+    order = np.lexsort((jitter, keys))
+    
+    first: List[np.ndarray] = []
+    second: List[np.ndarray] = []
+    for offset in range(1, window + 1):
+        same = keys[order[:-offset]] == keys[order[offset:]]
+        first.append(order[:-offset][same])
+        second.append(order[offset:][same])
+    return np.concatenate(first), np.concatenate(second)
+
+class NetworkingMatcher:
+    """1:1 meeting and roundtable assignment over sparse attendee profiles."""
+    
+    def __init__(
+        self,
+        meeting_slots: int = 6,
+        max_meetings: int = 6,
+        table_size: int = 8,
+        roundtable_rounds: int = 2,
+        neighbors: int = 20,
+        lsh_bands: int = 8,
+        lsh_bits: int = 12,
+        window: int = 8,
+        exact_limit: int = 2000,
+        goal_weight: float = 0.4,
+        min_score: float = 0.0,
+        workers: int = 1,
+        seed: int = 0
+    ):
+        self.meeting_slots = meeting_slots
+        self.max_meetings = max_meetings  # default limit; an attendee's max_meetings overrides it
+        self.table_size = table_size
+        self.roundtable_rounds = roundtable_rounds
+        self.neighbors = neighbors  # best candidates kept per attendee
+        self.lsh_bands = lsh_bands
+        self.lsh_bits = lsh_bits
+        self.window = window  # sorted neighbors compared within each LSH bucket
+        self.exact_limit = exact_limit  # up to this many attendees every pair is compared instead
+        self.goal_weight = goal_weight  # share of the similarity from goals; the rest is interests
+        self.min_score = min_score
+        self.workers = workers  # processes hashing bands; 1 hashes in this process
+        self.seed = seed
+    
+    def features(self, attendees: Sequence[Dict[str, Any]]) -> sparse.csr_matrix:
+        """Row-normalized interest and goal columns, weighted so row products are similarities."""
+        vocabulary: Dict[Tuple[str, str], int] = {}
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+        
+        for field, weight in (("interests", 1.0 - self.goal_weight), ("goals", self.goal_weight)):
+            if weight <= 0:
+                continue
+            block_rows: List[int] = []
+            block_columns: List[int] = []
+            block_values: List[float] = []
+            for row, attendee in enumerate(attendees):
+                for tag, value in _tags(attendee.get(field)).items():
+                    block_rows.append(row)
+                    block_columns.append(vocabulary.setdefault((field, tag), len(vocabulary)))
+                    block_values.append(value)
+            block = sparse.csr_matrix((block_values, (block_rows, block_columns)), shape=(len(attendees), max(len(vocabulary), 1)))
+            block = (_normalize_rows(block) * np.sqrt(weight)).tocoo()
+            rows.extend(block.row)
+            columns.extend(block.col)
+            values.extend(block.data)
+        
+        return sparse.csr_matrix((values, (rows, columns)), shape=(len(attendees), max(len(vocabulary), 1)))
+    
+    def candidates(self, features: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Scored candidate pairs (first, second, similarity), each attendee's best few."""
+        count = features.shape[0]
+        if count <= self.exact_limit:
+            similarities = sparse.triu(features @ features.T, k=1).tocoo()
+            first, second, scores = similarities.row.astype(np.int64), similarities.col.astype(np.int64), similarities.data
+        else:
+            rng = np.random.default_rng(self.seed)
+            planes = rng.standard_normal((features.shape[1], self.lsh_bands * self.lsh_bits)).astype(np.float32)
+            bands = [
+                (features, planes[:, band * self.lsh_bits:(band + 1) * self.lsh_bits], self.window, self.seed + band)
+                for band in range(self.lsh_bands)
+            ]
+            
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    results = list(pool.map(_band_candidates, *zip(*bands)))
+            else:
+                results = [_band_candidates(*band) for band in bands]
+            
+            keys = np.unique(np.concatenate([_pair_keys(first, second, count) for first, second in results]))
+            first, second = keys // count, keys % count
+            scores = np.asarray(features[first].multiply(features[second]).sum(axis=1)).ravel()
+        
+        keep = scores > self.min_score
+        first, second, scores = first[keep], second[keep], scores[keep]
+        
+        # Keep a pair if it is among either attendee's best candidates
+        source = np.concatenate((first, second))
+        target = np.concatenate((second, first))
+        both_scores = np.concatenate((scores, scores))
+        order = np.lexsort((-both_scores, source))
+        group_start = np.searchsorted(source[order], source[order], side="left")
+        best = order[np.arange(len(order)) - group_start < self.neighbors]
+        keys = np.unique(_pair_keys(source[best], target[best], count))
+        
+        first, second = keys // count, keys % count
+        scores = np.asarray(features[first].multiply(features[second]).sum(axis=1)).ravel()
+        return first, second, scores
+    
+    def schedule_meetings(
+        self,
+        first: np.ndarray,
+        second: np.ndarray,
+        scores: np.ndarray,
+        limits: Sequence[int],
+        excluded: Set[int],
+        count: int
+    ) -> List[Tuple[int, int, int, float]]:
+        """Book pairs into meeting slots, best first; get (slot, first, second, score) per meeting."""
+        remaining = list(limits)
+        busy = [0] * count
+        all_slots = (1 << self.meeting_slots) - 1
+        meetings = []
+        
+        for index in np.argsort(-scores, kind="stable"):
+            a, b = int(first[index]), int(second[index])
+            if remaining[a] <= 0 or remaining[b] <= 0 or (min(a, b) * count + max(a, b)) in excluded:
+                continue
+            free = all_slots & ~(busy[a] | busy[b])
+            if not free:
+                continue
+            slot_bit = free & -free
+            busy[a] |= slot_bit
+            busy[b] |= slot_bit
+            remaining[a] -= 1
+            remaining[b] -= 1
+            meetings.append((slot_bit.bit_length() - 1, a, b, float(scores[index])))
+        return meetings
+    
+    def roundtables(
+        self,
+        attendees: Sequence[Dict[str, Any]],
+        order_keys: np.ndarray,
+        met: Set[int]
+    ) -> List[Tuple[int, str, List[int]]]:
+        """Seat attendees at tables by a different top interest each round; get (round, topic, members)."""
+        count = len(attendees)
+        ranked_topics = [sorted(_tags(attendee.get("interests")).items(), key=lambda item: -item[1]) for attendee in attendees]
+        used_topics: List[Set[str]] = [set() for _ in range(count)]
+        tables: List[Tuple[int, str, List[int]]] = []
+        
+        def fits(table: List[int], member: int) -> bool:
+            return all((min(other, member) * count + max(other, member)) not in met for other in table)
+        
+        def seat(members: Iterable[int]) -> List[List[int]]:
+            open_tables: List[List[int]] = []
+            for member in members:
+                # Only the newest tables are tried, keeping seating linear in attendees
+                for table in open_tables[-3:]:
+                    if len(table) < self.table_size and fits(table, member):
+                        table.append(member)
+                        break
+                else:
+                    open_tables.append([member])
+            return open_tables
+        
+        for round_number in range(self.roundtable_rounds):
+            by_topic: Dict[str, List[int]] = {}
+            for member in np.argsort(order_keys, kind="stable"):
+                member = int(member)
+                topic = next((tag for tag, _ in ranked_topics[member] if tag not in used_topics[member]), MIXED_TOPIC)
+                by_topic.setdefault(topic, []).append(member)
+            
+            round_tables: List[Tuple[str, List[int]]] = []
+            leftovers: List[int] = []
+            for topic, members in by_topic.items():
+                for table in seat(members):
+                    if len(table) * 2 >= self.table_size or topic == MIXED_TOPIC:
+                        round_tables.append((topic, table))
+                    else:
+                        leftovers.extend(table)
+            round_tables.extend((MIXED_TOPIC, table) for table in seat(leftovers))
+            
+            for topic, table in round_tables:
+                for member in table:
+                    if topic != MIXED_TOPIC:
+                        used_topics[member].add(topic)
+                for position, member in enumerate(table):
+                    for other in table[position + 1:]:
+                        met.add(min(member, other) * count + max(member, other))
+                tables.append((round_number, topic, table))
+        return tables
+    
+    def match(self, attendees: Sequence[Dict[str, Any]], exclude_pairs: Iterable[Tuple[str, str]] = ()) -> Dict[str, Any]:
+        """Plan 1:1 meetings and roundtables for the attendees.
+        
+        Pairs in exclude_pairs (attendee ids, e.g. from earlier rounds) are never matched or
+        seated together, and no pair meets twice.
+        """
+        started = time.perf_counter()
+        count = len(attendees)
+        ids = [str(attendee.get("id") or attendee.get("email") or n) for n, attendee in enumerate(attendees)]
+        if count < 2:
+            return {"meetings": [], "roundtables": [], "stats": {"attendees": count}}
+        
+        index = {attendee_id: n for n, attendee_id in enumerate(ids)}
+        excluded = {
+            min(index[a], index[b]) * count + max(index[a], index[b])
+            for a, b in exclude_pairs
+            if a in index and b in index
+        }
+        
+        features = self.features(attendees)
+        first, second, scores = self.candidates(features)
+        candidate_seconds = time.perf_counter() - started
+        
+        limits = [
+            min(self.max_meetings if attendee.get("max_meetings") is None else int(attendee["max_meetings"]), self.meeting_slots)
+            for attendee in attendees
+        ]
+        meetings = self.schedule_meetings(first, second, scores, limits, excluded, count)
+        
+        met = set(excluded)
+        met.update(a * count + b if a < b else b * count + a for _, a, b, _ in meetings)
+        order_keys = np.asarray(features @ np.random.default_rng(self.seed).standard_normal(features.shape[1])).ravel()
+        tables = self.roundtables(attendees, order_keys, met)
+        
+        meeting_counts = np.bincount(np.array([[a, b] for _, a, b, _ in meetings], dtype=np.int64).ravel(), minlength=count) if meetings else np.zeros(count, dtype=np.int64)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Matched {count} attendees into {len(meetings)} meetings and {len(tables)} roundtables in {elapsed:.2f}s")
+        
+        return {
+            "meetings": [
+                {"slot": slot + 1, "attendees": [ids[a], ids[b]], "score": round(score, 4)}
+                for slot, a, b, score in sorted(meetings)
+            ],
+            "roundtables": [
+                {"round": round_number + 1, "table": n + 1, "topic": topic, "attendees": [ids[member] for member in table]}
+                for n, (round_number, topic, table) in enumerate(tables)
+            ],
+            "stats": {
+                "attendees": count,
+                "candidate_pairs": len(scores),
+                "meetings": len(meetings),
+                "mean_meetings": round(float(meeting_counts.mean()), 2),
+                "unmatched_attendees": int((meeting_counts == 0).sum()),
+                "mean_meeting_score": round(float(np.mean([meeting[3] for meeting in meetings])), 4) if meetings else 0.0,
+                "roundtables": len(tables),
+                "candidate_ms": round(candidate_seconds * 1000, 1),
+                "elapsed_ms": round(elapsed * 1000, 1)
+            }
+        }
+
+# Shared networking matcher
+networking_matcher = NetworkingMatcher(
+    meeting_slots=settings.NETWORKING_MEETING_SLOTS,
+    max_meetings=settings.NETWORKING_MAX_MEETINGS,
+    table_size=settings.NETWORKING_TABLE_SIZE,
+    roundtable_rounds=settings.NETWORKING_ROUNDTABLE_ROUNDS,
+    workers=settings.NETWORKING_WORKERS
+)
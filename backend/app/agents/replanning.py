@@ -0,0 +1,124 @@
+"""
+Incremental Re-planning for OrchestrateX
+
+This module works out which agent workflow steps an event edit affects, from the inputs
+each agent declares in STEP_INPUTS, and re-plans just those: their checkpoints are
+discarded and the agents are queued to resume, so every unaffected step output is reused.
+Agents whose results change pass the change on to the agents that read them.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable, Set
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.checkpoints import checkpoint_store
+from app.models.agent import Agent
+from app.workers.agent_executor import agent_executor
+from . import AGENT_TYPES
+from .crew import AGENT_DEPENDENCIES
+
+logger = logging.getLogger(__name__)
+
+# Agents that have run before and so have step outputs worth reusing
+REPLANNABLE_STATUSES = ("completed", "waiting_approval", "error")
+
+def _agent_order(agent_types: Iterable[str]) -> List[str]:
+    """Order agent types so each comes after the upstream agents it reads."""
+    order: List[str] = []
+    
+    def visit(agent_type: str):
+        if agent_type in order:
+            return
+        for dependency in AGENT_DEPENDENCIES.get(agent_type, ()):
+            visit(dependency)
+        order.append(agent_type)
+    
+    for agent_type in agent_types:
+        visit(agent_type)
+    return order
+
+def step_causes(agent_type: str, changed_fields: Iterable[str], changed_agents: Iterable[str] = ()) -> Dict[str, Set[str]]:
+    """Get, for each workflow step of an agent, the changed fields and agents that invalidate it."""
+    step_inputs = AGENT_TYPES[agent_type].STEP_INPUTS
+    if not step_inputs:
+        raise ValueError(f"No step inputs declared for agent type: {agent_type}")
+    
+    changed = set(changed_fields) | set(changed_agents)
+    causes: Dict[str, Set[str]] = {}
+    
+    for step, inputs in step_inputs.items():
+        step_changes = changed & (set(inputs.get("fields", ())) | set(inputs.get("agents", ())))
+        for upstream in inputs.get("steps", ()):
+            if upstream not in causes:
+                raise ValueError(f"{agent_type} step {step} reads {upstream}, which is not an earlier step")
+            step_changes |= causes[upstream]
+        causes[step] = step_changes - set(inputs.get("ignore", ()))
+    
+    return causes
+
+def plan_replan(changed_fields: Iterable[str], agent_types: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """Get the steps to recompute per agent type after the given event fields change.
+    
+    Agent types without affected steps are left out. Only the given agent types are
+    considered to re-plan; the results of any others are taken as unchanged.
+    """
+    changed_fields = set(changed_fields)
+    crew = set(agent_types) if agent_types is not None else set(AGENT_TYPES)
+    plan: Dict[str, List[str]] = {}
+    
+    for agent_type in _agent_order(crew):
+        if agent_type not in crew:
+            continue
+        causes = step_causes(agent_type, changed_fields, plan)
+        steps = [step for step, step_changes in causes.items() if step_changes]
+        if steps:
+            plan[agent_type] = steps
+    
+    return plan
+
+async def replan_event(
+    db: AsyncSession,
+    event_id: str,
+    tenant_id: Optional[str],
+    changed_fields: Iterable[str]
+) -> Dict[str, List[str]]:
+    """Queue the agents of an event affected by an edit to recompute their affected steps.
+    
+    Returns the recomputed steps by agent id.
+    """
+    changed_fields = set(changed_fields)
+    result = await db.execute(
+        select(Agent).where(Agent.event_id == event_id, Agent.status.in_(REPLANNABLE_STATUSES))
+    )
+    agents = [agent for agent in result.scalars().all() if agent.type in AGENT_TYPES]
+    if not agents:
+        return {}
+    
+    plan = plan_replan(changed_fields, {agent.type for agent in agents})
+    replanned = [agent for agent in agents if agent.type in plan]
+    resume: Dict[str, bool] = {}
+    started_at = datetime.utcnow()
+    
+    for agent in replanned:
+        try:
+            await checkpoint_store.discard(agent.id, plan[agent.type])
+            resume[agent.id] = True
+        except Exception:
+            resume[agent.id] = False
+        
+        agent.status = "running"
+        agent.started_at = started_at
+        agent.progress = 0
+        agent.current_task = "Queued for re-planning"
+    
+    await db.commit()
+    
+    for agent in replanned:
+        # Downstream agents wait for the new results of the upstream agents re-planned with them
+        wait_for = [other.id for other in replanned if other.type in AGENT_DEPENDENCIES.get(agent.type, ())]
+        await agent_executor.enqueue(agent.id, agent.type, event_id, tenant_id, resume=resume[agent.id], wait_for=wait_for)
+        logger.info(f"Re-planning {agent.type} agent {agent.id} after edit of {sorted(changed_fields)}: {', '.join(plan[agent.type])}")
+    
+    return {agent.id: plan[agent.type] for agent in replanned}
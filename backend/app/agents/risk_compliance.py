@@ -6,6 +6,22 @@ import json
 class RiskComplianceAgent(BaseAgent):
     """AI agent responsible for managing risk assessment, compliance requirements, and governance."""
     
+    STEP_INPUTS = {
+        "conduct_risk_assessment": {"fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date", "venue_name", "budget_total")},
+        # Regulations depend on where, when and how many, not on what the event costs
+        "analyze_compliance_requirements": {
+            "fields": ("expected_attendees", "city", "country", "start_date", "end_date", "venue_name", "venue_address", "brief_json"),
+            "steps": ("conduct_risk_assessment",),
+            "ignore": ("budget_total",)
+        },
+        "develop_mitigation_strategies": {"steps": ("conduct_risk_assessment", "analyze_compliance_requirements")},
+        "plan_insurance_coverage": {
+            "fields": ("expected_attendees", "budget_total", "city", "country", "start_date", "end_date", "venue_name"),
+            "steps": ("conduct_risk_assessment",)
+        },
+        "create_compliance_monitoring": {"steps": ("analyze_compliance_requirements", "develop_mitigation_strategies")},
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "risk_compliance")
     
@@ -31,30 +47,30 @@ class RiskComplianceAgent(BaseAgent):
         await self.update_progress(10, "Conducting risk assessment...")
         
         # Step 1: Conduct comprehensive risk assessment
-        risk_assessment = await self._conduct_risk_assessment(event_data)
+        risk_assessment = await self.run_step("conduct_risk_assessment", lambda: self._conduct_risk_assessment(event_data))
         await self.log_activity("Conducted risk assessment", "info", risk_assessment)
         
         await self.update_progress(25, "Analyzing compliance requirements...")
         
         # Step 2: Analyze compliance requirements
-        compliance_analysis = await self._analyze_compliance_requirements(event_data, risk_assessment)
+        compliance_analysis = await self.run_step("analyze_compliance_requirements", lambda: self._analyze_compliance_requirements(event_data, risk_assessment))
         await self.log_activity("Analyzed compliance requirements", "info", {"compliance_areas": len(compliance_analysis.get("areas", []))})
         
         await self.update_progress(40, "Developing risk mitigation strategies...")
         
         # Step 3: Develop risk mitigation strategies
-        mitigation_strategies = await self._develop_mitigation_strategies(risk_assessment, compliance_analysis)
+        mitigation_strategies = await self.run_step("develop_mitigation_strategies", lambda: self._develop_mitigation_strategies(risk_assessment, compliance_analysis))
         await self.log_activity("Developed mitigation strategies", "info", {"strategy_count": len(mitigation_strategies.get("strategies", []))})
         
         await self.update_progress(60, "Planning insurance and liability coverage...")
         
         # Step 4: Plan insurance and liability coverage
-        insurance_plan = await self._plan_insurance_coverage(risk_assessment, event_data)
+        insurance_plan = await self.run_step("plan_insurance_coverage", lambda: self._plan_insurance_coverage(risk_assessment, event_data))
         
         await self.update_progress(80, "Creating compliance monitoring plan...")
         
         # Step 5: Create compliance monitoring plan
-        compliance_monitoring = await self._create_compliance_monitoring(compliance_analysis, mitigation_strategies)
+        compliance_monitoring = await self.run_step("create_compliance_monitoring", lambda: self._create_compliance_monitoring(compliance_analysis, mitigation_strategies))
         
         await self.update_progress(90, "Requesting approval for risk management plan...")
         
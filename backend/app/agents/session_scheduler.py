@@ -0,0 +1,576 @@
+"""
+Session Scheduling for OrchestrateX
+
+This module assigns conference sessions to rooms and timeslots. Each day is split into
+fixed-length slots and a session takes as many consecutive slots as its duration needs.
+Hard constraints are speaker availability, room capacity against the expected audience, no
+room double-booking and no speaker in two places at once; sessions of the same track or
+sharing topics running at the same time, and audiences in oversized rooms, are penalized.
+Days are numbered from 1 everywhere: in available_days, unavailable windows, a previous
+schedule's entries and the schedule produced.
+
+A first schedule is built by constraint propagation: every session keeps a boolean domain
+of (room, start slot) pairs, the most constrained session is placed next at its cheapest
+start that empties no other session's domain, and each placement prunes the domains it
+conflicts with. A min-conflicts local search with annealing then moves and swaps sessions
+to cut penalties. When a speaker cancels, the rest of the schedule is kept: the freed
+room time goes to unscheduled sessions and only sessions around it are moved.
+"""
+
+import logging
+import math
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Penalty of a session left out of the schedule, far above any soft constraint
+UNSCHEDULED_PENALTY = 1000.0
+
+# Share of the attendees expected in each session type, and its default length in minutes
+SESSION_TYPES = {
+    "keynote_speakers": ("keynote", 1.0, 60),
+    "panel_speakers": ("panel", 0.5, 60),
+    "workshop_leaders": ("workshop", 0.2, 90),
+}
+
+def parse_clock(value: str) -> int:
+    """Minutes since midnight of an "HH:MM" time."""
+    hours, minutes = str(value).split(":")
+    return int(hours) * 60 + int(minutes)
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def _window_all(mask: np.ndarray, length: int) -> np.ndarray:
+    """Whether mask holds on every one of the length slots starting at each slot."""
+    result = mask.copy()
+    for offset in range(1, length):
+        result[..., :-offset] &= mask[..., offset:]
+        result[..., -offset:] = False
+    return result
+
+def _window_sum(values: np.ndarray, length: int) -> np.ndarray:
+    """Sum of values over the length slots starting at each slot."""
+    result = values.astype(np.float64)
+    for offset in range(1, length):
+        result[..., :-offset] += values[..., offset:]
+    return result
+
+def lineup_sessions(lineup: Dict[str, Any], expected_attendees: int) -> List[Dict[str, Any]]:
+    """Sessions of a proposed speaker lineup: one per keynote and workshop, one panel."""
+    sessions: List[Dict[str, Any]] = []
+    expected_attendees = max(int(expected_attendees or 0), 1)
+    
+    for group, (track, audience_share, default_minutes) in SESSION_TYPES.items():
+        speakers = [speaker for speaker in lineup.get(group) or () if isinstance(speaker, dict)]
+        if track == "panel" and speakers:
+            speakers = [{
+                "id": f"panel_{lineup.get('id', 'lineup')}",
+                "name": "Panel",
+                "session_title": "Panel discussion",
+                "speakers": speakers,
+                "expertise": [area for speaker in speakers for area in speaker.get("expertise") or ()]
+            }]
+        
+        for speaker in speakers:
+            members = speaker.get("speakers") or [speaker]
+            sessions.append({
+                "id": f"{track}_{speaker.get('id') or speaker.get('name')}",
+                "title": speaker.get("session_title") or f"{track.title()}: {speaker.get('name', 'TBD')}",
+                "speakers": [str(member.get("id") or member.get("name")) for member in members],
+                "track": track,
+                "topics": speaker.get("expertise") or [],
+                "audience": math.ceil(expected_attendees * audience_share),
+                "duration": speaker.get("session_duration") or default_minutes,
+                "available_days": speaker.get("available_days")
+            })
+    return sessions
+
+def event_rooms(event_data: Dict[str, Any], breakout_rooms: int) -> List[Dict[str, Any]]:
+    """Rooms listed in the event brief, or a main hall for everyone plus breakout rooms."""
+    brief = event_data.get("brief_json") or {}
+    rooms = [room for room in brief.get("rooms") or () if isinstance(room, dict) and room.get("capacity")]
+    if rooms:
+        return [{"id": str(room.get("id") or room.get("name") or f"room_{n + 1}"), "capacity": int(room["capacity"])} for n, room in enumerate(rooms)]
+    
+    attendees = max(int(event_data.get("max_attendees") or event_data.get("expected_attendees") or 0), 1)
+    main_hall = {"id": "Main Hall", "capacity": attendees}
+    breakout_capacity = max(math.ceil(attendees * 0.5), 1)
+    return [main_hall] + [{"id": f"Breakout {n + 1}", "capacity": breakout_capacity} for n in range(breakout_rooms)]
+
+class SessionScheduler:
+    """Room and timeslot assignment by constraint propagation and local search."""
+    
+    def __init__(
+        self,
+        rooms: Sequence[Dict[str, Any]],
+        days: int = 1,
+        day_start: str = "09:00",
+        day_end: str = "17:00",
+        slot_minutes: int = 30,
+        track_weight: float = 10.0,
+        topic_weight: float = 2.0,
+        waste_weight: float = 1.0,
+        search_seconds: float = 2.0,
+        max_iterations: int = 50000,
+        lookahead: int = 5,
+        seed: int = 0
+    ):
+        if not rooms:
+            raise ValueError("At least one room is needed to schedule sessions")
+        self.room_ids = [str(room.get("id") or room.get("name")) for room in rooms]
+        self.capacity = np.array([float(room.get("capacity") or 0) for room in rooms])
+        self.days = max(int(days), 1)
+        self.day_start = parse_clock(day_start)
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = max((parse_clock(day_end) - self.day_start) // slot_minutes, 1)
+        self.slot_count = self.days * self.slots_per_day
+        self.track_weight = track_weight
+        self.topic_weight = topic_weight
+        self.waste_weight = waste_weight
+        self.search_seconds = search_seconds
+        self.max_iterations = max_iterations
+        self.lookahead = lookahead  # candidate starts tried per session before accepting a domain wipeout
+        self.rng = np.random.default_rng(seed)
+        self.sessions: List[Dict[str, Any]] = []
+    
+    # Problem setup
+    
+    def _prepare(self, sessions: Sequence[Dict[str, Any]]):
+        self.sessions = [dict(session) for session in sessions]
+        count = len(self.sessions)
+        self.session_ids = [str(session.get("id") or f"session_{n + 1}") for n, session in enumerate(self.sessions)]
+        self._index = {session_id: n for n, session_id in enumerate(self.session_ids)}
+        
+        tracks: Dict[str, int] = {}
+        topics: Dict[str, int] = {}
+        self._speaker_index: Dict[str, int] = {}
+        self.length = np.zeros(count, dtype=np.int64)
+        self.track = np.zeros(count, dtype=np.int64)
+        self.audience = np.zeros(count)
+        self.topics: List[np.ndarray] = []
+        self.speakers: List[List[int]] = []
+        
+        for n, session in enumerate(self.sessions):
+            self.length[n] = max(math.ceil(float(session.get("duration") or self.slot_minutes) / self.slot_minutes), 1)
+            self.track[n] = tracks.setdefault(str(session.get("track") or "general").lower(), len(tracks))
+            self.audience[n] = float(session.get("audience") or 0)
+            names = {str(topic).strip().lower() for topic in session.get("topics") or ()} - {""}
+            self.topics.append(np.array(sorted(topics.setdefault(name, len(topics)) for name in names), dtype=np.int64))
+            self.speakers.append(sorted({self._speaker_index.setdefault(str(speaker), len(self._speaker_index)) for speaker in session.get("speakers") or ()}))
+        
+        self.track_count_size = max(len(tracks), 1)
+        self.topic_count_size = max(len(topics), 1)
+        
+        # Sessions sharing a speaker can never overlap
+        by_speaker: Dict[int, List[int]] = {}
+        for n, speakers in enumerate(self.speakers):
+            for speaker in speakers:
+                by_speaker.setdefault(speaker, []).append(n)
+        self.neighbors = [sorted({other for speaker in speakers for other in by_speaker[speaker]} - {n}) for n, speakers in enumerate(self.speakers)]
+        self.length_groups = {int(length): np.flatnonzero(self.length == length) for length in np.unique(self.length)}
+        
+        # Room fit cost: unused seats, or a large penalty where the audience does not fit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spare = (self.capacity[None, :] - self.audience[:, None]) / np.maximum(self.capacity[None, :], 1)
+        overflow = (self.audience[:, None] - self.capacity[None, :]) / np.maximum(self.audience[:, None], 1)
+        self.waste = self.waste_weight * np.where(spare >= 0, spare, 10.0 * (1.0 + overflow))
+        
+        self.static = np.stack([self._static_domain(n) for n in range(count)]) if count else np.zeros((0, len(self.room_ids), self.slot_count), dtype=bool)
+        self.active = np.ones(count, dtype=bool)
+        self._reset_state()
+    
+    def _static_domain(self, n: int) -> np.ndarray:
+        """(room, start slot) pairs allowed by capacity, availability and the day's end."""
+        session = self.sessions[n]
+        length = int(self.length[n])
+        slot_ok = np.ones(self.slot_count, dtype=bool)
+        
+        available_days = session.get("available_days")
+        if available_days:
+            days = [index for index in (self._day_index(day, self.session_ids[n]) for day in available_days) if index is not None]
+            slot_ok &= np.isin(np.arange(self.slot_count) // self.slots_per_day, days)
+        for window in session.get("unavailable") or ():
+            day = self._day_index(window["day"], self.session_ids[n])
+            if day is None:
+                continue
+            start = self._slot(day, parse_clock(window["start"]))
+            end = self._slot(day, parse_clock(window["end"]) + self.slot_minutes - 1)
+            slot_ok[start:end] = False
+        
+        start_ok = _window_all(slot_ok, length)
+        start_ok &= (np.arange(self.slot_count) % self.slots_per_day) + length <= self.slots_per_day
+        
+        room_ok = self.capacity >= self.audience[n]
+        if not room_ok.any():
+            logger.warning(f"No room fits the {self.audience[n]:.0f} expected at session {self.session_ids[n]}; using the largest")
+            room_ok = self.capacity == self.capacity.max()
+        return room_ok[:, None] & start_ok[None, :]
+    
+    def _day_index(self, day: Any, session_id: str) -> Optional[int]:
+        """0-based index of a 1-based event day, or None if the event has no such day."""
+        try:
+            index = int(day) - 1
+        except (TypeError, ValueError):
+            index = -1
+        if not 0 <= index < self.days:
+            logger.warning(f"Ignoring day {day!r} of session {session_id}; the event runs days 1 to {self.days}")
+            return None
+        return index
+    
+    def _slot(self, day: int, minutes: int) -> int:
+        """Slot index of a time on a 0-based day, clamped to that day."""
+        slot = min(max((minutes - self.day_start) // self.slot_minutes, 0), self.slots_per_day)
+        return day * self.slots_per_day + slot
+    
+    def _reset_state(self):
+        count = len(self.sessions)
+        self.assignment = np.full((count, 2), -1, dtype=np.int64)
+        self.room_busy = np.full((len(self.room_ids), self.slot_count), -1, dtype=np.int64)
+        self.speaker_load = np.zeros((max(len(self._speaker_index), 1), self.slot_count), dtype=np.int32)
+        self.track_count = np.zeros((self.slot_count, self.track_count_size), dtype=np.int32)
+        self.topic_count = np.zeros((self.slot_count, self.topic_count_size), dtype=np.int32)
+    
+    # Schedule state
+    
+    def _place(self, n: int, room: int, start: int):
+        end = start + int(self.length[n])
+        self.assignment[n] = (room, start)
+        self.room_busy[room, start:end] = n
+        self.speaker_load[self.speakers[n], start:end] += 1
+        self.track_count[start:end, self.track[n]] += 1
+        if self.topics[n].size:
+            self.topic_count[start:end, self.topics[n]] += 1
+    
+    def _remove(self, n: int) -> Tuple[int, int]:
+        room, start = (int(value) for value in self.assignment[n])
+        end = start + int(self.length[n])
+        self.assignment[n] = (-1, -1)
+        self.room_busy[room, start:end] = -1
+        self.speaker_load[self.speakers[n], start:end] -= 1
+        self.track_count[start:end, self.track[n]] -= 1
+        if self.topics[n].size:
+            self.topic_count[start:end, self.topics[n]] -= 1
+        return room, start
+    
+    def _candidates(self, n: int) -> np.ndarray:
+        """Free (room, start) pairs for an unplaced session given the current schedule."""
+        length = int(self.length[n])
+        room_free = _window_all(self.room_busy == -1, length)
+        speaker_free = ~self.speaker_load[self.speakers[n]].any(axis=0) if self.speakers[n] else np.ones(self.slot_count, dtype=bool)
+        return self.static[n] & room_free & _window_all(speaker_free, length)[None, :]
+    
+    def _costs(self, n: int) -> np.ndarray:
+        """Penalty of placing an unplaced session at each (room, start) pair."""
+        length = int(self.length[n])
+        overlap = self.track_weight * _window_sum(self.track_count[:, self.track[n]], length)
+        if self.topics[n].size:
+            overlap += self.topic_weight * _window_sum(self.topic_count[:, self.topics[n]].sum(axis=1), length)
+        return self.waste[n][:, None] + overlap[None, :]
+    
+    def cost(self) -> Dict[str, float]:
+        """Penalties of the current schedule."""
+        track_pairs = float((self.track_count * (self.track_count - 1) // 2).sum())
+        topic_pairs = float((self.topic_count * (self.topic_count - 1) // 2).sum())
+        placed = np.flatnonzero(self.assignment[:, 0] >= 0)
+        waste = float(self.waste[placed, self.assignment[placed, 0]].sum())
+        unscheduled = int((self.active & (self.assignment[:, 0] < 0)).sum())
+        return {
+            "track_conflicts": track_pairs,
+            "topic_conflicts": topic_pairs,
+            "room_fit": round(waste, 2),
+            "unscheduled": unscheduled,
+            "total": round(self.track_weight * track_pairs + self.topic_weight * topic_pairs + waste + UNSCHEDULED_PENALTY * unscheduled, 2)
+        }
+    
+    # Construction
+    
+    def _prune(self, domains: np.ndarray, n: int, room: int, start: int):
+        """Remove the (room, start) pairs a placement rules out from the other domains."""
+        end = start + int(self.length[n])
+        for length, members in self.length_groups.items():
+            domains[members, room, max(start - length + 1, 0):end] = False
+        for other in self.neighbors[n]:
+            domains[other, :, max(start - int(self.length[other]) + 1, 0):end] = False
+    
+    def _construct(self, initial: Optional[Dict[int, Tuple[int, int]]] = None):
+        domains = self.static.copy()
+        domains[~self.active] = False
+        
+        # Keep given placements that are still valid
+        for n, (room, start) in (initial or {}).items():
+            if self.active[n] and domains[n, room, start]:
+                self._place(n, room, start)
+                self._prune(domains, n, room, start)
+        
+        # Tie-break by size: longer sessions with bigger audiences and more speakers first
+        priority = self.length * 1e6 + self.audience * 10 + np.array([len(speakers) for speakers in self.speakers])
+        failed = np.zeros(len(self.sessions), dtype=bool)
+        
+        while True:
+            open_sessions = np.flatnonzero(self.active & (self.assignment[:, 0] < 0) & ~failed)
+            if open_sessions.size == 0:
+                break
+            sizes = domains[open_sessions].sum(axis=(1, 2))
+            n = int(open_sessions[np.lexsort((-priority[open_sessions], sizes))[0]])
+            if not domains[n].any():
+                failed[n] = True
+                continue
+            
+            costs = np.where(domains[n], self._costs(n), np.inf).ravel()
+            options = np.argsort(costs, kind="stable")[:self.lookahead]
+            others = open_sessions[open_sessions != n]
+            best: Optional[Tuple[int, int, np.ndarray]] = None
+            
+            for option in options:
+                if not np.isfinite(costs[option]):
+                    break
+                room, start = divmod(int(option), self.slot_count)
+                trial = domains.copy()
+                self._prune(trial, n, room, start)
+                wiped = int((~trial[others].any(axis=(1, 2))).sum()) if others.size else 0
+                if best is None or wiped < best[0]:
+                    best = (wiped, int(option), trial)
+                if wiped == 0:
+                    break
+            
+            _, option, domains = best
+            room, start = divmod(option, self.slot_count)
+            self._place(n, room, start)
+    
+    # Local search
+    
+    def _relocate(self, n: int, temperature: float, improve_only: bool = False) -> bool:
+        """Move a session to its best (or, by chance, a random) free start; True if moved."""
+        old_cost = self._removal_cost(n)
+        room, start = self._remove(n)
+        costs = np.where(self._candidates(n), self._costs(n), np.inf)
+        
+        if not improve_only and temperature > 0 and self.rng.random() < 0.1:
+            choices = np.flatnonzero(np.isfinite(costs.ravel()))
+            option = int(self.rng.choice(choices))
+            delta = costs.ravel()[option] - old_cost
+            if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+                option = room * self.slot_count + start
+        else:
+            flat = costs.ravel()
+            best = flat.min()
+            option = int(self.rng.choice(np.flatnonzero(flat <= best + 1e-9)))
+            if improve_only and flat[option] >= old_cost - 1e-9:
+                option = room * self.slot_count + start
+        
+        new_room, new_start = divmod(option, self.slot_count)
+        self._place(n, new_room, new_start)
+        return (new_room, new_start) != (room, start)
+    
+    def _removal_cost(self, n: int) -> float:
+        """Penalty a placed session currently adds to the schedule."""
+        room, start = (int(value) for value in self.assignment[n])
+        end = start + int(self.length[n])
+        overlap = self.track_weight * float((self.track_count[start:end, self.track[n]] - 1).sum())
+        if self.topics[n].size:
+            overlap += self.topic_weight * float((self.topic_count[start:end][:, self.topics[n]] - 1).sum())
+        return float(self.waste[n, room]) + overlap
+    
+    def _swap(self, first: int, second: int, temperature: float) -> bool:
+        """Exchange the places of two sessions of the same length if both fit and it pays off."""
+        before = self._removal_cost(first) + self._removal_cost(second)
+        first_place = self._remove(first)
+        second_place = self._remove(second)
+        
+        if self._candidates(first)[second_place] and self._candidates(second)[first_place]:
+            self._place(first, *second_place)
+            if self._candidates(second)[first_place]:
+                self._place(second, *first_place)
+                delta = self._removal_cost(first) + self._removal_cost(second) - before
+                if delta <= 0 or temperature > 0 and self.rng.random() < math.exp(-delta / temperature):
+                    return True
+                self._remove(second)
+            self._remove(first)
+        
+        self._place(first, *first_place)
+        self._place(second, *second_place)
+        return False
+    
+    def _place_unscheduled(self) -> List[int]:
+        """Place every unscheduled session that now has a free start; get those placed."""
+        placed = []
+        for n in np.flatnonzero(self.active & (self.assignment[:, 0] < 0)):
+            costs = np.where(self._candidates(n), self._costs(n), np.inf)
+            if np.isfinite(costs).any():
+                room, start = divmod(int(costs.argmin()), self.slot_count)
+                self._place(int(n), room, start)
+                placed.append(int(n))
+        return placed
+    
+    def _search(self, sessions: Optional[np.ndarray] = None, improve_only: bool = False, iterations: Optional[int] = None) -> int:
+        """Min-conflicts search over the given placed sessions (default all); get the moves made."""
+        iterations = iterations or self.max_iterations
+        deadline = time.monotonic() + self.search_seconds
+        best_cost = self.cost()["total"]
+        best_assignment = self.assignment.copy()
+        initial_temperature = 0.0 if improve_only else self.topic_weight
+        moves = 0
+        
+        for iteration in range(iterations):
+            if iteration % 256 == 0:
+                if time.monotonic() > deadline:
+                    break
+                self._place_unscheduled()
+                cost = self.cost()
+                if cost["total"] < best_cost:
+                    best_cost, best_assignment = cost["total"], self.assignment.copy()
+                if cost["total"] - cost["room_fit"] <= 0:
+                    break
+            
+            pool = sessions if sessions is not None else np.flatnonzero(self.assignment[:, 0] >= 0)
+            pool = pool[self.assignment[pool, 0] >= 0]
+            if pool.size == 0:
+                break
+            temperature = initial_temperature * (1 - iteration / iterations)
+            n = int(self.rng.choice(pool))
+            
+            if not improve_only and self.rng.random() < 0.3:
+                same_length = self.length_groups[int(self.length[n])]
+                partner = int(self.rng.choice(same_length))
+                if partner != n and self.assignment[partner, 0] >= 0 and self._swap(n, partner, temperature):
+                    moves += 1
+            elif self._relocate(n, temperature, improve_only):
+                moves += 1
+        
+        # Annealing may end above the best schedule seen
+        if self.cost()["total"] > best_cost:
+            self._reset_state()
+            for n in np.flatnonzero(best_assignment[:, 0] >= 0):
+                self._place(int(n), int(best_assignment[n, 0]), int(best_assignment[n, 1]))
+        return moves
+    
+    # Public interface
+    
+    def solve(self, sessions: Sequence[Dict[str, Any]], initial: Optional[Sequence[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Schedule the sessions, keeping valid placements of a previous schedule's entries."""
+        started = time.perf_counter()
+        self._prepare(sessions)
+        
+        warm_start: Dict[int, Tuple[int, int]] = {}
+        for entry in initial or ():
+            n = self._index.get(str(entry.get("session_id")))
+            if n is not None and entry.get("room") in self.room_ids:
+                day = self._day_index(entry.get("day"), self.session_ids[n])
+                if day is not None:
+                    warm_start[n] = (self.room_ids.index(entry["room"]), self._slot(day, parse_clock(entry["start"])))
+        
+        self._construct(warm_start)
+        constructed = self.cost()
+        moves = self._search()
+        
+        elapsed = time.perf_counter() - started
+        result = self.schedule()
+        result["stats"] = {
+            "sessions": len(self.sessions),
+            "rooms": len(self.room_ids),
+            "days": self.days,
+            "construction_cost": constructed["total"],
+            "search_moves": moves,
+            "elapsed_ms": round(elapsed * 1000, 1)
+        }
+        logger.info(f"Scheduled {len(self.sessions)} sessions in {elapsed:.2f}s: {result['cost']}")
+        return result
+    
+    def cancel_speaker(self, speaker_id: str) -> Dict[str, Any]:
+        """Drop a speaker and re-solve around the gap, leaving the rest of the schedule in place.
+        
+        Sessions the speaker shares with others keep running without them; the speaker's
+        solo sessions are cancelled. Their room time goes to unscheduled sessions first, then
+        sessions overlapping it may move where that removes conflicts.
+        """
+        speaker = self._speaker_index.get(str(speaker_id))
+        if speaker is None:
+            raise ValueError(f"Speaker {speaker_id} is not in the schedule")
+        
+        before = self.assignment.copy()
+        cancelled: List[str] = []
+        freed: List[Tuple[int, int]] = []
+        
+        for n in range(len(self.sessions)):
+            if not self.active[n] or speaker not in self.speakers[n]:
+                continue
+            placed = self.assignment[n, 0] >= 0
+            if placed:
+                room, start = self._remove(n)
+            if len(self.speakers[n]) > 1:
+                self.speakers[n] = [other for other in self.speakers[n] if other != speaker]
+                self.sessions[n]["speakers"] = [other for other in self.sessions[n]["speakers"] if str(other) != str(speaker_id)]
+                if placed:
+                    self._place(n, room, start)
+                continue
+            self.active[n] = False
+            cancelled.append(self.session_ids[n])
+            if placed:
+                freed.append((start, start + int(self.length[n])))
+        
+        placed_sessions = self._place_unscheduled()
+        
+        # Only sessions running during the freed time are worth moving
+        nearby = np.zeros(len(self.sessions), dtype=bool)
+        starts = self.assignment[:, 1]
+        for start, end in freed:
+            nearby |= (self.assignment[:, 0] >= 0) & (starts < end) & (starts + self.length > start)
+        if nearby.any():
+            self._search(np.flatnonzero(nearby), improve_only=True, iterations=20 * int(nearby.sum()))
+        
+        moved = [
+            self.session_ids[n]
+            for n in range(len(self.sessions))
+            if self.active[n] and before[n, 0] >= 0 and tuple(before[n]) != tuple(self.assignment[n])
+        ]
+        logger.info(f"Speaker {speaker_id} cancelled: {len(cancelled)} sessions dropped, {len(moved)} moved, {len(placed_sessions)} placed")
+        return {
+            "cancelled_sessions": cancelled,
+            "moved_sessions": moved,
+            "placed_sessions": [self.session_ids[n] for n in placed_sessions],
+            **self.schedule()
+        }
+    
+    def schedule(self) -> Dict[str, Any]:
+        """The current schedule: placed sessions by time, the unscheduled ones and penalties."""
+        entries = []
+        for n in np.flatnonzero(self.assignment[:, 0] >= 0):
+            room, start = (int(value) for value in self.assignment[n])
+            day, slot = divmod(start, self.slots_per_day)
+            begins = self.day_start + slot * self.slot_minutes
+            session = self.sessions[n]
+            entries.append({
+                "session_id": self.session_ids[n],
+                "title": session.get("title"),
+                "track": session.get("track"),
+                "speakers": session.get("speakers") or [],
+                "room": self.room_ids[room],
+                "day": day + 1,
+                "start": format_clock(begins),
+                "end": format_clock(begins + int(self.length[n]) * self.slot_minutes),
+                "audience": int(self.audience[n]),
+                "capacity": int(self.capacity[room])
+            })
+        entries.sort(key=lambda entry: (entry["day"], entry["start"], entry["room"]))
+        
+        return {
+            "sessions": entries,
+            "unscheduled": [self.session_ids[n] for n in np.flatnonzero(self.active & (self.assignment[:, 0] < 0))],
+            "cost": self.cost()
+        }
+
+def create_scheduler(rooms: Sequence[Dict[str, Any]], days: int) -> SessionScheduler:
+    """Scheduler for an event's rooms and days with the configured day and search limits."""
+    return SessionScheduler(
+        rooms,
+        days=days,
+        day_start=settings.SESSION_DAY_START,
+        day_end=settings.SESSION_DAY_END,
+        slot_minutes=settings.SESSION_SLOT_MINUTES,
+        search_seconds=settings.SESSION_SEARCH_SECONDS
+    )
@@ -0,0 +1,309 @@
+"""
+Speaker Index for OrchestrateX
+
+This module keeps a searchable directory of the speakers a tenant has worked with, built
+from the speakers table (expertise, title, bio). Profiles are embedded offline with a
+hashed TF-IDF vectorizer into a normalized NumPy matrix, so matching an event's topics is a
+single matrix-vector product with top-k selection: milliseconds for 100k speakers, no
+network, and only the best matches need LLM evaluation.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import time
+import zlib
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select, func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.event import Event
+from app.models.speaker import Speaker
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOP_WORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "with", "who",
+    "we", "was", "will", "years", "year", "experience", "speaker", "event", "events"
+))
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms plus adjacent-term bigrams ("machine learning")."""
+    words = [word for word in _TOKEN.findall(text.lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+class HashedTfidfVectorizer:
+    """TF-IDF over a fixed number of hashed, signed feature columns; needs no vocabulary."""
+    
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.idf = np.ones(dimensions, dtype=np.float32)
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+    
+    def _bucket(self, term: str) -> Tuple[int, float]:
+        bucket = self._buckets.get(term)
+        if bucket is None:
+            # crc32 is stable across processes, unlike hash(), so saved indexes stay valid
+            digest = zlib.crc32(term.encode("utf-8"))
+            bucket = (digest % self.dimensions, -1.0 if digest & 0x80000000 else 1.0)
+            self._buckets[term] = bucket
+        return bucket
+    
+    def _term_frequencies(self, text: str) -> Tuple[List[int], List[float]]:
+        """Hashed column and signed sublinear term frequency of each distinct term."""
+        counts: Dict[str, int] = {}
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        
+        columns: List[int] = []
+        values: List[float] = []
+        for term, count in counts.items():
+            column, sign = self._bucket(term)
+            columns.append(column)
+            values.append(sign * (1.0 + math.log(count)))
+        return columns, values
+    
+    def fit_transform(self, documents: Sequence[str]) -> np.ndarray:
+        """Learn IDF weights from the documents and return their normalized vectors."""
+        cells: List[int] = []
+        values: List[float] = []
+        for row, document in enumerate(documents):
+            columns, row_values = self._term_frequencies(document)
+            offset = row * self.dimensions
+            cells.extend(offset + column for column in columns)
+            values.extend(row_values)
+        
+        # Sum colliding terms of all documents in one pass
+        size = len(documents) * self.dimensions
+        matrix = np.bincount(np.asarray(cells, dtype=np.int64), weights=values, minlength=size)
+        matrix = matrix.astype(np.float32).reshape(len(documents), self.dimensions)
+        
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix *= self.idf
+        return self._normalize(matrix)
+    
+    def transform(self, document: str) -> np.ndarray:
+        """Get the normalized vector of one document."""
+        columns, values = self._term_frequencies(document)
+        vector = np.bincount(np.asarray(columns, dtype=np.int64), weights=values, minlength=self.dimensions).astype(np.float32)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
+
+def speaker_fee(value: Any) -> float:
+    """A speaker's fee as a float, 0.0 when unknown."""
+    try:
+        fee = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return fee if math.isfinite(fee) else 0.0
+
+def speaker_document(speaker: Dict[str, Any]) -> str:
+    """Text a speaker is indexed by; expertise counts twice as much as title and bio."""
+    expertise = speaker.get("expertise") or []
+    if isinstance(expertise, str):
+        expertise = [expertise]
+    expertise_text = " . ".join(str(area) for area in expertise)
+    return " . ".join(filter(None, (expertise_text, expertise_text, speaker.get("title"), speaker.get("bio"))))
+
+class SpeakerIndex:
+    """Speaker profiles with their TF-IDF matrix, searchable by cosine similarity."""
+    
+    def __init__(self, speakers: List[Dict[str, Any]], dimensions: int = 512, version: str = ""):
+        self.speakers = speakers
+        self.version = version
+        self.vectorizer = HashedTfidfVectorizer(dimensions)
+        self.matrix = self.vectorizer.fit_transform([speaker_document(speaker) for speaker in speakers])
+        self.checked_at = time.monotonic()
+    
+    def __len__(self) -> int:
+        return len(self.speakers)
+    
+    def search(self, query: str, k: int, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """Get up to k speakers best matching the query, best first, with their match_score."""
+        if not self.speakers or k <= 0:
+            return []
+        
+        scores = self.matrix @ self.vectorizer.transform(query)
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        return [
+            {**self.speakers[index], "match_score": round(float(scores[index]), 4)}
+            for index in top
+            if scores[index] > min_score
+        ]
+    
+    def save(self, path: str):
+        """Write the index to an .npz file."""
+        np.savez(
+            path,
+            matrix=self.matrix,
+            idf=self.vectorizer.idf,
+            speakers=np.array(json.dumps(self.speakers, default=str)),
+            version=np.array(self.version)
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "SpeakerIndex":
+        """Read an index written by save."""
+        with np.load(path) as data:
+            index = cls.__new__(cls)
+            index.speakers = json.loads(str(data["speakers"]))
+            for speaker in index.speakers:
+                # Indexes cached before fees were normalized may hold null or string fees
+                speaker["estimated_fee"] = speaker_fee(speaker.get("estimated_fee"))
+            index.version = str(data["version"])
+            index.matrix = data["matrix"]
+            index.vectorizer = HashedTfidfVectorizer(index.matrix.shape[1])
+            index.vectorizer.idf = data["idf"]
+            index.checked_at = time.monotonic()
+        return index
+
+class SpeakerDirectory:
+    """Per-tenant speaker indexes, rebuilt when the speakers table changes."""
+    
+    def __init__(self, dimensions: int = 512, refresh_seconds: float = 300.0, cache_dir: Optional[str] = None):
+        self.dimensions = dimensions
+        self.refresh_seconds = refresh_seconds
+        self.cache_dir = cache_dir
+        self._indexes: Dict[str, SpeakerIndex] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.builds = 0
+    
+    @staticmethod
+    def _tenant_filter(tenant_id: Optional[str]):
+        return Event.tenant_id == tenant_id if tenant_id is not None else Event.tenant_id.is_(None)
+    
+    def _cache_path(self, tenant_id: Optional[str]) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"speakers_{tenant_id or 'default'}.npz")
+    
+    async def _version(self, tenant_id: Optional[str]) -> str:
+        """Fingerprint of a tenant's speakers: row count and latest change."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(func.count(Speaker.id), func.max(func.coalesce(Speaker.updated_at, Speaker.created_at)))
+                .join(Event, Speaker.event_id == Event.id)
+                .where(self._tenant_filter(tenant_id))
+            )
+            count, changed_at = result.one()
+        return f"{count}:{changed_at.isoformat() if changed_at else ''}"
+    
+    async def _load_speakers(self, tenant_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Read a tenant's speakers, keeping the latest row per person."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    Speaker.id, Speaker.name, Speaker.title, Speaker.company, Speaker.bio,
+                    Speaker.expertise, Speaker.email, Speaker.fee
+                )
+                .join(Event, Speaker.event_id == Event.id)
+                .where(self._tenant_filter(tenant_id))
+                .order_by(Speaker.created_at)
+            )
+            rows = result.all()
+        
+        speakers: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in rows:
+            key = (row.name.strip().lower(), (row.email or row.company or "").strip().lower())
+            speakers[key] = {
+                "id": row.id,
+                "name": row.name,
+                "title": row.title,
+                "company": row.company,
+                "expertise": row.expertise or [],
+                "bio": row.bio,
+                "contact": row.email,
+                "estimated_fee": speaker_fee(row.fee)
+            }
+        return list(speakers.values())
+    
+    async def get_index(self, tenant_id: Optional[str]) -> SpeakerIndex:
+        """Get a tenant's index, rebuilding it if the speakers table has changed."""
+        key = tenant_id or "default"
+        index = self._indexes.get(key)
+        if index is not None and time.monotonic() - index.checked_at < self.refresh_seconds:
+            return index
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(key)
+            if index is not None and time.monotonic() - index.checked_at < self.refresh_seconds:
+                return index
+            
+            version = await self._version(tenant_id)
+            if index is not None and index.version == version:
+                index.checked_at = time.monotonic()
+                return index
+            
+            path = self._cache_path(tenant_id)
+            if path and os.path.exists(path):
+                try:
+                    cached = SpeakerIndex.load(path)
+                    if cached.version == version and cached.matrix.shape[1] == self.dimensions:
+                        self._indexes[key] = cached
+                        return cached
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable speaker index {path}: {str(e)}")
+            
+            speakers = await self._load_speakers(tenant_id)
+            started = time.perf_counter()
+            # Vectorizing a large directory is CPU-bound; keep it off the event loop
+            index = await asyncio.to_thread(SpeakerIndex, speakers, self.dimensions, version)
+            self.builds += 1
+            logger.info(f"Indexed {len(index)} speakers for tenant {key} in {time.perf_counter() - started:.2f}s")
+            
+            if path:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    index.save(path)
+                except OSError as e:
+                    logger.warning(f"Failed to save speaker index {path}: {str(e)}")
+            
+            self._indexes[key] = index
+            return index
+    
+    async def search(self, event_id: str, query: str, k: int, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """Find the speakers of an event's tenant best matching the query."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Event.tenant_id).where(Event.id == event_id))
+            tenant_id = result.scalar_one_or_none()
+        
+        index = await self.get_index(tenant_id)
+        return index.search(query, k, min_score)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index sizes and build counts."""
+        return {
+            "tenants": len(self._indexes),
+            "speakers": sum(len(index) for index in self._indexes.values()),
+            "builds": self.builds
+        }
+
+# Shared speaker directory
+speaker_directory = SpeakerDirectory(
+    dimensions=settings.SPEAKER_INDEX_DIMENSIONS,
+    refresh_seconds=settings.SPEAKER_INDEX_REFRESH_SECONDS,
+    cache_dir=settings.SPEAKER_INDEX_CACHE_DIR or None
+)
@@ -1,11 +1,34 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from langchain.schema import HumanMessage, SystemMessage
+from app.core.config import settings
+from app.core.llm_rate_limit import PRIORITY_LOW
 from .base_agent import BaseAgent
+from .session_scheduler import create_scheduler, event_rooms, lineup_sessions
+from .speaker_index import speaker_directory
+from .event_dates import event_days
+import asyncio
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SpeakerOutreachAgent(BaseAgent):
     """AI agent responsible for finding and contacting potential speakers."""
     
+    STEP_INPUTS = {
+        "analyze_speaker_requirements": {"fields": ("name", "description", "start_date", "end_date", "expected_attendees", "budget_total")},
+        # Candidates depend on topics and audience; fees are weighed when evaluating
+        "research_speakers": {"steps": ("analyze_speaker_requirements",), "ignore": ("budget_total",)},
+        "evaluate_speakers": {"steps": ("analyze_speaker_requirements", "research_speakers")},
+        "create_outreach_messages": {
+            "fields": ("name", "description", "start_date", "end_date", "city", "country", "venue_name", "venue_address", "expected_attendees", "brief_json"),
+            "steps": ("evaluate_speakers",),
+            "ignore": ("budget_total",)
+        },
+        "propose_speaker_lineup": {"steps": ("analyze_speaker_requirements", "evaluate_speakers")},
+        "schedule_sessions": {"fields": ("start_date", "end_date", "expected_attendees", "max_attendees", "brief_json"), "steps": ("propose_speaker_lineup",)},
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "speaker_outreach")
     
@@ -30,30 +53,35 @@ class SpeakerOutreachAgent(BaseAgent):
         await self.update_progress(10, "Analyzing event requirements...")
         
         # Step 1: Analyze event requirements
-        requirements = await self._analyze_speaker_requirements(event_data)
+        requirements = await self.run_step("analyze_speaker_requirements", lambda: self._analyze_speaker_requirements(event_data))
         await self.log_activity("Analyzed speaker requirements", "info", requirements)
         
         await self.update_progress(25, "Researching potential speakers...")
         
         # Step 2: Research potential speakers
-        speakers = await self._research_speakers(requirements)
+        speakers = await self.run_step("research_speakers", lambda: self._research_speakers(requirements))
         await self.log_activity(f"Found {len(speakers)} potential speakers", "info", {"speaker_count": len(speakers)})
         
         await self.update_progress(40, "Evaluating speaker fit...")
         
         # Step 3: Evaluate speakers
-        evaluated_speakers = await self._evaluate_speakers(speakers, requirements)
+        evaluated_speakers = await self.run_step("evaluate_speakers", lambda: self._evaluate_speakers(speakers, requirements))
         await self.log_activity("Completed speaker evaluation", "info", {"evaluated_count": len(evaluated_speakers)})
         
         await self.update_progress(60, "Creating outreach messages...")
         
         # Step 4: Create outreach messages
-        outreach_messages = await self._create_outreach_messages(evaluated_speakers, event_data)
+        outreach_messages = await self.run_step("create_outreach_messages", lambda: self._create_outreach_messages(evaluated_speakers, event_data))
         
         await self.update_progress(80, "Proposing speaker lineup...")
         
         # Step 5: Propose speaker lineup
-        lineup = await self._propose_speaker_lineup(evaluated_speakers, requirements)
+        lineup = await self.run_step("propose_speaker_lineup", lambda: self._propose_speaker_lineup(evaluated_speakers, requirements))
+        
+        if lineup and settings.SESSION_SCHEDULING_ENABLED:
+            await self.update_progress(85, "Scheduling sessions...")
+            schedule = await self.run_step("schedule_sessions", lambda: self._schedule_sessions(lineup, event_data))
+            lineup = {**lineup, "schedule": schedule}
         
         await self.update_progress(90, "Requesting approval for speaker lineup...")
         
@@ -126,8 +154,41 @@ class SpeakerOutreachAgent(BaseAgent):
                 "special_requirements": []
             }
     
+    @staticmethod
+    def _speaker_query(requirements: Dict[str, Any]) -> str:
+        """Topics of the event to match speaker profiles against."""
+        terms: List[str] = []
+        for key in ("expertise_areas", "event_theme", "focus_areas", "topics", "target_audience"):
+            value = requirements.get(key)
+            if isinstance(value, list):
+                terms.extend(str(item) for item in value)
+            elif value:
+                terms.append(str(value))
+        return " . ".join(terms)
+    
     async def _research_speakers(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Research potential speakers based on requirements."""
+        if settings.SPEAKER_INDEX_ENABLED:
+            # Match the tenant's speaker directory first; the LLM only researches when it comes up short
+            try:
+                matches = await speaker_directory.search(
+                    self.event_id,
+                    self._speaker_query(requirements),
+                    settings.SPEAKER_INDEX_SHORTLIST,
+                    settings.SPEAKER_INDEX_MIN_SCORE
+                )
+            except Exception as e:
+                logger.warning(f"Speaker directory search failed for event {self.event_id}: {str(e)}")
+                matches = []
+            
+            if len(matches) >= settings.SPEAKER_INDEX_MIN_MATCHES:
+                await self.log_activity(
+                    f"Matched {len(matches)} speakers from the speaker directory",
+                    "info",
+                    {"top_match_score": matches[0]["match_score"]}
+                )
+                return matches
+        
         messages = [
             SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=f"""
@@ -161,6 +222,12 @@ class SpeakerOutreachAgent(BaseAgent):
     async def _evaluate_speakers(self, speakers: List[Dict[str, Any]], requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Evaluate speakers based on requirements and criteria."""
         evaluated_speakers = []
+        shortlisted: List[Dict[str, Any]] = []
+        
+        if speakers and all("match_score" in speaker for speaker in speakers):
+            # Directory matches come pre-scored; only the best ones are worth an LLM evaluation
+            speakers = sorted(speakers, key=lambda x: x["match_score"], reverse=True)
+            speakers, shortlisted = speakers[:settings.SPEAKER_INDEX_FINALISTS], speakers[settings.SPEAKER_INDEX_FINALISTS:]
         
         for speaker in speakers:
             messages = [
@@ -203,35 +270,66 @@ class SpeakerOutreachAgent(BaseAgent):
                 })
                 evaluated_speakers.append(speaker)
         
-        # Sort by fit score
+        # Sort by fit score; unevaluated directory matches follow the finalists
         evaluated_speakers.sort(key=lambda x: x.get("fit_score", 0), reverse=True)
         
-        return evaluated_speakers
+        return evaluated_speakers + shortlisted
     
     async def _create_outreach_messages(self, speakers: List[Dict[str, Any]], event_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create personalized outreach messages for speakers."""
-        messages = []
+        top_speakers = speakers[:8]  # Top 8 speakers
+        messages: List[Dict[str, Any]] = [None] * len(top_speakers)
+        
+        async for index, outreach in self.draft_outreach_messages(top_speakers, event_data):
+            messages[index] = outreach
+            await self.log_activity(
+                f"Drafted outreach message for {outreach['speaker_name']}",
+                "info",
+                {"speaker_id": outreach["speaker_id"]}
+            )
         
-        for speaker in speakers[:8]:  # Top 8 speakers
-            outreach_message = await self._create_speaker_outreach(speaker, event_data)
-            messages.append({
+        return messages
+    
+    async def draft_outreach_messages(
+        self,
+        speakers: List[Dict[str, Any]],
+        event_data: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Draft outreach messages concurrently, yielding (rank, draft) as each one finishes."""
+        # Serialize the event once; every draft shares it as the prompt prefix
+        event_context = json.dumps(event_data, indent=2)
+        
+        async def draft(speaker: Dict[str, Any]) -> Dict[str, Any]:
+            outreach_message = await self._create_speaker_outreach(speaker, event_data, event_context)
+            return {
                 "speaker_id": speaker.get("id"),
                 "speaker_name": speaker.get("name"),
                 "message": outreach_message,
                 "status": "draft"
-            })
+            }
         
-        return messages
+        async for index, outreach in self.iter_concurrent(draft, speakers, settings.SPEAKER_OUTREACH_CONCURRENCY):
+            yield index, outreach
     
-    async def _create_speaker_outreach(self, speaker: Dict[str, Any], event_data: Dict[str, Any]) -> str:
+    async def _create_speaker_outreach(
+        self,
+        speaker: Dict[str, Any],
+        event_data: Dict[str, Any],
+        event_context: Optional[str] = None
+    ) -> str:
         """Create a personalized outreach message for a specific speaker."""
+        if event_context is None:
+            event_context = json.dumps(event_data, indent=2)
+        
+        # Event details come first so concurrent drafts share an identical prompt prefix
         messages = [
             SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=f"""
+            Event: {event_context}
+            
             Create a personalized outreach message for this speaker:
             
             Speaker: {json.dumps(speaker, indent=2)}
-            Event: {json.dumps(event_data, indent=2)}
             
             The message should be:
             1. Professional and personalized
@@ -244,7 +342,8 @@ class SpeakerOutreachAgent(BaseAgent):
             """)
         ]
         
-        response = await self.get_llm_response(messages)
+        # Bulk drafts yield the rate budget to other agents' critical-path steps
+        response = await self.get_llm_response(messages, priority=PRIORITY_LOW)
         return response
     
     async def _propose_speaker_lineup(self, speakers: List[Dict[str, Any]], requirements: Dict[str, Any]) -> Dict[str, Any]:
@@ -293,6 +392,19 @@ class SpeakerOutreachAgent(BaseAgent):
                 "reasoning": "Selected based on expertise fit and availability"
             }
     
+    async def _schedule_sessions(self, lineup: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Assign the lineup's sessions to rooms and timeslots."""
+        sessions = lineup_sessions(lineup, event_data.get('expected_attendees', 100))
+        if not sessions:
+            return {"sessions": [], "unscheduled": []}
+        
+        scheduler = create_scheduler(
+            event_rooms(event_data, settings.SESSION_BREAKOUT_ROOMS),
+            event_days(event_data)
+        )
+        # The local search is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(scheduler.solve, sessions)
+    
     def _get_mock_speakers(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get mock speakers for testing purposes."""
         theme = requirements.get("event_theme", "Technology")
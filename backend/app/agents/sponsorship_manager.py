@@ -6,6 +6,25 @@ import json
 class SponsorshipManagerAgent(BaseAgent):
     """AI agent responsible for managing sponsor relationships and revenue generation."""
     
+    STEP_INPUTS = {
+        "analyze_sponsorship_opportunities": {"fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date", "budget_total")},
+        "develop_sponsorship_packages": {
+            "fields": ("name", "description", "expected_attendees", "city", "country", "start_date", "end_date", "budget_total", "brief_json"),
+            "steps": ("analyze_sponsorship_opportunities",)
+        },
+        # Prospective sponsors depend on the event's audience and industry, not on package pricing
+        "identify_potential_sponsors": {
+            "fields": ("name", "description", "city", "country", "brief_json"),
+            "steps": ("develop_sponsorship_packages",),
+            "ignore": ("budget_total",)
+        },
+        "create_outreach_strategy": {"steps": ("identify_potential_sponsors", "develop_sponsorship_packages")},
+        "plan_sponsor_engagement": {
+            "fields": ("name", "start_date", "end_date", "venue_name", "expected_attendees", "brief_json"),
+            "steps": ("develop_sponsorship_packages",)
+        },
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "sponsorship_manager")
     
@@ -31,30 +50,30 @@ class SponsorshipManagerAgent(BaseAgent):
         await self.update_progress(10, "Analyzing sponsorship opportunities...")
         
         # Step 1: Analyze sponsorship opportunities
-        sponsorship_analysis = await self._analyze_sponsorship_opportunities(event_data)
+        sponsorship_analysis = await self.run_step("analyze_sponsorship_opportunities", lambda: self._analyze_sponsorship_opportunities(event_data))
         await self.log_activity("Analyzed sponsorship opportunities", "info", sponsorship_analysis)
         
         await self.update_progress(25, "Developing sponsorship packages...")
         
         # Step 2: Develop sponsorship packages
-        sponsorship_packages = await self._develop_sponsorship_packages(event_data, sponsorship_analysis)
+        sponsorship_packages = await self.run_step("develop_sponsorship_packages", lambda: self._develop_sponsorship_packages(event_data, sponsorship_analysis))
         await self.log_activity("Developed sponsorship packages", "info", {"package_count": len(sponsorship_packages.get("packages", []))})
         
         await self.update_progress(40, "Identifying potential sponsors...")
         
         # Step 3: Identify potential sponsors
-        potential_sponsors = await self._identify_potential_sponsors(event_data, sponsorship_packages)
+        potential_sponsors = await self.run_step("identify_potential_sponsors", lambda: self._identify_potential_sponsors(event_data, sponsorship_packages))
         await self.log_activity("Identified potential sponsors", "info", {"sponsor_count": len(potential_sponsors.get("sponsors", []))})
         
         await self.update_progress(60, "Creating outreach strategy...")
         
         # Step 4: Create outreach strategy
-        outreach_strategy = await self._create_outreach_strategy(potential_sponsors, sponsorship_packages)
+        outreach_strategy = await self.run_step("create_outreach_strategy", lambda: self._create_outreach_strategy(potential_sponsors, sponsorship_packages))
         
         await self.update_progress(80, "Planning sponsor engagement...")
         
         # Step 5: Plan sponsor engagement
-        engagement_plan = await self._plan_sponsor_engagement(sponsorship_packages, event_data)
+        engagement_plan = await self.run_step("plan_sponsor_engagement", lambda: self._plan_sponsor_engagement(sponsorship_packages, event_data))
         
         await self.update_progress(90, "Requesting approval for sponsorship plan...")
         
@@ -0,0 +1,193 @@
+"""
+Venue Pre-ranking for OrchestrateX
+
+This module scores researched venues against the event requirements with NumPy before any
+LLM evaluation. Venues are loaded into a columnar batch (capacity, total cost, amenity
+bitmask, availability), venues that cannot host the event are filtered out, and the rest
+are ranked so only the most promising few are sent to the LLM. Scoring is vectorized and
+stays fast for catalogs of thousands of venues.
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Weights of the score components, summing to 1
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "capacity": 0.30,
+    "budget": 0.35,
+    "amenities": 0.20,
+    "availability": 0.15,
+}
+
+# Score given to a component the venue has no data for
+UNKNOWN_SCORE = 0.5
+
+# Amenities beyond this many required ones are not tracked in the bitmask
+MAX_AMENITIES = 64
+
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_UNAVAILABLE = ("unavailable", "not available", "booked", "sold out", "closed")
+_TENTATIVE = ("limited", "tentative", "partial", "waitlist", "pending", "hold")
+
+def parse_number(value: Any) -> float:
+    """Read a capacity or rate from LLM output ("$5,000/day", "1,200-1,500"); NaN if absent."""
+    if isinstance(value, bool) or value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.search(str(value))
+    return float(match.group().replace(",", "")) if match else np.nan
+
+def parse_availability(value: Any) -> float:
+    """Map an availability note to 1 (available), 0.5 (tentative or unknown) or 0 (unavailable)."""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    text = str(value or "").lower()
+    if any(marker in text for marker in _UNAVAILABLE):
+        return 0.0
+    if any(marker in text for marker in _TENTATIVE):
+        return UNKNOWN_SCORE
+    return 1.0 if "available" in text else UNKNOWN_SCORE
+
+def normalize_amenity(name: Any) -> str:
+    """Reduce an amenity name to lowercase letters and digits ("A/V Equipment" -> "avequipment")."""
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+def amenity_bits(required: Sequence[Any]) -> Dict[str, int]:
+    """Assign a bit to each distinct required amenity."""
+    bits: Dict[str, int] = {}
+    for name in required:
+        key = normalize_amenity(name)
+        if key and key not in bits:
+            if len(bits) == MAX_AMENITIES:
+                logger.warning(f"Only the first {MAX_AMENITIES} required amenities are scored")
+                break
+            bits[key] = len(bits)
+    return bits
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Count set bits of each uint64 mask."""
+    return np.unpackbits(masks.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+class VenueBatch:
+    """Columnar view of a list of venues for vectorized scoring."""
+    
+    def __init__(self, venues: Sequence[Dict[str, Any]], bits: Dict[str, int], event_days: int = 1):
+        self.venues = list(venues)
+        self.capacity = np.array([parse_number(venue.get("capacity")) for venue in self.venues], dtype=np.float64)
+        self.cost = np.array([parse_number(venue.get("daily_rate")) for venue in self.venues], dtype=np.float64) * max(event_days, 1)
+        self.availability = np.array([parse_availability(venue.get("availability")) for venue in self.venues], dtype=np.float64)
+        
+        masks = np.zeros(len(self.venues), dtype=np.uint64)
+        for index, venue in enumerate(self.venues):
+            mask = 0
+            for name in venue.get("amenities") or ():
+                bit = bits.get(normalize_amenity(name))
+                if bit is not None:
+                    mask |= 1 << bit
+            masks[index] = mask
+        self.amenities = masks
+    
+    def __len__(self) -> int:
+        return len(self.venues)
+
+class VenueRanker:
+    """Deterministic venue scoring, hard filtering and top-k selection."""
+    
+    def __init__(
+        self,
+        max_budget_ratio: float = 1.5,
+        min_capacity_ratio: float = 1.0,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        self.max_budget_ratio = max_budget_ratio
+        self.min_capacity_ratio = min_capacity_ratio
+        self.weights = weights or DEFAULT_WEIGHTS
+    
+    def score(self, batch: VenueBatch, requirements: Dict[str, Any], bits: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get each venue's score in [0, 1] and whether it is feasible at all."""
+        required_capacity = parse_number(requirements.get("capacity_required"))
+        budget = parse_number(requirements.get("budget_max"))
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Capacity: full marks up to 1.5x the required size, then down with the unused space
+            if np.isnan(required_capacity) or required_capacity <= 0:
+                capacity_score = np.full(len(batch), UNKNOWN_SCORE)
+                capacity_ok = np.ones(len(batch), dtype=bool)
+            else:
+                capacity_score = np.clip(1.5 * required_capacity / batch.capacity, 0.0, 1.0)
+                capacity_score = np.where(batch.capacity < required_capacity, 0.5 * batch.capacity / required_capacity, capacity_score)
+                capacity_ok = ~(batch.capacity < required_capacity * self.min_capacity_ratio)
+            capacity_score = np.where(np.isnan(batch.capacity), UNKNOWN_SCORE, capacity_score)
+            
+            # Budget: cheaper is better within budget, falling to 0 at the hard limit
+            if np.isnan(budget) or budget <= 0:
+                budget_score = np.full(len(batch), UNKNOWN_SCORE)
+                budget_ok = np.ones(len(batch), dtype=bool)
+            else:
+                ratio = batch.cost / budget
+                over = (ratio - 1.0) / max(self.max_budget_ratio - 1.0, 1e-9)
+                budget_score = np.where(ratio <= 1.0, 1.0 - 0.3 * ratio, 0.7 * (1.0 - over))
+                budget_score = np.clip(budget_score, 0.0, 1.0)
+                budget_ok = ~(ratio > self.max_budget_ratio)
+            budget_score = np.where(np.isnan(batch.cost), UNKNOWN_SCORE, budget_score)
+        
+        # Amenities: share of the required amenities the venue lists
+        if bits:
+            required_mask = np.uint64((1 << len(bits)) - 1)
+            amenity_score = _popcount(batch.amenities & required_mask) / len(bits)
+        else:
+            amenity_score = np.ones(len(batch))
+        
+        scores = (
+            self.weights["capacity"] * capacity_score
+            + self.weights["budget"] * budget_score
+            + self.weights["amenities"] * amenity_score
+            + self.weights["availability"] * batch.availability
+        )
+        feasible = capacity_ok & budget_ok & (batch.availability > 0)
+        return scores, feasible
+    
+    def rank(
+        self,
+        venues: Sequence[Dict[str, Any]],
+        requirements: Dict[str, Any],
+        top_k: int,
+        event_days: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Get the top_k feasible venues, best first, each annotated with its prerank_score.
+        
+        If no venue passes the hard filters, the best-scoring ones are returned anyway so
+        the workflow still has candidates to evaluate.
+        """
+        if not venues or top_k <= 0:
+            return []
+        
+        bits = amenity_bits(requirements.get("amenities_required") or ())
+        batch = VenueBatch(venues, bits, event_days)
+        scores, feasible = self.score(batch, requirements, bits)
+        
+        candidates = np.flatnonzero(feasible)
+        if candidates.size == 0:
+            logger.warning(f"No venue of {len(batch)} meets the capacity, budget and availability limits; ranking all")
+            candidates = np.arange(len(batch))
+        
+        if candidates.size > top_k:
+            best = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[best]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        
+        logger.info(f"Pre-ranked {len(batch)} venues: {int(feasible.sum())} feasible, {len(order)} shortlisted")
+        return [{**batch.venues[index], "prerank_score": round(float(scores[index]), 4)} for index in order]
+
+# Shared venue ranker
+venue_ranker = VenueRanker(
+    max_budget_ratio=settings.VENUE_MAX_BUDGET_RATIO,
+    min_capacity_ratio=settings.VENUE_MIN_CAPACITY_RATIO
+)
@@ -1,11 +1,22 @@
 from typing import Dict, Any, List
 from langchain.schema import HumanMessage, SystemMessage
+from app.core.config import settings
 from .base_agent import BaseAgent
+from .venue_ranking import venue_ranker
+from .event_dates import event_days
 import json
 
 class VenueScoutAgent(BaseAgent):
     """AI agent responsible for finding and evaluating conference venues."""
     
+    STEP_INPUTS = {
+        "analyze_requirements": {"fields": ("name", "description", "city", "country", "start_date", "end_date", "expected_attendees", "budget_total")},
+        # Candidate venues depend on location, dates and size; budget fit is judged when evaluating
+        "research_venues": {"steps": ("analyze_requirements",), "ignore": ("budget_total",)},
+        "evaluate_venues": {"fields": ("start_date", "end_date"), "steps": ("analyze_requirements", "research_venues")},
+        "create_proposals": {"steps": ("evaluate_venues",)},
+    }
+    
     def __init__(self, agent_id: str, event_id: str):
         super().__init__(agent_id, event_id, "venue_scout")
     
@@ -33,25 +44,25 @@ class VenueScoutAgent(BaseAgent):
         await self.update_progress(10, "Analyzing event requirements...")
         
         # Step 1: Analyze event requirements
-        requirements = await self._analyze_requirements(event_data)
+        requirements = await self.run_step("analyze_requirements", lambda: self._analyze_requirements(event_data))
         await self.log_activity("Analyzed event requirements", "info", requirements)
         
         await self.update_progress(25, "Researching potential venues...")
         
         # Step 2: Research potential venues
-        venues = await self._research_venues(requirements)
+        venues = await self.run_step("research_venues", lambda: self._research_venues(requirements))
         await self.log_activity(f"Found {len(venues)} potential venues", "info", {"venue_count": len(venues)})
         
         await self.update_progress(50, "Evaluating venues...")
         
         # Step 3: Evaluate venues
-        evaluated_venues = await self._evaluate_venues(venues, requirements)
+        evaluated_venues = await self.run_step("evaluate_venues", lambda: self._evaluate_venues(venues, requirements, event_days(event_data)))
         await self.log_activity("Completed venue evaluation", "info", {"evaluated_count": len(evaluated_venues)})
         
         await self.update_progress(75, "Creating venue proposals...")
         
         # Step 4: Create proposals
-        proposals = await self._create_proposals(evaluated_venues)
+        proposals = await self.run_step("create_proposals", lambda: self._create_proposals(evaluated_venues))
         
         await self.update_progress(90, "Requesting approval for venue selection...")
         
@@ -153,96 +164,109 @@ class VenueScoutAgent(BaseAgent):
             # Return mock venues if parsing fails
             return self._get_mock_venues(requirements)
     
-    async def _evaluate_venues(self, venues: List[Dict[str, Any]], requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _evaluate_venues(self, venues: List[Dict[str, Any]], requirements: Dict[str, Any], event_days: int = 1) -> List[Dict[str, Any]]:
         """Evaluate venues based on requirements and criteria."""
-        evaluated_venues = []
+        if settings.VENUE_PRERANK_ENABLED:
+            # Drop venues that cannot host the event and only send the best few to the LLM
+            shortlist = venue_ranker.rank(venues, requirements, settings.VENUE_PRERANK_TOP_K, event_days)
+            await self.log_activity(
+                f"Shortlisted {len(shortlist)} of {len(venues)} venues for evaluation",
+                "info",
+                {"venue_ids": [venue.get("id") for venue in shortlist]}
+            )
+            venues = shortlist
         
-        for venue in venues:
-            messages = [
-                SystemMessage(content=self.get_system_prompt()),
-                HumanMessage(content=f"""
-                Evaluate this venue against the requirements:
-                
-                Venue: {json.dumps(venue, indent=2)}
-                Requirements: {json.dumps(requirements, indent=2)}
-                
-                Provide an evaluation including:
-                1. Overall score (0-100)
-                2. Pros and cons
-                3. Budget fit assessment
-                4. Capacity suitability
-                5. Location assessment
-                6. Amenities match
-                7. Recommendations
-                
-                Return as a JSON object with these fields.
-                """)
-            ]
-            
-            response = await self.get_llm_response(messages)
-            
-            try:
-                evaluation = json.loads(response)
-                venue.update(evaluation)
-                evaluated_venues.append(venue)
-            except json.JSONDecodeError:
-                # Add basic evaluation if parsing fails
-                venue.update({
-                    "score": 70,
-                    "pros": ["Available", "Good location"],
-                    "cons": ["Limited information"],
-                    "recommendation": "Consider for further review"
-                })
-                evaluated_venues.append(venue)
+        evaluated_venues = await self.map_concurrent(
+            lambda venue: self._evaluate_venue(venue, requirements),
+            venues
+        )
         
         # Sort by score
         evaluated_venues.sort(key=lambda x: x.get("score", 0), reverse=True)
         
         return evaluated_venues
     
+    async def _evaluate_venue(self, venue: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate a single venue against the requirements."""
+        messages = [
+            SystemMessage(content=self.get_system_prompt()),
+            HumanMessage(content=f"""
+            Evaluate this venue against the requirements:
+            
+            Venue: {json.dumps(venue, indent=2)}
+            Requirements: {json.dumps(requirements, indent=2)}
+            
+            Provide an evaluation including:
+            1. Overall score (0-100)
+            2. Pros and cons
+            3. Budget fit assessment
+            4. Capacity suitability
+            5. Location assessment
+            6. Amenities match
+            7. Recommendations
+            
+            Return as a JSON object with these fields.
+            """)
+        ]
+        
+        response = await self.get_llm_response(messages)
+        
+        try:
+            evaluation = json.loads(response)
+            venue.update(evaluation)
+        except json.JSONDecodeError:
+            # Add basic evaluation if parsing fails
+            venue.update({
+                "score": 70,
+                "pros": ["Available", "Good location"],
+                "cons": ["Limited information"],
+                "recommendation": "Consider for further review"
+            })
+        
+        return venue
+    
     async def _create_proposals(self, evaluated_venues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create detailed venue proposals."""
-        proposals = []
-        
-        for venue in evaluated_venues[:3]:  # Top 3 venues
-            messages = [
-                SystemMessage(content=self.get_system_prompt()),
-                HumanMessage(content=f"""
-                Create a detailed proposal for this venue:
-                {json.dumps(venue, indent=2)}
-                
-                Include:
-                1. Executive summary
-                2. Detailed venue analysis
-                3. Cost breakdown
-                4. Risk assessment
-                5. Implementation timeline
-                6. Final recommendation
-                
-                Return as a JSON object with these sections.
-                """)
-            ]
+        # Top 3 venues
+        return await self.map_concurrent(self._create_proposal, evaluated_venues[:3])
+    
+    async def _create_proposal(self, venue: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a detailed proposal for a single venue."""
+        messages = [
+            SystemMessage(content=self.get_system_prompt()),
+            HumanMessage(content=f"""
+            Create a detailed proposal for this venue:
+            {json.dumps(venue, indent=2)}
             
-            response = await self.get_llm_response(messages)
+            Include:
+            1. Executive summary
+            2. Detailed venue analysis
+            3. Cost breakdown
+            4. Risk assessment
+            5. Implementation timeline
+            6. Final recommendation
             
-            try:
-                proposal = json.loads(response)
-                proposal["venue_data"] = venue
-                proposals.append(proposal)
-            except json.JSONDecodeError:
-                # Create basic proposal if parsing fails
-                proposal = {
-                    "executive_summary": f"Proposal for {venue.get('name', 'Unknown Venue')}",
-                    "venue_analysis": venue,
-                    "cost_breakdown": {"daily_rate": venue.get("daily_rate", 0)},
-                    "risk_assessment": "Standard venue risks apply",
-                    "timeline": "Immediate booking recommended",
-                    "recommendation": "Proceed with booking",
-                    "venue_data": venue
-                }
-                proposals.append(proposal)
+            Return as a JSON object with these sections.
+            """)
+        ]
+        
+        response = await self.get_llm_response(messages)
         
-        return proposals
+        try:
+            proposal = json.loads(response)
+            proposal["venue_data"] = venue
+            return proposal
+        except json.JSONDecodeError:
+            # Create basic proposal if parsing fails
+            return {
+                "executive_summary": f"Proposal for {venue.get('name', 'Unknown Venue')}",
+                "venue_analysis": venue,
+                "cost_breakdown": {"daily_rate": venue.get("daily_rate", 0)},
+                "risk_assessment": "Standard venue risks apply",
+                "timeline": "Immediate booking recommended",
+                "recommendation": "Proceed with booking",
+                "venue_data": venue
+            }
     
     def _get_mock_venues(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get mock venues for testing purposes."""
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import Optional
 from datetime import datetime
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import paginate, count_total
 from app.core.auth import get_current_active_user
 from app.models.user import User
 from app.models.agent import Agent
 from app.models.event import Event
 from app.schemas.agent import AgentCreate, AgentUpdate, Agent as AgentSchema, AgentList
+from app.workers.agent_executor import agent_executor
 import uuid
 
 router = APIRouter()
@@ -17,6 +20,8 @@ router = APIRouter()
 async def get_agents(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    total_mode: str = Query(settings.PAGINATION_TOTAL_MODE, alias="total", pattern="^(exact|cached|estimated|none)$"),
     event_id: Optional[str] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
     type_filter: Optional[str] = Query(None, alias="type"),
@@ -25,7 +30,7 @@ async def get_agents(
 ):
     """Get all agents with pagination and filtering."""
     # Build query
-    query = select(Agent).join(Event).where(Event.tenant_id == current_user.tenant_id)
+    query = select(Agent).join(Event, Agent.event_id == Event.id).where(Event.tenant_id == current_user.tenant_id)
     
     # Apply filters
     if event_id:
@@ -36,20 +41,17 @@ async def get_agents(
         query = query.where(Agent.type == type_filter)
     
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_total(db, query, total_mode)
     
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    agents = result.scalars().all()
+    # Get paginated results (keyset when a cursor is given, offset otherwise)
+    agents, next_cursor = await paginate(db, query, Agent, limit, cursor=cursor, skip=skip)
     
     return AgentList(
         agents=agents,
         total=total,
-        page=skip // limit + 1,
-        page_size=limit
+        page=1 if cursor else skip // limit + 1,
+        page_size=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/", response_model=AgentSchema)
@@ -76,7 +78,8 @@ async def create_agent(
     
     db_agent = Agent(
         id=str(uuid.uuid4()),
-        **agent.model_dump()
+        **agent.model_dump(exclude={"metadata"}),
+        metadata_=agent.metadata
     )
     
     db.add(db_agent)
@@ -132,6 +135,8 @@ async def update_agent(
     
     # Update fields
     update_data = agent_update.model_dump(exclude_unset=True)
+    if "metadata" in update_data:
+        update_data["metadata_"] = update_data.pop("metadata")
     for field, value in update_data.items():
         setattr(agent, field, value)
     
@@ -143,6 +148,7 @@ async def update_agent(
 @router.post("/{agent_id}/start")
 async def start_agent(
     agent_id: str,
+    resume: bool = Query(False, description="Reuse the step outputs checkpointed by the agent's last run"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -167,15 +173,27 @@ async def start_agent(
             detail="Agent is already running"
         )
     
+    previous = (agent.status, agent.started_at, agent.progress, agent.current_task)
+    
     # Update agent status
     agent.status = "running"
     agent.started_at = datetime.utcnow()
     agent.progress = 0
+    agent.current_task = "Queued for execution"
     
     await db.commit()
     await db.refresh(agent)
     
-    # TODO: Trigger agent workflow
-    # This would integrate with LangGraph and the AI agent system
+    # Hand the run to the background worker pool
+    try:
+        await agent_executor.enqueue(agent.id, agent.type, agent.event_id, current_user.tenant_id, resume=resume)
+    except Exception:
+        # Nothing will run the agent; restore its status so it can be started again
+        agent.status, agent.started_at, agent.progress, agent.current_task = previous
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Agent queue unavailable, try again later"
+        )
     
     return {"message": "Agent started successfully", "agent": agent}
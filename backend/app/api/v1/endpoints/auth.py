@@ -73,6 +73,13 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
     }
 
 @router.get("/me", response_model=UserSchema)
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Get current user information."""
-    return current_user
+    # The authenticated user only carries cached principal fields; load the full profile
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -307,11 +307,14 @@ async def generate_audit_report(
 
 @router.get("/user/privacy-settings")
 async def get_user_privacy_settings(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Get user's privacy settings and preferences.
     """
+    user = await db.get(User, current_user.id)
+    
     return {
         "success": True,
         "settings": {
@@ -320,7 +323,7 @@ async def get_user_privacy_settings(
             "marketing_emails": False,    # Would be stored in user preferences
             "data_sharing": False,        # Would be stored in user preferences
             "analytics_consent": True,    # Would be stored in user preferences
-            "last_updated": current_user.updated_at.isoformat() if current_user.updated_at else None
+            "last_updated": user.updated_at.isoformat() if user and user.updated_at else None
         }
     }
 
@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import Optional
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import paginate, count_total
 from app.core.auth import get_current_active_user
 from app.models.user import User
 from app.models.event import Event
 from app.schemas.event import EventCreate, EventUpdate, Event as EventSchema, EventList
+from app.agents.replanning import replan_event
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 @router.get("/", response_model=EventList)
 async def get_events(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    total_mode: str = Query(settings.PAGINATION_TOTAL_MODE, alias="total", pattern="^(exact|cached|estimated|none)$"),
     status_filter: Optional[str] = Query(None, alias="status"),
     city_filter: Optional[str] = Query(None, alias="city"),
     current_user: User = Depends(get_current_active_user),
@@ -31,20 +39,17 @@ async def get_events(
         query = query.where(Event.city.ilike(f"%{city_filter}%"))
     
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_total(db, query, total_mode)
     
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    events = result.scalars().all()
+    # Get paginated results (keyset when a cursor is given, offset otherwise)
+    events, next_cursor = await paginate(db, query, Event, limit, cursor=cursor, skip=skip)
     
     return EventList(
         events=events,
         total=total,
-        page=skip // limit + 1,
-        page_size=limit
+        page=1 if cursor else skip // limit + 1,
+        page_size=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/", response_model=EventSchema)
@@ -97,7 +102,7 @@ async def update_event(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update an event."""
+    """Update an event, re-planning the agent steps the changed fields affect."""
     result = await db.execute(
         select(Event).where(
             Event.id == event_id,
@@ -114,12 +119,22 @@ async def update_event(
     
     # Update fields
     update_data = event_update.model_dump(exclude_unset=True)
+    changed_fields = [field for field, value in update_data.items() if getattr(event, field) != value]
     for field, value in update_data.items():
         setattr(event, field, value)
     
     await db.commit()
     await db.refresh(event)
     
+    if changed_fields and settings.REPLAN_ON_EVENT_UPDATE and settings.CHECKPOINTS_ENABLED:
+        try:
+            await replan_event(db, event.id, current_user.tenant_id, changed_fields)
+        except Exception as e:
+            # The edit is saved; agents can still be restarted by hand
+            logger.error(f"Failed to re-plan agents for event {event.id}: {str(e)}")
+            await db.rollback()
+            await db.refresh(event)
+    
     return event
 
 @router.delete("/{event_id}")
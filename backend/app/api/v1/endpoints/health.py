@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_db, get_pool_stats
 from app.core.redis import get_redis
+from app.core.llm_cache import llm_cache
+from app.core.llm_singleflight import llm_singleflight
+from app.core.llm_rate_limit import llm_rate_limiters
+from app.core.llm_router import llm_router
+from app.core.activity_buffer import activity_buffer
+from app.core.principal_cache import principal_cache
+from app.core.checkpoints import checkpoint_store
 
 router = APIRouter()
 
@@ -19,11 +27,16 @@ async def database_health(db: AsyncSession = Depends(get_db)):
     """Database health check"""
     try:
         # Simple query to test database connection
-        result = await db.execute("SELECT 1")
-        await result.fetchone()
-        return {"database": "healthy"}
+        result = await db.execute(text("SELECT 1"))
+        result.scalar_one()
+        return {"database": "healthy", "pool": get_pool_stats()}
     except Exception as e:
-        return {"database": "unhealthy", "error": str(e)}
+        return {"database": "unhealthy", "error": str(e), "pool": get_pool_stats()}
+
+@router.get("/db/pool")
+async def database_pool_health():
+    """Database connection pool statistics"""
+    return {"pool": get_pool_stats()}
 
 @router.get("/redis")
 async def redis_health(redis = Depends(get_redis)):
@@ -33,3 +46,38 @@ async def redis_health(redis = Depends(get_redis)):
         return {"redis": "healthy"}
     except Exception as e:
         return {"redis": "unhealthy", "error": str(e)}
+
+@router.get("/llm-cache")
+async def llm_cache_health():
+    """LLM response cache statistics"""
+    return {"llm_cache": llm_cache.get_stats()}
+
+@router.get("/llm-singleflight")
+async def llm_singleflight_health():
+    """LLM request coalescing statistics"""
+    return {"llm_singleflight": llm_singleflight.get_stats()}
+
+@router.get("/llm-rate-limits")
+async def llm_rate_limits_health():
+    """LLM rate limiter queue depth and budgets per provider model"""
+    return {"llm_rate_limits": llm_rate_limiters.get_stats()}
+
+@router.get("/llm-routing")
+async def llm_routing_health():
+    """LLM provider latency, circuit state and hedging statistics"""
+    return {"llm_routing": llm_router.get_stats()}
+
+@router.get("/activity-buffer")
+async def activity_buffer_health():
+    """Activity write-behind buffer statistics"""
+    return {"activity_buffer": activity_buffer.get_stats()}
+
+@router.get("/principal-cache")
+async def principal_cache_health():
+    """Authentication principal cache statistics"""
+    return {"principal_cache": principal_cache.get_stats()}
+
+@router.get("/agent-checkpoints")
+async def agent_checkpoints_health():
+    """Agent workflow checkpoint statistics"""
+    return {"agent_checkpoints": checkpoint_store.get_stats()}
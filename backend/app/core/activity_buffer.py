@@ -0,0 +1,198 @@
+"""
+Activity Write Buffer for OrchestrateX
+
+This module collects agent activity and approval rows in memory and writes them to the
+database in batches (multi-row INSERT, or COPY on asyncpg), so logging from an agent's
+hot path never waits on a database round-trip.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Any, List, Optional
+from sqlalchemy import insert, Table
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .database import AsyncSessionLocal
+from ..models.agent_activity import AgentActivity
+from ..models.approval import Approval
+
+logger = logging.getLogger(__name__)
+
+try:
+    import asyncpg
+    _DRIVER_TRANSIENT_ERRORS: tuple = (asyncpg.PostgresConnectionError, asyncpg.InterfaceError)
+except ImportError:
+    _DRIVER_TRANSIENT_ERRORS = ()
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a write failed for lack of a working connection rather than because of its rows."""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (OperationalError, InterfaceError, ConnectionError, TimeoutError, asyncio.TimeoutError, OSError) + _DRIVER_TRANSIENT_ERRORS)
+
+class ActivityWriteBuffer:
+    """Write-behind buffer flushing activity and approval rows by size or time threshold."""
+    
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 50000,
+        use_copy: bool = False
+    ):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.use_copy = use_copy
+        self._pending: Dict[str, List[Dict[str, Any]]] = {"activities": [], "approvals": []}
+        self._tables: Dict[str, Table] = {
+            "activities": AgentActivity.__table__,
+            "approvals": Approval.__table__
+        }
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._size_flush: Optional[asyncio.Task] = None
+        self._last_failure = 0.0
+        
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_rejected = 0
+        self.flush_failures = 0
+    
+    def add_activity(self, row: Dict[str, Any]):
+        """Buffer an agent_activities row."""
+        self._add("activities", row)
+    
+    def add_approval(self, row: Dict[str, Any]):
+        """Buffer an approvals row."""
+        self._add("approvals", row)
+    
+    def pending_count(self) -> int:
+        return sum(len(rows) for rows in self._pending.values())
+    
+    def _add(self, kind: str, row: Dict[str, Any]):
+        rows = self._pending[kind]
+        rows.append(row)
+        
+        if len(rows) > self.max_pending:
+            # The database has been unreachable for a while; shed the oldest rows
+            del rows[0]
+            self.rows_dropped += 1
+        
+        size_flush_idle = self._size_flush is None or self._size_flush.done()
+        recently_failed = time.monotonic() - self._last_failure < self.flush_interval
+        
+        if self.pending_count() >= self.max_batch_size and size_flush_idle and not recently_failed:
+            try:
+                self._size_flush = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                # No running loop; the periodic flush or drain will pick the rows up
+                pass
+    
+    async def start(self):
+        """Start the periodic flush loop."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+    
+    async def stop(self):
+        """Stop the flush loop and drain everything still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        
+        await self.flush()
+    
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self):
+        """Write all buffered rows, keeping them for a retry if the database is unreachable."""
+        async with self._flush_lock:
+            for kind, table in self._tables.items():
+                while self._pending[kind]:
+                    batch = self._pending[kind][:self.max_batch_size]
+                    del self._pending[kind][:len(batch)]
+                    if not await self._write_batch(kind, table, batch):
+                        break
+    
+    async def _write_batch(self, kind: str, table: Table, batch: List[Dict[str, Any]]) -> bool:
+        """Write a batch, bisecting it to drop the rows the database rejects.
+        
+        On a transient error the unwritten rows go back to the head of the queue and
+        False is returned.
+        """
+        parts = [batch]
+        while parts:
+            part = parts.pop()
+            try:
+                await self._write_rows(table, part)
+                self.rows_written += len(part)
+            except Exception as e:
+                if _is_transient(e):
+                    self.flush_failures += 1
+                    self._last_failure = time.monotonic()
+                    unwritten = part + [row for remaining in reversed(parts) for row in remaining]
+                    self._pending[kind][:0] = unwritten
+                    logger.error(f"Failed to flush {len(unwritten)} buffered {kind}: {str(e)}")
+                    return False
+                
+                if len(part) == 1:
+                    # A bad row (missing foreign key, unserializable data) must not block the rest
+                    self.rows_rejected += 1
+                    logger.error(f"Dropping buffered {kind} row rejected by the database: {str(e)}; row: {str(part[0])[:500]}")
+                    continue
+                
+                middle = len(part) // 2
+                parts.extend((part[middle:], part[:middle]))
+        return True
+    
+    async def _write_rows(self, table: Table, rows: List[Dict[str, Any]]):
+        async with AsyncSessionLocal() as db:
+            if self.use_copy:
+                await self._copy_rows(db, table, rows)
+            else:
+                await db.execute(insert(table), rows)
+            await db.commit()
+    
+    async def _copy_rows(self, db: AsyncSession, table: Table, rows: List[Dict[str, Any]]):
+        """Bulk-load rows with asyncpg's COPY protocol."""
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        
+        columns = list(rows[0].keys())
+        json_columns = {column.name for column in table.columns if column.type.__class__.__name__ == "JSON"}
+        records = [
+            tuple(json.dumps(row[column], default=str) if column in json_columns else row[column] for column in columns)
+            for row in rows
+        ]
+        
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=columns
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and write counters."""
+        return {
+            "pending": self.pending_count(),
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_rejected": self.rows_rejected,
+            "flush_failures": self.flush_failures
+        }
+
+# Shared buffer instance
+activity_buffer = ActivityWriteBuffer(
+    max_batch_size=settings.ACTIVITY_BUFFER_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_BUFFER_FLUSH_INTERVAL,
+    max_pending=settings.ACTIVITY_BUFFER_MAX_PENDING,
+    use_copy=settings.ACTIVITY_BUFFER_USE_COPY
+)
@@ -0,0 +1,91 @@
+"""
+Agent Event Broker for OrchestrateX
+
+This module publishes live agent updates (token deltas, progress, activities and status
+changes) and lets WebSocket handlers subscribe to them per agent or per event.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Optional, Set
+import redis.asyncio as redis
+
+from .config import settings
+from .redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+def agent_channel(agent_id: str) -> str:
+    """Channel carrying updates for a single agent."""
+    return f"agent_events:agent:{agent_id}"
+
+def event_channel(event_id: str) -> str:
+    """Channel carrying updates for every agent working on an event."""
+    return f"agent_events:event:{event_id}"
+
+class AgentEventBroker:
+    """Fans agent updates out to subscribers over Redis pub/sub or in-process queues."""
+    
+    def __init__(self, redis_client: Optional[redis.Redis] = None, queue_size: int = 1000):
+        self.redis = redis_client
+        self.queue_size = queue_size
+        self._local_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+    
+    async def publish(self, agent_id: str, event_id: str, message: Dict[str, Any]):
+        """Publish an update to the agent's and the event's channels."""
+        message = {
+            **message,
+            "agent_id": agent_id,
+            "event_id": event_id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        channels = (agent_channel(agent_id), event_channel(event_id))
+        
+        if self.redis is not None:
+            try:
+                payload = json.dumps(message, default=str)
+                for channel in channels:
+                    await self.redis.publish(channel, payload)
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for agent event publish: {str(e)}")
+            return
+        
+        for channel in channels:
+            for queue in self._local_subscribers.get(channel, ()):
+                if queue.full():
+                    # Drop the oldest update rather than block the agent
+                    queue.get_nowait()
+                queue.put_nowait(message)
+    
+    async def subscribe(self, channel: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield updates published to a channel until the consumer stops iterating."""
+        if self.redis is not None:
+            pubsub = self.redis.pubsub()
+            await pubsub.subscribe(channel)
+            try:
+                async for raw in pubsub.listen():
+                    if raw.get("type") != "message":
+                        continue
+                    yield json.loads(raw["data"])
+            finally:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._local_subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers = self._local_subscribers.get(channel, set())
+            subscribers.discard(queue)
+            if not subscribers:
+                self._local_subscribers.pop(channel, None)
+
+# Shared broker instance
+agent_events = AgentEventBroker(
+    redis_client=redis_client if settings.AGENT_EVENTS_BACKEND == "redis" else None
+)
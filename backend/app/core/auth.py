@@ -2,9 +2,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.security import SecurityManager
+from app.core.principal_cache import principal_cache
 from app.models.user import User
-from sqlalchemy import select
 
 security = HTTPBearer()
 
@@ -20,28 +20,26 @@ async def get_current_user(
     )
     
     token = credentials.credentials
-    payload = verify_token(token)
-    if payload is None:
-        raise credentials_exception
+    payload = SecurityManager.verify_token(token)
     
     user_id: str = payload.get("sub")
     if user_id is None:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Resolve the caller from the principal cache, querying the users table on a miss
+    principal = await principal_cache.load(user_id, db)
     
-    if user is None:
+    if principal is None:
         raise credentials_exception
     
-    if not user.is_active:
+    if not principal["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
-    return user
+    # Transient user carrying id, role, tenant_id and is_active only
+    return principal_cache.user_from_principal(principal)
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
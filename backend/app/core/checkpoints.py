@@ -0,0 +1,157 @@
+"""
+Agent Workflow Checkpoints for OrchestrateX
+
+This module persists the output of each completed agent workflow step, keyed by agent id
+and step name, in Redis, Postgres or process memory. A workflow started in resume mode
+reloads them and skips the steps that already finished, so a crash or deploy only costs
+the LLM calls of the unfinished steps, and an event edit only those of the steps it affects.
+"""
+
+import json
+import logging
+from typing import Dict, Any, Optional, Iterable
+import redis.asyncio as redis
+from sqlalchemy import select, delete
+
+from .config import settings
+from .database import AsyncSessionLocal
+from .redis import redis_client
+from ..models.agent_checkpoint import AgentCheckpoint
+
+logger = logging.getLogger(__name__)
+
+class AgentCheckpointStore:
+    """Step output store for agent workflows, backed by Redis hashes, a table or a dict."""
+    
+    def __init__(
+        self,
+        backend: str = "redis",
+        redis_client: Optional[redis.Redis] = None,
+        ttl_seconds: int = 604800,
+        namespace: str = "agent_checkpoints"
+    ):
+        if backend not in ("redis", "database", "local"):
+            raise ValueError(f"Unknown checkpoint backend: {backend}")
+        if backend == "redis" and redis_client is None:
+            raise ValueError("The redis checkpoint backend needs a Redis client")
+        
+        self.backend = backend
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._local: Dict[str, Dict[str, str]] = {}
+        
+        self.saved = 0
+        self.restored = 0
+        self.failures = 0
+    
+    def _redis_key(self, agent_id: str) -> str:
+        return f"{self.namespace}:{agent_id}"
+    
+    async def load(self, agent_id: str) -> Dict[str, Any]:
+        """Get the saved outputs of an agent's completed steps, by step name."""
+        try:
+            if self.backend == "redis":
+                raw = await self.redis.hgetall(self._redis_key(agent_id))
+            elif self.backend == "database":
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(
+                        select(AgentCheckpoint.step, AgentCheckpoint.output).where(AgentCheckpoint.agent_id == agent_id)
+                    )
+                    raw = {step: output for step, output in result.all()}
+            else:
+                raw = dict(self._local.get(agent_id, {}))
+        except Exception as e:
+            # Without checkpoints the workflow simply runs every step again
+            self.failures += 1
+            logger.warning(f"Failed to load checkpoints for agent {agent_id}: {str(e)}")
+            return {}
+        
+        checkpoints = {
+            (step.decode() if isinstance(step, bytes) else step): json.loads(output)
+            for step, output in raw.items()
+        }
+        self.restored += len(checkpoints)
+        return checkpoints
+    
+    async def save(self, agent_id: str, step: str, output: Any):
+        """Persist a completed step's output, replacing any earlier one."""
+        payload = json.dumps(output, default=str)
+        
+        try:
+            if self.backend == "redis":
+                key = self._redis_key(agent_id)
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, step, payload)
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+            elif self.backend == "database":
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        delete(AgentCheckpoint).where(AgentCheckpoint.agent_id == agent_id, AgentCheckpoint.step == step)
+                    )
+                    db.add(AgentCheckpoint(agent_id=agent_id, step=step, output=payload))
+                    await db.commit()
+            else:
+                self._local.setdefault(agent_id, {})[step] = payload
+            self.saved += 1
+        except Exception as e:
+            # A lost checkpoint only means the step reruns on resume
+            self.failures += 1
+            logger.warning(f"Failed to checkpoint step {step} of agent {agent_id}: {str(e)}")
+    
+    async def discard(self, agent_id: str, steps: Iterable[str]):
+        """Drop the checkpoints of some of an agent's steps, so a resumed run recomputes them."""
+        steps = list(steps)
+        if not steps:
+            return
+        
+        try:
+            if self.backend == "redis":
+                await self.redis.hdel(self._redis_key(agent_id), *steps)
+            elif self.backend == "database":
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        delete(AgentCheckpoint).where(AgentCheckpoint.agent_id == agent_id, AgentCheckpoint.step.in_(steps))
+                    )
+                    await db.commit()
+            else:
+                for step in steps:
+                    self._local.get(agent_id, {}).pop(step, None)
+        except Exception as e:
+            # A stale checkpoint would be reused on resume, so let the caller run the agent fresh
+            self.failures += 1
+            logger.warning(f"Failed to discard checkpoints {steps} of agent {agent_id}: {str(e)}")
+            raise
+    
+    async def clear(self, agent_id: str):
+        """Drop all checkpoints of an agent."""
+        try:
+            if self.backend == "redis":
+                await self.redis.delete(self._redis_key(agent_id))
+            elif self.backend == "database":
+                async with AsyncSessionLocal() as db:
+                    await db.execute(delete(AgentCheckpoint).where(AgentCheckpoint.agent_id == agent_id))
+                    await db.commit()
+            else:
+                self._local.pop(agent_id, None)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Failed to clear checkpoints for agent {agent_id}: {str(e)}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkpoint counters."""
+        return {
+            "backend": self.backend,
+            "enabled": settings.CHECKPOINTS_ENABLED,
+            "saved": self.saved,
+            "restored": self.restored,
+            "failures": self.failures
+        }
+
+# Shared checkpoint store
+checkpoint_store = AgentCheckpointStore(
+    backend=settings.CHECKPOINT_BACKEND,
+    redis_client=redis_client if settings.CHECKPOINT_BACKEND == "redis" else None,
+    ttl_seconds=settings.CHECKPOINT_TTL_SECONDS
+)
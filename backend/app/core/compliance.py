@@ -16,6 +16,7 @@ from ..models.user import User
 from ..models.event import Event
 from ..models.agent_activity import AgentActivity
 from ..core.database import get_db
+from ..core.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +139,7 @@ class GDPRCompliance:
                 activity.status = "deleted"
             
             await db.commit()
+            await principal_cache.invalidate(user_id)
             
             # Log the deletion for audit purposes
             logger.info(f"User data deleted for GDPR compliance: {user_id}")
@@ -167,6 +169,7 @@ class GDPRCompliance:
             user.anonymized_at = datetime.utcnow()
             
             await db.commit()
+            await principal_cache.invalidate(user_id)
             
             logger.info(f"User data anonymized: {user_id}")
             
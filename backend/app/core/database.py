@@ -1,14 +1,60 @@
+import time
+from typing import Dict, Any
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.config import settings
 
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+def _engine_options() -> Dict[str, Any]:
+    """Build pool arguments for the configured pooling mode."""
+    connect_args = {}
+    if settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    
+    if not settings.DB_POOL_ENABLED:
+        # External pooler (e.g. PgBouncer) in front of the database
+        return {"poolclass": NullPool, "connect_args": connect_args}
+    
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args
+    }
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    poolclass=NullPool,
-    future=True
+    future=True,
+    **_engine_options()
 )
 
 # Create async session factory
@@ -28,3 +74,23 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get connection pool occupancy and checkout wait statistics."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        return {"pooled": False, "pool_class": type(pool).__name__}
+    
+    return {
+        "pooled": True,
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "checkouts": pool.checkouts,
+        "checkout_timeouts": pool.checkout_timeouts,
+        "avg_wait_ms": pool.total_wait_time / pool.checkouts * 1000 if pool.checkouts else 0.0,
+        "max_wait_ms": pool.max_wait_time * 1000
+    }
@@ -0,0 +1,152 @@
+"""
+LLM Response Cache for OrchestrateX
+
+This module provides a content-addressed, two-tier cache (in-process LRU backed by Redis)
+for LLM responses, so identical prompts are only sent to the provider once.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from langchain.schema import BaseMessage
+import redis.asyncio as redis
+
+from .config import settings
+from .redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache:
+    """Two-tier LLM response cache keyed on model, temperature and normalized messages."""
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        redis_client: Optional[redis.Redis] = None,
+        namespace: str = "llm_cache"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.namespace = namespace
+        # key -> (expires_at, serialized response), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def normalize_messages(messages: List[BaseMessage]) -> List[Dict[str, str]]:
+        """Reduce messages to role and whitespace-normalized content."""
+        return [
+            {"role": message.type, "content": " ".join(str(message.content).split())}
+            for message in messages
+        ]
+    
+    @classmethod
+    def make_key(cls, model: str, temperature: Optional[float], messages: List[BaseMessage]) -> str:
+        """Build the content hash identifying a prompt."""
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "messages": cls.normalize_messages(messages)
+            },
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set_local(self, key: str, value: str, ttl_seconds: Optional[int] = None):
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, checking memory first and then Redis."""
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        
+        if self.redis is not None:
+            try:
+                redis_key = self._redis_key(key)
+                value = await self.redis.get(redis_key)
+                if value is not None:
+                    ttl = await self.redis.ttl(redis_key)
+                    self._set_local(key, value, ttl if ttl and ttl > 0 else None)
+                    self.hits += 1
+                    self.redis_hits += 1
+                    return value
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for LLM cache lookup: {str(e)}")
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, key: str, value: str):
+        """Store a response in both tiers."""
+        self._set_local(key, value)
+        
+        if self.redis is not None:
+            try:
+                await self.redis.setex(self._redis_key(key), self.ttl_seconds, value)
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for LLM cache write: {str(e)}")
+    
+    def clear(self):
+        """Drop all in-process entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.evictions = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "redis_enabled": self.redis is not None
+        }
+
+# Shared cache instance
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    redis_client=redis_client if settings.LLM_CACHE_REDIS_ENABLED else None
+)
@@ -0,0 +1,207 @@
+"""
+LLM Cassettes for OrchestrateX
+
+This module records the agent LLM calls of real workflow runs (messages, model, response,
+provider latency) to a gzip-compressed JSONL cassette, and replays them through a chat client with
+no network, at the recorded speed, scaled, or instantly. Replays let agent and
+orchestration overhead be profiled against real prompt and response sizes, and slow
+production runs be reproduced locally.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Deque, IO
+from langchain.schema import BaseMessage
+
+from .config import settings
+from .llm_clients import llm_call_context
+from .llm_fake import FakeChatModel
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_FORMAT = 1
+
+class CassetteMissError(Exception):
+    """Raised when a replayed call has no matching recorded interaction."""
+    pass
+
+class RecordedLLMError(Exception):
+    """Replays a provider error captured in the cassette."""
+    pass
+
+def _serialize_messages(messages: List[BaseMessage]) -> List[Dict[str, str]]:
+    return [{"role": message.type, "content": str(message.content)} for message in messages]
+
+def prompt_hash(messages: List[Dict[str, str]]) -> str:
+    """Hash a prompt's roles and whitespace-normalized contents."""
+    normalized = [{"role": message["role"], "content": " ".join(message["content"].split())} for message in messages]
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CassetteRecorder:
+    """LLM call observer appending each agent call to a cassette file."""
+    
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.recorded = 0
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+    
+    def start(self, path: str):
+        """Open a new cassette; "{pid}" in the path is replaced with the process id."""
+        self.stop()
+        self.path = path.format(pid=os.getpid())
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self.recorded = 0
+        self._write({"cassette": CASSETTE_FORMAT, "recorded_at": datetime.utcnow().isoformat(), "pid": os.getpid()})
+        logger.info(f"Recording LLM calls to {self.path}")
+    
+    def stop(self):
+        """Close the cassette, flushing everything recorded."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Recorded {self.recorded} LLM calls to {self.path}")
+    
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+    
+    def __call__(self, call: Dict[str, Any]):
+        if self._file is None or call["error"] == "cancelled":
+            return
+        if call["cached"] or (call["error"] is None and call.get("provider_latency") is None):
+            # Answered from the response cache or by a coalesced duplicate; no provider call to replay
+            return
+        
+        # Replays wait the provider's round-trip, not rate-limit queueing or concurrency waits
+        latency = call.get("provider_latency")
+        if latency is None:
+            latency = call["latency"]
+        
+        self._write({
+            "seq": self.recorded,
+            "agent_type": call["agent_type"],
+            "agent_id": call["agent_id"],
+            "event_id": call["event_id"],
+            "step": call["step"],
+            "provider": call["provider"],
+            "model": call["model"],
+            "messages": _serialize_messages(call["messages"]),
+            "response": call["response"],
+            "latency": round(latency, 4),
+            "error": call["error"]
+        })
+        self.recorded += 1
+
+def load_cassette(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Read a cassette's header and recorded interactions."""
+    with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+        header = json.loads(cassette_file.readline())
+        if header.get("cassette") != CASSETTE_FORMAT:
+            raise ValueError(f"Unsupported cassette format in {path}: {header.get('cassette')}")
+        interactions = [json.loads(line) for line in cassette_file if line.strip()]
+    return header, interactions
+
+class Cassette:
+    """Recorded interactions indexed for replay.
+    
+    Calls are matched on the exact prompt first and then, for prompts that differ from
+    the recording (other events, ids or timestamps), on the agent step in recorded order.
+    The last interaction for a key keeps being served, so hedges and extra calls replay it.
+    """
+    
+    def __init__(self, interactions: List[Dict[str, Any]], header: Optional[Dict[str, Any]] = None):
+        self.header = header or {}
+        self._by_prompt: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._by_step: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        
+        for interaction in interactions:
+            key = prompt_hash(interaction["messages"])
+            self._by_prompt.setdefault(key, deque()).append(interaction)
+            self._by_step.setdefault((interaction["agent_type"], interaction["step"]), deque()).append(interaction)
+        
+        self.size = len(interactions)
+        self.prompt_hits = 0
+        self.step_hits = 0
+        self.misses = 0
+    
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        header, interactions = load_cassette(path)
+        logger.info(f"Loaded {len(interactions)} recorded LLM calls from {path}")
+        return cls(interactions, header)
+    
+    @staticmethod
+    def _take(queue: Deque[Dict[str, Any]]) -> Dict[str, Any]:
+        return queue.popleft() if len(queue) > 1 else queue[0]
+    
+    def match(self, messages: List[BaseMessage], agent_type: str = "", step: str = "") -> Dict[str, Any]:
+        """Find the recorded interaction to replay for a call."""
+        key = prompt_hash(_serialize_messages(messages))
+        with self._lock:
+            if key in self._by_prompt:
+                self.prompt_hits += 1
+                return self._take(self._by_prompt[key])
+            
+            if (agent_type, step) in self._by_step:
+                self.step_hits += 1
+                return self._take(self._by_step[(agent_type, step)])
+            
+            self.misses += 1
+        raise CassetteMissError(f"No recorded LLM call for {agent_type}.{step}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "interactions": self.size,
+            "prompt_hits": self.prompt_hits,
+            "step_hits": self.step_hits,
+            "misses": self.misses
+        }
+
+class CassetteChatModel(FakeChatModel):
+    """Chat client serving responses from a cassette instead of a provider."""
+    
+    def __init__(self, cassette: Cassette, model_name: str, temperature: float = 0.0, speed: float = 1.0):
+        super().__init__(model_name=model_name, temperature=temperature)
+        self.cassette = cassette
+        self.speed = speed
+    
+    def _prepare(self, messages: List[BaseMessage]) -> Tuple[str, float]:
+        self.calls += 1
+        context = llm_call_context.get()
+        interaction = self.cassette.match(messages, context.get("agent_type", ""), context.get("step", ""))
+        
+        if interaction["error"]:
+            raise RecordedLLMError(interaction["error"])
+        
+        latency = interaction["latency"] / self.speed if self.speed > 0 else 0.0
+        return interaction["response"], latency
+
+_replay_cassette: Optional[Cassette] = None
+
+def create_replay_chat_model(model: str, temperature: float) -> CassetteChatModel:
+    """Create a replay client over the cassette at LLM_CASSETTE_REPLAY_PATH."""
+    global _replay_cassette
+    if _replay_cassette is None:
+        if not settings.LLM_CASSETTE_REPLAY_PATH:
+            raise ValueError("LLM_BACKEND=replay requires LLM_CASSETTE_REPLAY_PATH")
+        _replay_cassette = Cassette.load(settings.LLM_CASSETTE_REPLAY_PATH)
+    
+    return CassetteChatModel(_replay_cassette, model, temperature, speed=settings.LLM_CASSETTE_REPLAY_SPEED)
+
+# Shared recorder instance
+cassette_recorder = CassetteRecorder()
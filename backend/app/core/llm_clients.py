@@ -0,0 +1,152 @@
+"""
+LLM Client Registry for OrchestrateX
+
+This module holds the process-wide LLM chat clients shared by all agents, so HTTP
+connection pools and TLS sessions are set up once instead of once per agent. With
+LLM_BACKEND=fake or replay it hands out offline clients instead (see llm_fake and
+llm_cassette).
+"""
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+import anthropic
+import httpx
+import openai
+from langchain_openai import ChatOpenAI
+from langchain_anthropic import ChatAnthropic
+
+from .config import settings
+from .llm_rate_limit import llm_rate_limiters
+
+logger = logging.getLogger(__name__)
+
+# Agent and step making the current LLM call, set by BaseAgent.get_llm_response
+llm_call_context: ContextVar[Dict[str, str]] = ContextVar("llm_call_context", default={})
+
+class LLMClientRegistry:
+    """Lazily creates and shares one chat client per provider, model and temperature."""
+    
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, float], Any] = {}
+        self._http_clients: List[httpx.AsyncClient] = []
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    def _create_http_client(self, provider: str, model: str) -> httpx.AsyncClient:
+        """Create a keep-alive HTTP client with the configured pool limits."""
+        async def observe_rate_limits(response: httpx.Response):
+            # Keep the client-side scheduler in step with the provider's remaining quota
+            llm_rate_limiters.observe_headers(provider, model, response.headers)
+        
+        http_client = httpx.AsyncClient(
+            event_hooks={"response": [observe_rate_limits]},
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=settings.LLM_REQUEST_TIMEOUT
+        )
+        self._http_clients.append(http_client)
+        return http_client
+    
+    def _max_retries(self) -> int:
+        """SDK-level retries; none when the rate limiter schedules retries so they wait in its queue."""
+        return 0 if settings.LLM_RATE_LIMIT_ENABLED else settings.LLM_MAX_RETRIES
+    
+    def _get_offline(self, provider: str, model: str, temperature: float) -> Any:
+        """Get the shared fake or replay client standing in for a provider model."""
+        key = (f"{settings.LLM_BACKEND}:{provider}", model, temperature)
+        if key not in self._clients:
+            if settings.LLM_BACKEND == "replay":
+                from .llm_cassette import create_replay_chat_model as create_client
+            else:
+                from .llm_fake import create_fake_chat_model as create_client
+            self._clients[key] = create_client(model, temperature)
+            logger.info(f"Created {settings.LLM_BACKEND} {provider} client for {model}")
+        return self._clients[key]
+    
+    def get_openai(self, model: Optional[str] = None, temperature: Optional[float] = None) -> Optional[ChatOpenAI]:
+        """Get the shared OpenAI chat client, or None if no API key is configured."""
+        model = model or settings.OPENAI_MODEL
+        temperature = settings.LLM_TEMPERATURE if temperature is None else temperature
+        
+        if settings.LLM_BACKEND in ("fake", "replay"):
+            return self._get_offline("openai", model, temperature)
+        if not settings.OPENAI_API_KEY:
+            return None
+        
+        key = ("openai", model, temperature)
+        
+        if key not in self._clients:
+            async_client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                timeout=settings.LLM_REQUEST_TIMEOUT,
+                max_retries=self._max_retries(),
+                http_client=self._create_http_client("openai", model)
+            )
+            self._clients[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                api_key=settings.OPENAI_API_KEY,
+                max_retries=self._max_retries(),
+                async_client=async_client.chat.completions
+            )
+            logger.info(f"Created shared OpenAI client for {model}")
+        
+        return self._clients[key]
+    
+    def get_anthropic(self, model: Optional[str] = None, temperature: Optional[float] = None) -> Optional[ChatAnthropic]:
+        """Get the shared Anthropic chat client, or None if no API key is configured."""
+        model = model or settings.ANTHROPIC_MODEL
+        temperature = settings.LLM_TEMPERATURE if temperature is None else temperature
+        
+        if settings.LLM_BACKEND in ("fake", "replay"):
+            return self._get_offline("anthropic", model, temperature)
+        if not settings.ANTHROPIC_API_KEY:
+            return None
+        
+        key = ("anthropic", model, temperature)
+        
+        if key not in self._clients:
+            chat_model = ChatAnthropic(
+                model=model,
+                temperature=temperature,
+                api_key=settings.ANTHROPIC_API_KEY,
+                max_retries=self._max_retries()
+            )
+            # ChatAnthropic takes no HTTP client, so replace the SDK client it built with one on
+            # the shared pool, whose response hook feeds the rate limiter like OpenAI's does
+            object.__setattr__(chat_model, "_async_client", anthropic.AsyncAnthropic(
+                api_key=settings.ANTHROPIC_API_KEY,
+                timeout=settings.LLM_REQUEST_TIMEOUT,
+                max_retries=self._max_retries(),
+                http_client=self._create_http_client("anthropic", model)
+            ))
+            self._clients[key] = chat_model
+            logger.info(f"Created shared Anthropic client for {model}")
+        
+        return self._clients[key]
+    
+    def get_semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Get the semaphore capping in-flight requests to a provider."""
+        if provider not in self._semaphores:
+            limits = {
+                "openai": settings.OPENAI_MAX_CONCURRENCY,
+                "anthropic": settings.ANTHROPIC_MAX_CONCURRENCY
+            }
+            self._semaphores[provider] = asyncio.Semaphore(limits.get(provider, settings.LLM_MAX_CONCURRENCY))
+        return self._semaphores[provider]
+    
+    async def aclose(self):
+        """Close pooled HTTP connections and forget all clients."""
+        for http_client in self._http_clients:
+            await http_client.aclose()
+        
+        self._http_clients.clear()
+        self._clients.clear()
+        self._semaphores.clear()
+
+# Shared client registry
+llm_clients = LLMClientRegistry()
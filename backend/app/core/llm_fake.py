@@ -0,0 +1,249 @@
+"""
+Fake LLM Backend for OrchestrateX
+
+This module provides a deterministic stand-in for the provider chat clients. It answers
+every agent step with schema-valid JSON (or plain text for drafts) after a simulated
+latency, and can inject provider errors and 429s, so agent pipelines can be run and
+benchmarked without API keys or network access.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+from langchain.schema import BaseMessage, AIMessage
+from langchain.schema.messages import AIMessageChunk
+
+from .config import settings
+from .llm_clients import llm_call_context
+
+class FakeLLMError(Exception):
+    """Simulated provider failure."""
+    pass
+
+class FakeRateLimitError(FakeLLMError):
+    """Simulated 429 response."""
+    status_code = 429
+
+def _int(low: int, high: int) -> Tuple[str, int, int]:
+    return ("int", low, high)
+
+def _float(low: float, high: float) -> Tuple[str, float, float]:
+    return ("float", low, high)
+
+def _list(item: Any, count: int) -> Tuple[str, Any, int]:
+    return ("list", item, count)
+
+# Response shapes per agent step; "{n}" in strings is replaced by the list position
+_PHASE = {"activities": ["Kickoff call", "Weekly check-in"], "timeline": "Ongoing", "frequency": "Weekly", "success_metrics": ["Response rate"]}
+_CATEGORY = {"allocation": _float(5000, 50000), "items": ["Primary costs", "Secondary costs"], "justification": "Scaled to attendance"}
+_SPEAKER = {
+    "id": "speaker_{n}",
+    "name": "Speaker {n}",
+    "title": "Principal Engineer",
+    "company": "Company {n}",
+    "expertise": ["Technology", "Leadership"],
+    "speaking_experience": "Experienced",
+    "contact": "speaker{n}@example.com",
+    "estimated_fee": _int(1000, 8000),
+    "availability": "Available"
+}
+_VENUE = {
+    "id": "venue_{n}",
+    "name": "Venue {n}",
+    "address": "{n} Main St",
+    "capacity": _int(200, 2000),
+    "daily_rate": _int(2000, 15000),
+    "amenities": ["WiFi", "AV Equipment", "Catering"],
+    "contact": "venue{n}@example.com",
+    "availability": "Available"
+}
+_NAMED_ACTIVITY = {"name": "Activity {n}", "description": "Facilitated session", "audience": "All attendees", "group_size": _int(5, 30), "duration": "45 minutes", "format": "In person", "timing": "Day 1", "metrics": ["Participation"]}
+
+STEP_RESPONSES: Dict[str, Any] = {
+    # Venue scout
+    "_analyze_requirements": {"capacity_required": _int(100, 2000), "location": "City center", "budget_max": _float(20000, 200000), "amenities_required": ["WiFi", "AV Equipment", "Catering"], "special_requirements": []},
+    "_research_venues": _list(_VENUE, 5),
+    "_evaluate_venue": {"score": _int(50, 95), "reasoning": "Meets capacity and budget", "pros": ["Central location", "Good amenities"], "cons": ["Limited parking"], "recommendation": "Shortlist"},
+    "_create_proposal": {"executive_summary": "Recommended venue for the event", "cost_breakdown": {"daily_rate": _int(2000, 15000), "catering": _int(5000, 30000)}, "risk_assessment": "Low", "timeline": "Book within two weeks", "recommendation": "Proceed with booking"},
+    # Speaker outreach
+    "_analyze_speaker_requirements": {"event_theme": "Technology", "target_audience": "Practitioners", "expertise_areas": ["AI", "Cloud", "Security"], "speakers_needed": _int(5, 15), "speaker_budget": _float(10000, 80000), "session_types": ["Keynote", "Panel", "Workshop"], "special_requirements": []},
+    "_research_speakers": _list(_SPEAKER, 8),
+    "_evaluate_speakers": {"fit_score": _int(50, 98), "expertise_alignment": "Strong", "speaking_experience": "Experienced", "budget_fit": "Within budget", "pros": ["Relevant expertise"], "cons": ["Busy schedule"], "recommendation": "Invite"},
+    "_create_speaker_outreach": "Dear speaker,\n\nWe would be delighted to have you speak at our upcoming event. Your work is a great fit for our audience, and we would love to discuss a keynote or panel slot.\n\nBest regards,\nThe organizing team",
+    "_propose_speaker_lineup": {"keynote_speakers": _list(_SPEAKER, 2), "panel_speakers": _list(_SPEAKER, 3), "workshop_leaders": _list(_SPEAKER, 2), "backup_speakers": _list(_SPEAKER, 2), "total_cost": _int(10000, 60000), "reasoning": "Balanced lineup across session types"},
+    # Sponsorship manager
+    "_analyze_sponsorship_opportunities": {"event_type": "Conference", "value_proposition": {"brand_exposure": "High", "lead_generation": "Qualified leads"}, "target_industries": ["Technology", "Finance", "Healthcare"], "sponsor_categories": _list({"category": "Tier {n}", "count": _int(1, 8), "investment": _float(5000, 50000), "benefits": ["Logo placement", "Booth"]}, 4), "revenue_potential": _float(50000, 300000), "competitive_advantages": ["Engaged audience"], "market_trends": ["Hybrid events"], "risk_factors": ["Economic downturn"]},
+    "_develop_sponsorship_packages": {"packages": _list({"name": "Package {n}", "investment": _float(5000, 50000), "benefits": ["Logo placement", "Speaking slot"], "deliverables": ["Booth"], "timeline": "Pre-event", "success_metrics": ["Leads"]}, 4), "add_on_opportunities": _list({"name": "Add-on {n}", "investment": _float(1000, 10000), "benefits": ["Branding"]}, 3), "custom_options": ["Hackathon sponsorship"]},
+    "_identify_potential_sponsors": {"sponsors": _list({"name": "Sponsor {n}", "category": "Technology", "industry": "Software", "sponsorship_history": "Regular sponsor", "budget_range": "$10k-$50k", "strategic_fit": "High", "contact_info": "partners{n}@example.com", "outreach_approach": "Warm introduction"}, 10), "research_priorities": ["Past sponsors"], "qualification_criteria": ["Budget fit"]},
+    "_create_outreach_strategy": {"outreach_timeline": {"month_3": "Initial outreach", "month_2": "Follow-up", "month_1": "Close"}, "communication_channels": _list({"channel": "Email", "frequency": "Weekly", "content": "Package overview", "success_metric": "Reply rate"}, 3), "messaging_framework": {"value_proposition": "Reach decision makers", "key_messages": ["Qualified audience"], "objection_handling": {"budget": "Flexible packages"}}, "negotiation_strategies": _list({"approach": "Value-based", "focus": "ROI", "tactics": ["Bundle benefits"]}, 2), "success_metrics": ["Sponsors signed"]},
+    "_plan_sponsor_engagement": {"pre_event_engagement": _PHASE, "on_site_support": _PHASE, "post_event_follow_up": _PHASE, "relationship_development": _PHASE, "success_measurement": {"metrics": ["Renewal rate"], "reporting": "Post-event report", "improvement": "Quarterly review"}},
+    # Budget controller
+    "_analyze_budget_requirements": {"event_scale": "Medium", "complexity": "Moderate", "budget_categories": ["venue_facilities", "speakers_entertainment", "marketing_promotion", "technology_av", "catering_refreshments", "staffing_operations", "contingency"], "cost_drivers": ["Attendance", "Venue"], "revenue_sources": ["Tickets", "Sponsorships"], "risk_factors": ["Cost overruns"], "industry_benchmarks": {"venue_per_attendee": _int(50, 200), "marketing_per_attendee": _int(20, 80)}},
+    "_create_initial_budget": {"categories": {"venue_facilities": _CATEGORY, "speakers_entertainment": _CATEGORY, "marketing_promotion": _CATEGORY, "technology_av": _CATEGORY, "catering_refreshments": _CATEGORY, "staffing_operations": _CATEGORY, "contingency": _CATEGORY}},
+    "_optimize_budget_allocation": {"total": _float(50000, 180000), "categories": {"venue_facilities": _CATEGORY, "speakers_entertainment": _CATEGORY, "marketing_promotion": _CATEGORY, "technology_av": _CATEGORY, "catering_refreshments": _CATEGORY, "staffing_operations": _CATEGORY, "contingency": _CATEGORY}, "changes": ["Renegotiated catering"]},
+    "_create_financial_projections": {"revenue_projections": {"registration_fees": _float(50000, 200000), "sponsorships": _float(20000, 100000)}, "cash_flow": {"month_1": _float(-50000, 0), "month_2": _float(-20000, 20000), "month_3": _float(0, 80000)}, "break_even": {"attendees_needed": _int(100, 800), "revenue_needed": _float(50000, 200000)}, "profit_loss": {"best_case": _float(20000, 80000), "likely_case": _float(0, 40000), "worst_case": _float(-40000, 0)}},
+    "_narrate_financial_projections": {"summary": "Break-even is likely at the expected turnout", "key_drivers": ["Attendance", "Sponsorship close rate"], "risks": ["Low turnout", "Catering overruns"], "recommendations": ["Secure two anchor sponsors early"]},
+    "_identify_cost_savings": _list({"category": "Category {n}", "opportunity": "Negotiate volume discount", "potential_savings": _float(500, 10000), "effort": "Low", "risk": "Low", "recommendation": "Pursue"}, 4),
+    # Marketing ops
+    "_analyze_target_audience": {"primary_audience": "Practitioners", "secondary_audience": "Managers", "demographics": {"age_range": "25-45", "location": "Regional"}, "psychographics": {"interests": ["Technology"], "values": ["Learning"]}, "pain_points": ["Staying current"], "motivations": ["Networking"], "communication_channels": ["Email", "LinkedIn"], "decision_factors": ["Speakers", "Price"], "market_size": "Large", "opportunity": "High"},
+    "_develop_marketing_strategy": {"type": "Integrated", "objectives": {"awareness": "Reach target audience", "conversion": "Drive registrations"}, "target_segments": _list({"name": "Segment {n}", "size": _float(0.1, 0.5), "messaging": "Tailored message"}, 3), "channel_mix": {"digital": {"share": _float(0.4, 0.7)}, "traditional": {"share": _float(0.1, 0.3)}}, "timeline": {"awareness_phase": "Months 1-2", "conversion_phase": "Months 3-4"}, "success_metrics": ["Registrations"]},
+    "_create_marketing_campaigns": _list({"id": "campaign_{n}", "name": "Campaign {n}", "objective": "Registrations", "target_audience": "Practitioners", "key_messages": ["Learn from experts"], "channels": ["Email", "Social"], "budget": _float(2000, 20000), "timeline": "4 weeks", "metrics": ["Click-through rate"]}, 4),
+    "_plan_content_calendar": {"content_types": {"blog_posts": _list({"title": "Post {n}", "week": "{n}"}, 4), "social_media": _list({"platform": "LinkedIn", "week": "{n}"}, 4), "email_sequences": _list({"subject": "Email {n}", "week": "{n}"}, 3)}, "content_themes": ["Speaker spotlights", "Early bird pricing"]},
+    "_coordinate_with_agents": {"speaker_coordination": {"activities": ["Speaker spotlights"], "timeline": "Ongoing", "resources": "Content team"}, "sponsor_coordination": {"activities": ["Sponsor mentions"], "timeline": "Ongoing", "resources": "Partnerships team"}, "venue_coordination": {"activities": ["Venue tour video"], "timeline": "Month 2", "resources": "Video team"}},
+    # Attendee experience
+    "_analyze_attendee_needs": {"attendee_segments": _list({"name": "Segment {n}", "percentage": _int(10, 50), "goals": ["Learning"], "preferences": ["Hands-on sessions"]}, 3), "primary_goals": ["Learning", "Networking"], "learning_preferences": {"formats": ["Workshops"], "styles": "Interactive"}, "networking_needs": ["Peer connections"], "dietary_requirements": {"vegetarian": _int(5, 20), "vegan": _int(1, 10)}, "accessibility_needs": ["Wheelchair access"], "communication_preferences": ["Email"], "pain_points": ["Long queues"], "success_metrics": ["NPS"]},
+    "_design_attendee_experience": {"type": "Hybrid", "phases": {"pre_event": {"touchpoints": ["Welcome email"]}, "on_site": {"touchpoints": ["Fast check-in"]}, "post_event": {"touchpoints": ["Recordings"]}}, "learning_experience": {"formats": ["Workshops"], "personalization": ["Tracks"]}, "networking_experience": {"structured_activities": ["Speed networking"], "social_activities": ["Reception"]}, "technology_tools": ["Event app"], "personalization_features": ["Agenda builder"]},
+    "_plan_networking_activities": {"structured_sessions": _list(_NAMED_ACTIVITY, 3), "mentorship_activities": _list(_NAMED_ACTIVITY, 1), "social_activities": _list(_NAMED_ACTIVITY, 2), "technology_enabled": _list({"name": "Matchmaking {n}", "description": "App-based matching", "features": ["Interests"], "timing": "Pre-event", "metrics": ["Meetings booked"]}, 1)},
+    "_coordinate_hospitality_services": {"catering_services": {"meals": ["Breakfast", "Lunch"], "dietary_accommodations": {"vegetarian": "Available"}}, "accessibility_services": {"mobility": ["Ramps"], "hearing": ["Captioning"]}, "wellness_amenities": ["Quiet room"], "technology_support": ["Help desk"], "staffing": {"registration_desk": "4 staff", "information_desk": "2 staff"}},
+    "_create_communication_strategy": {"pre_event_communications": {"welcome_series": {"emails": _int(2, 5)}}, "on_site_communications": {"daily_updates": {"channel": "App"}}, "post_event_communications": {"feedback_collection": {"channel": "Survey"}}, "personalization": {"segmentation": ["Role"], "customization": ["Agenda"]}, "channels": {"primary": ["Email"], "secondary": ["SMS"], "emergency": ["PA system"]}, "success_metrics": ["Open rate"]},
+    # Logistics and travel
+    "_analyze_logistics_requirements": {"complexity_level": "Medium", "venue_requirements": {"capacity": _int(100, 2000), "rooms_needed": _int(2, 10), "setup_time": "1 day"}, "equipment_needs": {"av_equipment": ["Projectors"], "technology": ["WiFi"], "furniture": ["Chairs"]}, "staffing_requirements": {"event_coordinator": _int(1, 3), "registration_staff": _int(2, 8)}, "transportation_needs": {"parking": "On site", "shuttle_service": True}, "catering_logistics": {"meal_service": ["Lunch"], "timing": "12:00"}},
+    "_plan_travel_arrangements": {"speaker_travel": {"coordination": "Travel desk", "arrangements": ["Flights", "Hotels"], "timing": "6 weeks out"}, "attendee_travel": {"information_provided": ["Directions"], "accommodation_blocks": ["Partner hotel"]}, "cost_management": {"speaker_travel_budget": "Capped per speaker"}, "contingency_planning": {"flight_delays": "Rebooking support"}},
+    "_coordinate_vendor_services": {"vendors": _list({"type": "Vendor type {n}", "services": ["Service"], "selection_criteria": ["Price", "Quality"], "contract_terms": "Net 30", "backup_options": "Secondary vendor", "quality_assurance": "Walkthrough"}, 5), "coordination_timeline": {"vendor_selection": "Month 1", "final_coordination": "Week before"}, "quality_management": {"vendor_meetings": "Weekly"}, "cost_management": {"competitive_bidding": "Three quotes"}},
+    "_create_operational_plans": {"run_of_show": {"pre_event_day": {"setup": "08:00"}, "event_day_1": {"doors": "08:30"}}, "staffing_schedule": {"roles_and_shifts": ["Morning", "Afternoon"], "training": "Day before"}, "equipment_management": {"setup_timeline": "Day before", "testing_procedures": "Full run-through"}, "communication_protocols": {"internal_communication": ["Radios"], "emergency_communication": ["PA"]}, "quality_control": {"pre_event_checks": "Checklist"}},
+    "_plan_incident_response": {"emergency_procedures": {"evacuation_plan": {"routes": "Posted"}, "medical_emergency": {"first_aid": "On site"}}, "incident_classification": {"level_1": {"response": "Staff"}, "level_2": {"response": "Manager"}, "level_3": {"response": "Emergency services"}}, "technical_incidents": {"av_failure": {"response": "Backup equipment"}}, "recovery_procedures": {"incident_documentation": "Incident log"}, "prevention_measures": ["Pre-event inspection"]},
+    # Risk and compliance
+    "_conduct_risk_assessment": {"overall_risk_level": "Medium", "risk_categories": {"operational_risks": _list({"risk": "Operational risk {n}", "likelihood": "Medium", "impact": "Medium"}, 3), "financial_risks": _list({"risk": "Financial risk {n}", "likelihood": "Low", "impact": "High"}, 2), "safety_security_risks": _list({"risk": "Safety risk {n}", "likelihood": "Low", "impact": "High"}, 2)}, "risk_matrix": {"high_impact_high_likelihood": "None", "high_impact_low_likelihood": "Venue cancellation"}},
+    "_analyze_compliance_requirements": {"areas": _list({"category": "Area {n}", "requirements": ["Requirement"], "documentation": ["Record"], "monitoring": "Monthly", "penalties": "Fines"}, 5), "compliance_timeline": {"pre_event": "Permits", "during_event": "Monitoring", "post_event": "Reporting"}, "compliance_team": {"compliance_officer": "Assigned"}},
+    "_develop_mitigation_strategies": {"strategies": _list({"category": "Category {n}", "strategies": ["Mitigation"]}, 4), "implementation_timeline": {"immediate": "Insurance", "short_term": "Contracts"}, "monitoring_and_control": {"regular_reviews": "Weekly"}},
+    "_plan_insurance_coverage": {"insurance_policies": _list({"type": "Policy {n}", "coverage": "Standard", "limit": "$1M", "premium": "$2,000", "deductible": "$1,000", "terms": "Event duration", "claims": "Broker managed"}, 4), "coverage_requirements": {"minimum_liability": "$1M"}, "policy_management": {"review_frequency": "Annual"}, "cost_management": {"policy_bundling": "Preferred"}},
+    "_create_compliance_monitoring": {"monitoring_schedule": {"daily": ["Safety walk"], "weekly": ["Permit status"], "monthly": ["Audit"]}, "audit_procedures": _list({"type": "Audit {n}", "frequency": "Monthly", "scope": "Operations", "procedures": ["Review"], "deliverables": ["Report"]}, 2), "reporting_requirements": {"compliance_reports": "Monthly"}, "issue_management": {"escalation": "Compliance officer"}, "performance_metrics": ["Open issues"]}
+}
+
+# Shape used for steps without an entry above
+DEFAULT_RESPONSE = {"summary": "Analysis complete", "recommendations": ["Proceed as planned"], "confidence": _float(0.6, 0.95)}
+
+def _render(spec: Any, rng: random.Random, position: int = 1) -> Any:
+    """Expand a response shape into concrete JSON-able values."""
+    if isinstance(spec, dict):
+        return {key: _render(value, rng, position) for key, value in spec.items()}
+    if isinstance(spec, list):
+        return [_render(value, rng, position) for value in spec]
+    if isinstance(spec, str):
+        return spec.replace("{n}", str(position))
+    if isinstance(spec, tuple):
+        kind = spec[0]
+        if kind == "int":
+            return rng.randint(spec[1], spec[2])
+        if kind == "float":
+            return round(rng.uniform(spec[1], spec[2]), 2)
+        if kind == "list":
+            return [_render(spec[1], rng, index + 1) for index in range(spec[2])]
+    return spec
+
+class FakeChatModel:
+    """Chat client double with ainvoke/astream, seeded by prompt so runs are reproducible."""
+    
+    def __init__(
+        self,
+        model_name: str = "fake-model",
+        temperature: float = 0.0,
+        seed: int = 0,
+        latency_median: float = 1.0,
+        latency_sigma: float = 0.5,
+        step_latency: Optional[Dict[str, Tuple[float, float]]] = None,
+        failure_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        padding_tokens: int = 0,
+        stream_chunk_chars: int = 16
+    ):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.seed = seed
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.step_latency = step_latency or {}
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.padding_tokens = padding_tokens
+        self.stream_chunk_chars = stream_chunk_chars
+        self.calls = 0
+        self._attempts: Dict[bytes, int] = {}
+    
+    def _digest(self, messages: List[BaseMessage]) -> bytes:
+        digest = hashlib.sha256(self.model_name.encode("utf-8"))
+        digest.update(str(self.seed).encode("utf-8"))
+        for message in messages:
+            digest.update(str(message.content).encode("utf-8"))
+        return digest.digest()
+    
+    def _latency(self, rng: random.Random, step: str) -> float:
+        """Sample a lognormal latency around the step's (or the model's) median."""
+        median, sigma = self.step_latency.get(step, (self.latency_median, self.latency_sigma))
+        if median <= 0:
+            return 0.0
+        return median * math.exp(sigma * rng.gauss(0.0, 1.0))
+    
+    def render(self, step: str, rng: random.Random) -> str:
+        """Build the response body for an agent step."""
+        spec = STEP_RESPONSES.get(step, DEFAULT_RESPONSE)
+        if isinstance(spec, str):
+            body = spec
+            padding = " Thank you for considering our invitation." * (self.padding_tokens // 8)
+            return body + padding
+        
+        value = _render(spec, rng)
+        if self.padding_tokens:
+            # Roughly four characters per token
+            target = value if isinstance(value, dict) else value[0] if value else None
+            if isinstance(target, dict):
+                target["notes"] = "lorem " * (self.padding_tokens * 4 // 6)
+        return json.dumps(value)
+    
+    def _prepare(self, messages: List[BaseMessage]) -> Tuple[str, float]:
+        """Pick the response and latency for a call, raising any injected error.
+        
+        Responses and latencies depend only on the seed and prompt; injected errors also
+        depend on how often the prompt has been tried, so retries can succeed.
+        """
+        self.calls += 1
+        step = llm_call_context.get().get("step", "")
+        digest = self._digest(messages)
+        attempt = self._attempts.get(digest, 0)
+        self._attempts[digest] = attempt + 1
+        
+        rng = random.Random(digest)
+        latency = self._latency(rng, step)
+        
+        roll = random.Random(digest + attempt.to_bytes(4, "big")).random()
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError(f"Simulated rate limit for {self.model_name}")
+        if roll < self.rate_limit_rate + self.failure_rate:
+            raise FakeLLMError(f"Simulated failure for {self.model_name}")
+        
+        return self.render(step, rng), latency
+    
+    async def ainvoke(self, messages: List[BaseMessage], *args, **kwargs) -> AIMessage:
+        content, latency = self._prepare(messages)
+        await asyncio.sleep(latency)
+        return AIMessage(content=content)
+    
+    async def astream(self, messages: List[BaseMessage], *args, **kwargs) -> AsyncIterator[AIMessageChunk]:
+        content, latency = self._prepare(messages)
+        chunks = [
+            content[index:index + self.stream_chunk_chars]
+            for index in range(0, len(content), self.stream_chunk_chars)
+        ] or [""]
+        
+        # Spend a fifth of the latency before the first token, the rest spread over the stream
+        await asyncio.sleep(latency * 0.2)
+        interval = latency * 0.8 / len(chunks)
+        for chunk in chunks:
+            yield AIMessageChunk(content=chunk)
+            await asyncio.sleep(interval)
+
+def create_fake_chat_model(model: str, temperature: float) -> FakeChatModel:
+    """Create a fake client from the LLM_FAKE_* settings."""
+    return FakeChatModel(
+        model_name=model,
+        temperature=temperature,
+        seed=settings.LLM_FAKE_SEED,
+        latency_median=settings.LLM_FAKE_LATENCY_MEDIAN,
+        latency_sigma=settings.LLM_FAKE_LATENCY_SIGMA,
+        failure_rate=settings.LLM_FAKE_FAILURE_RATE,
+        rate_limit_rate=settings.LLM_FAKE_RATE_LIMIT_RATE,
+        padding_tokens=settings.LLM_FAKE_PADDING_TOKENS
+    )
@@ -0,0 +1,360 @@
+"""
+LLM Rate Limiting for OrchestrateX
+
+This module schedules LLM calls against per-provider, per-model request and token
+budgets. Each call reserves one request and its estimated tokens from token buckets
+refilled at the configured per-minute quotas; waiting callers are served in priority
+order. Rate-limit headers and 429 responses shrink the budget and pause the queue,
+and sustained success grows it back to the configured ceiling.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from langchain.callbacks.base import AsyncCallbackHandler
+from langchain.schema import BaseMessage, LLMResult
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain-openai
+    tiktoken = None
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset values such as '1s', '6m0s', '20ms' or a plain seconds count."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+_encodings: Dict[Optional[str], Any] = {}
+_encoding_loads: Dict[Optional[str], asyncio.Task] = {}
+
+def _load_encoding(model: Optional[str]) -> Any:
+    """Load the tiktoken encoding for a model, or None if it cannot be loaded."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to the heuristic
+        logger.warning(f"Token encoding unavailable for {model}, estimating from length: {str(e)}")
+        return None
+
+async def load_encodings(models: List[Optional[str]]):
+    """Load the encodings for models in worker threads, since loading may download them."""
+    async def load(model: Optional[str]):
+        _encodings[model] = await asyncio.to_thread(_load_encoding, model)
+        _encoding_loads.pop(model, None)
+    
+    await asyncio.gather(*(load(model) for model in models if model not in _encodings))
+
+def _get_encoding(model: Optional[str]) -> Any:
+    """The tiktoken encoding for a model, or None while it is still loading.
+    
+    On the event loop a missing encoding is loaded in the background and callers use the
+    length heuristic meanwhile, so a download never blocks the loop.
+    """
+    if model in _encodings:
+        return _encodings[model]
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _encodings[model] = _load_encoding(model)
+        return _encodings[model]
+    
+    if model not in _encoding_loads:
+        _encoding_loads[model] = loop.create_task(load_encodings([model]))
+    return None
+
+def estimate_text_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimate the tokens in a piece of text, with tiktoken when available and ~4 chars per token otherwise."""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    return len(text) // 4
+
+def estimate_tokens(messages: List[BaseMessage], model: Optional[str] = None) -> int:
+    """Estimate prompt tokens, including the per-message overhead."""
+    text = "".join(str(message.content) for message in messages)
+    overhead = 4 * len(messages) + 3
+    return estimate_text_tokens(text, model) + overhead
+
+def reported_tokens(llm_output: Any) -> Optional[int]:
+    """Total tokens a provider reported for a call (OpenAI token_usage, Anthropic usage), if any."""
+    usage = (llm_output.get("token_usage") or llm_output.get("usage")) if isinstance(llm_output, dict) else getattr(llm_output, "usage", None)
+    if not usage:
+        return None
+    
+    field = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, None)
+    total = field("total_tokens")
+    if total is None and field("input_tokens") is not None:
+        total = field("input_tokens") + (field("output_tokens") or 0)
+    return int(total) if total is not None else None
+
+class UsageRecorder(AsyncCallbackHandler):
+    """Callback keeping the token usage the provider reports for a call."""
+    
+    def __init__(self):
+        self.total_tokens: Optional[int] = None
+    
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        self.total_tokens = reported_tokens(response.llm_output)
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether a provider error is a 429 / rate-limit response."""
+    return getattr(error, "status_code", None) == 429 or "RateLimit" in type(error).__name__
+
+class TokenBucket:
+    """Continuously refilled bucket holding up to one minute of quota."""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def time_until(self, amount: float) -> float:
+        """Seconds until the bucket can cover amount (0 if it already can)."""
+        self._refill()
+        # Requests larger than the whole bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else float("inf")
+    
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= amount
+    
+    def refund(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+    
+    def set_rate(self, per_minute: float):
+        self._refill()
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = min(self.level, self.capacity)
+    
+    def cap_level(self, remaining: float):
+        """Lower the bucket to what the provider reports as remaining."""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+class ProviderRateLimiter:
+    """Priority-ordered scheduler over request and token budgets for one provider model."""
+    
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        min_fraction: float = 0.1,
+        recovery_step: float = 0.05,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0
+    ):
+        self.name = name
+        self.max_rpm = requests_per_minute
+        self.max_tpm = tokens_per_minute
+        self.min_fraction = min_fraction
+        self.recovery_step = recovery_step
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        # Fraction of the configured quota currently allowed (AIMD)
+        self.fraction = 1.0
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._blocked_until = 0.0
+        self._consecutive_limits = 0
+        
+        self.granted = 0
+        self.rate_limited = 0
+        self.total_wait_time = 0.0
+    
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    def _wait_time(self, tokens: int) -> float:
+        wait = self._blocked_until - time.monotonic()
+        if self.requests is not None:
+            wait = max(wait, self.requests.time_until(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.time_until(tokens))
+        return wait
+    
+    async def acquire(self, tokens: int, priority: int = PRIORITY_NORMAL):
+        """Wait for this call's turn and reserve one request and its estimated tokens."""
+        entry = (priority, next(self._sequence))
+        heapq.heappush(self._queue, entry)
+        start = time.monotonic()
+        
+        try:
+            while True:
+                timeout = None
+                if self._queue[0] == entry:
+                    timeout = self._wait_time(tokens)
+                    if timeout <= 0:
+                        heapq.heappop(self._queue)
+                        if self.requests is not None:
+                            self.requests.consume(1)
+                        if self.tokens is not None:
+                            self.tokens.consume(tokens)
+                        self.granted += 1
+                        self.total_wait_time += time.monotonic() - start
+                        self._notify()
+                        return
+                
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._notify()
+            raise
+    
+    def release_unused(self, reserved_tokens: int, used_tokens: Optional[int]):
+        """Return the over-estimated part of a reservation once actual usage is known."""
+        if self.tokens is not None and used_tokens is not None and used_tokens < reserved_tokens:
+            self.tokens.refund(reserved_tokens - used_tokens)
+            self._notify()
+    
+    def _apply_fraction(self):
+        if self.requests is not None:
+            self.requests.set_rate(self.max_rpm * self.fraction)
+        if self.tokens is not None:
+            self.tokens.set_rate(self.max_tpm * self.fraction)
+    
+    def record_success(self):
+        """Grow the allowed rate back toward the configured quota."""
+        self._consecutive_limits = 0
+        if self.fraction < 1.0:
+            self.fraction = min(1.0, self.fraction + self.recovery_step)
+            self._apply_fraction()
+    
+    def record_rate_limit(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Shrink the allowed rate and pause the queue after a 429; returns the pause length."""
+        self.rate_limited += 1
+        self._consecutive_limits += 1
+        self.fraction = max(self.min_fraction, self.fraction / 2)
+        self._apply_fraction()
+        
+        retry_after = parse_duration((headers or {}).get("retry-after"))
+        if retry_after is None:
+            backoff = min(self.backoff_max, self.backoff_base * 2 ** (self._consecutive_limits - 1))
+            retry_after = backoff * (0.5 + random.random() / 2)
+        
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._notify()
+        logger.warning(f"Rate limited by {self.name}; pausing for {retry_after:.1f}s at {self.fraction:.0%} of quota")
+        return retry_after
+    
+    def observe_headers(self, headers: Mapping[str, str]):
+        """Sync the buckets with the provider's remaining-quota headers."""
+        remaining_requests = headers.get("x-ratelimit-remaining-requests") or headers.get("anthropic-ratelimit-requests-remaining")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens") or headers.get("anthropic-ratelimit-tokens-remaining")
+        
+        try:
+            if remaining_requests is not None and self.requests is not None:
+                self.requests.cap_level(float(remaining_requests))
+            if remaining_tokens is not None and self.tokens is not None:
+                self.tokens.cap_level(float(remaining_tokens))
+        except ValueError:
+            return
+        
+        if remaining_requests is not None and float(remaining_requests) <= 0:
+            reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + reset)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, budget levels and counters."""
+        return {
+            "queued": len(self._queue),
+            "quota_fraction": self.fraction,
+            "requests_available": self.requests.level if self.requests else None,
+            "tokens_available": self.tokens.level if self.tokens else None,
+            "paused_for": max(0.0, self._blocked_until - time.monotonic()),
+            "granted": self.granted,
+            "rate_limited": self.rate_limited,
+            "avg_wait_ms": self.total_wait_time / self.granted * 1000 if self.granted else 0.0
+        }
+
+class LLMRateLimiterRegistry:
+    """Holds one rate limiter per provider and model."""
+    
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+    
+    def get(self, provider: str, model: str) -> ProviderRateLimiter:
+        key = (provider, model)
+        if key not in self._limiters:
+            quotas = {
+                "openai": (settings.OPENAI_REQUESTS_PER_MINUTE, settings.OPENAI_TOKENS_PER_MINUTE),
+                "anthropic": (settings.ANTHROPIC_REQUESTS_PER_MINUTE, settings.ANTHROPIC_TOKENS_PER_MINUTE)
+            }
+            rpm, tpm = quotas.get(provider, (0, 0))
+            self._limiters[key] = ProviderRateLimiter(
+                f"{provider}:{model}",
+                requests_per_minute=rpm,
+                tokens_per_minute=tpm,
+                backoff_base=settings.LLM_RATE_LIMIT_BACKOFF_BASE,
+                backoff_max=settings.LLM_RATE_LIMIT_BACKOFF_MAX
+            )
+        return self._limiters[key]
+    
+    def observe_headers(self, provider: str, model: Optional[str], headers: Mapping[str, str]):
+        """Feed response headers to the matching limiter(s)."""
+        for (limiter_provider, limiter_model), limiter in self._limiters.items():
+            if limiter_provider == provider and (model is None or limiter_model == model):
+                limiter.observe_headers(headers)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {limiter.name: limiter.get_stats() for limiter in self._limiters.values()}
+
+# Shared limiter registry
+llm_rate_limiters = LLMRateLimiterRegistry()
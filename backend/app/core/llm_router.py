@@ -0,0 +1,257 @@
+"""
+LLM Provider Routing for OrchestrateX
+
+This module routes LLM calls between the OpenAI and Anthropic clients. It tracks recent
+latency per provider, sends a hedged request to the secondary provider when the primary
+has not answered within its p95-derived deadline (or fails over at once when it errors),
+and takes a provider out of rotation with a circuit breaker while it keeps failing.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """Sliding window of successful call latencies for one provider."""
+    
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+    
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get a latency percentile, or None until enough samples have been seen."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single trial call through after a cool-down."""
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+    
+    def available(self) -> bool:
+        """Check whether a call may be sent to this provider now."""
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self.state = "half_open"
+            self._trial_in_flight = False
+        return self.state == "closed" or (self.state == "half_open" and not self._trial_in_flight)
+    
+    def begin(self):
+        """Mark a call as started; in half-open state it is the single trial call."""
+        if self.state == "half_open":
+            self._trial_in_flight = True
+    
+    def release_trial(self):
+        """Free the trial slot when the trial call was abandoned rather than answered."""
+        self._trial_in_flight = False
+    
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"LLM circuit for {self.name} opened after {self.failures} consecutive failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+class LLMRouter:
+    """Latency-aware primary/secondary routing with hedging, failover and circuit breakers."""
+    
+    def __init__(
+        self,
+        mode: str = "hedged",
+        hedge_multiplier: float = 1.0,
+        hedge_min_delay: float = 2.0,
+        hedge_max_delay: float = 30.0,
+        hedge_default_delay: float = 10.0,
+        latency_window: int = 200,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0
+    ):
+        self.mode = mode
+        self.hedge_multiplier = hedge_multiplier
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.latency_window = latency_window
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+    
+    def latency(self, provider: str) -> LatencyTracker:
+        if provider not in self._latency:
+            self._latency[provider] = LatencyTracker(window=self.latency_window)
+        return self._latency[provider]
+    
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(provider, self.failure_threshold, self.reset_seconds)
+        return self._breakers[provider]
+    
+    def hedge_delay(self, provider: str) -> float:
+        """How long to wait on a provider before hedging to the other one."""
+        p95 = self.latency(provider).percentile(0.95)
+        delay = self.hedge_default_delay if p95 is None else p95 * self.hedge_multiplier
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, delay))
+    
+    def record_latency(self, provider: str, seconds: float):
+        """Record the round-trip time of a successful provider call.
+        
+        Callers time only the provider request itself, so rate-limiter queueing and
+        concurrency waits do not inflate the hedge deadlines.
+        """
+        self.latency(provider).record(seconds)
+    
+    async def _attempt(
+        self,
+        provider: str,
+        call: Callable[[str, bool, asyncio.Event], Awaitable[str]],
+        hedge: bool,
+        started: Optional[asyncio.Event] = None
+    ) -> str:
+        breaker = self.breaker(provider)
+        breaker.begin()
+        try:
+            result = await call(provider, hedge, started or asyncio.Event())
+        except asyncio.CancelledError:
+            # Losing a hedge race says nothing about the provider's health
+            breaker.release_trial()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        
+        breaker.record_success()
+        return result
+    
+    async def call(self, providers: List[str], call: Callable[[str, bool, asyncio.Event], Awaitable[str]]) -> str:
+        """
+        Run call(provider, is_hedge, started) against providers in preference order.
+        
+        The first provider whose circuit allows it is the primary. In "hedged" mode the next
+        one is started when the primary errors or outlives its hedge deadline, and the first
+        successful answer wins. In "failover" mode the next one is only tried after an error.
+        call sets started once its provider request is sent, after any rate limit or
+        concurrency queueing; the hedge deadline only runs from then, so a primary that is
+        still queued is never hedged. call reports its provider round-trips with record_latency.
+        """
+        if self.mode == "single":
+            providers = providers[:1]
+        
+        candidates = [provider for provider in providers if self.breaker(provider).available()]
+        if not candidates:
+            # Every circuit is open; try the preferred provider rather than failing outright
+            candidates = providers[:1]
+        
+        primary = candidates[0]
+        secondary = candidates[1] if len(candidates) > 1 and self.mode in ("hedged", "failover") else None
+        
+        if secondary is None:
+            return await self._attempt(primary, call, hedge=False)
+        
+        if self.mode == "failover":
+            try:
+                return await self._attempt(primary, call, hedge=False)
+            except Exception as e:
+                self.failovers += 1
+                logger.warning(f"LLM provider {primary} failed, failing over to {secondary}: {str(e)}")
+                return await self._attempt(secondary, call, hedge=True)
+        
+        primary_started = asyncio.Event()
+        primary_task = asyncio.ensure_future(self._attempt(primary, call, hedge=False, started=primary_started))
+        started_task = asyncio.ensure_future(primary_started.wait())
+        tasks = {primary_task: primary}
+        try:
+            # Queueing for the rate budget or a connection slot does not count against the deadline
+            done, _ = await asyncio.wait({primary_task, started_task}, return_when=asyncio.FIRST_COMPLETED)
+            started_task.cancel()
+            if primary_task not in done:
+                done, _ = await asyncio.wait({primary_task}, timeout=self.hedge_delay(primary))
+            if primary_task in done and primary_task.exception() is None:
+                return primary_task.result()
+            
+            if primary_task in done:
+                self.failovers += 1
+                logger.warning(f"LLM provider {primary} failed, failing over to {secondary}: {str(primary_task.exception())}")
+            else:
+                self.hedges += 1
+            
+            hedge_task = asyncio.ensure_future(self._attempt(secondary, call, hedge=True))
+            tasks[hedge_task] = secondary
+            
+            pending = {task for task in tasks if not task.done()}
+            last_error: Optional[BaseException] = primary_task.exception() if primary_task.done() else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task and not primary_task.done():
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+            
+            raise last_error
+        finally:
+            started_task.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-provider latency percentiles, circuit states and hedging counters."""
+        providers = set(self._latency) | set(self._breakers)
+        return {
+            "mode": self.mode,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "providers": {
+                provider: {
+                    "p50": self.latency(provider).percentile(0.5),
+                    "p95": self.latency(provider).percentile(0.95),
+                    "hedge_delay": self.hedge_delay(provider),
+                    "circuit": self.breaker(provider).state,
+                    "consecutive_failures": self.breaker(provider).failures
+                }
+                for provider in sorted(providers)
+            }
+        }
+
+# Shared router instance
+llm_router = LLMRouter(
+    mode=settings.LLM_ROUTING_MODE,
+    hedge_multiplier=settings.LLM_HEDGE_P95_MULTIPLIER,
+    hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+    hedge_max_delay=settings.LLM_HEDGE_MAX_DELAY,
+    hedge_default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+    latency_window=settings.LLM_LATENCY_WINDOW,
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+)
@@ -0,0 +1,147 @@
+"""
+LLM Request Coalescing for OrchestrateX
+
+This module collapses identical in-flight LLM requests into one provider call. Callers in
+the same process await a shared task; with Redis enabled, callers in other processes wait
+on a short-lived lock and pick up the leader's published result.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, Any, Awaitable, Callable, Optional
+import redis.asyncio as redis
+
+from .config import settings
+from .redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if this process still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class LLMSingleFlight:
+    """Runs at most one request per prompt key at a time and shares its result."""
+    
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        lock_ttl_seconds: float = 120.0,
+        result_ttl_seconds: int = 30,
+        poll_interval: float = 0.25,
+        namespace: str = "llm_inflight"
+    ):
+        self.redis = redis_client
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.poll_interval = poll_interval
+        self.namespace = namespace
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote_waits = 0
+        self.remote_hits = 0
+    
+    def _lock_key(self, key: str) -> str:
+        return f"{self.namespace}:lock:{key}"
+    
+    def _result_key(self, key: str) -> str:
+        return f"{self.namespace}:result:{key}"
+    
+    async def run(self, key: str, func: Callable[[], Awaitable[str]]) -> str:
+        """Run func for this key, or join the call already in flight for it."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+        
+        # The shared work is owned by a task, so a cancelled caller does not cancel it for the others
+        task = asyncio.ensure_future(self._lead(key, func))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved; callers that are still waiting re-raise it themselves
+            task.exception()
+    
+    async def _lead(self, key: str, func: Callable[[], Awaitable[str]]) -> str:
+        if self.redis is None:
+            self.leaders += 1
+            return await func()
+        
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(self._lock_key(key), token, nx=True, px=int(self.lock_ttl_seconds * 1000))
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for LLM request coalescing: {str(e)}")
+            self.leaders += 1
+            return await func()
+        
+        if not acquired:
+            result = await self._wait_for_remote(key)
+            if result is not None:
+                return result
+            # The remote leader failed or its lock expired; make the call here
+        
+        self.leaders += 1
+        try:
+            result = await func()
+            try:
+                await self.redis.setex(self._result_key(key), self.result_ttl_seconds, result)
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for LLM result publish: {str(e)}")
+            return result
+        finally:
+            if acquired:
+                try:
+                    await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+                except redis.RedisError as e:
+                    logger.warning(f"Redis unavailable for LLM lock release: {str(e)}")
+    
+    async def _wait_for_remote(self, key: str) -> Optional[str]:
+        """Poll for another process's result while it holds the lock."""
+        self.remote_waits += 1
+        deadline = time.monotonic() + self.lock_ttl_seconds
+        
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                result = await self.redis.get(self._result_key(key))
+                if result is not None:
+                    self.remote_hits += 1
+                    return result
+                if not await self.redis.exists(self._lock_key(key)):
+                    return None
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable while waiting on a coalesced LLM request: {str(e)}")
+        
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing counters."""
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "remote_waits": self.remote_waits,
+            "remote_hits": self.remote_hits,
+            "redis_enabled": self.redis is not None
+        }
+
+# Shared coalescer instance
+llm_singleflight = LLMSingleFlight(
+    redis_client=redis_client if settings.LLM_SINGLEFLIGHT_REDIS_ENABLED else None,
+    lock_ttl_seconds=settings.LLM_SINGLEFLIGHT_LOCK_TTL,
+    poll_interval=settings.LLM_SINGLEFLIGHT_POLL_INTERVAL
+)
@@ -0,0 +1,137 @@
+"""
+Pagination Module for OrchestrateX
+
+This module provides keyset (cursor) pagination over (created_at, id) and cheap ways to
+report a total: an exact count, a count cached in Redis, the query planner's row
+estimate, or no total at all. Keyset pages cost the same however deep the client goes.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import redis.asyncio as redis
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+TOTAL_MODES = ("exact", "cached", "estimated", "none")
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Build an opaque cursor pointing just past a row."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered newest first by (created_at, id).
+    
+    With a cursor the page starts right after the cursor's row using an index range scan;
+    without one, the legacy offset is applied. Returns the rows and the cursor for the
+    next page (None on the last page).
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+    
+    # Read one extra row to learn whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    return rows, next_cursor
+
+def _literal_sql(db: AsyncSession, query: Select) -> str:
+    """Render a query with its parameters inlined, for cache keys only."""
+    return str(query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+
+async def _exact_total(db: AsyncSession, query: Select) -> int:
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar() or 0
+
+async def _estimated_total(db: AsyncSession, query: Select) -> int:
+    """Read the planner's row estimate instead of counting."""
+    # Keep the filter values as bound parameters; only the statement text is interpolated
+    compiled = query.order_by(None).compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def _cached_total(db: AsyncSession, query: Select) -> int:
+    """Exact count, reused from Redis for PAGINATION_TOTAL_CACHE_TTL seconds."""
+    digest = hashlib.sha256(_literal_sql(db, query.order_by(None)).encode("utf-8")).hexdigest()
+    key = f"page_total:{digest}"
+    
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except redis.RedisError as e:
+        logger.warning(f"Redis unavailable for page total lookup: {str(e)}")
+    
+    total = await _exact_total(db, query)
+    
+    try:
+        await redis_client.setex(key, settings.PAGINATION_TOTAL_CACHE_TTL, total)
+    except redis.RedisError as e:
+        logger.warning(f"Redis unavailable for page total write: {str(e)}")
+    
+    return total
+
+async def count_total(db: AsyncSession, query: Select, mode: str) -> Optional[int]:
+    """Get the total for a filtered query using the requested total mode."""
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        try:
+            return await _estimated_total(db, query)
+        except Exception as e:
+            # Non-PostgreSQL backends cannot EXPLAIN (FORMAT JSON); fall back to counting
+            logger.warning(f"Planner estimate unavailable, counting instead: {str(e)}")
+            return await _exact_total(db, query)
+    if mode == "cached":
+        return await _cached_total(db, query)
+    return await _exact_total(db, query)
@@ -0,0 +1,187 @@
+"""
+User Principal Cache for OrchestrateX
+
+This module caches the small slice of a user row that authentication needs (active flag,
+role and tenant) so authenticated requests can resolve the caller without querying the
+users table. Entries live in an in-process LRU backed by Redis and are invalidated
+whenever the user is updated, deactivated, deleted or anonymized.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .redis import redis_client
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+class UserPrincipalCache:
+    """Two-tier cache of authentication principals keyed by user id."""
+    
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 30,
+        redis_ttl_seconds: int = 300,
+        redis_client: Optional[redis.Redis] = None,
+        namespace: str = "user_principal",
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        # The local tier cannot see invalidations made by other processes, so it is kept
+        # short-lived; the shared Redis tier is invalidated directly and can live longer
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.redis = redis_client
+        self.namespace = namespace
+        # user id -> (expires_at, principal), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def principal_from_user(user: User) -> Dict[str, Any]:
+        """Extract the cached fields from a user row."""
+        return {
+            "id": user.id,
+            "is_active": bool(user.is_active),
+            "role": user.role,
+            "tenant_id": user.tenant_id
+        }
+    
+    @staticmethod
+    def user_from_principal(principal: Dict[str, Any]) -> User:
+        """Build a transient (session-less) User carrying the cached fields."""
+        return User(
+            id=principal["id"],
+            is_active=principal["is_active"],
+            role=principal["role"],
+            tenant_id=principal["tenant_id"]
+        )
+    
+    def _redis_key(self, user_id: str) -> str:
+        return f"{self.namespace}:{user_id}"
+    
+    def _get_local(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+        
+        self._entries.move_to_end(user_id)
+        return principal
+    
+    def _set_local(self, user_id: str, principal: Dict[str, Any]):
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(user_id)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a principal, checking memory first and then Redis."""
+        principal = self._get_local(user_id)
+        if principal is not None:
+            self.hits += 1
+            return principal
+        
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self._redis_key(user_id))
+                if value is not None:
+                    principal = json.loads(value)
+                    self._set_local(user_id, principal)
+                    self.hits += 1
+                    self.redis_hits += 1
+                    return principal
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for principal lookup: {str(e)}")
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, principal: Dict[str, Any]):
+        """Store a principal in both tiers."""
+        self._set_local(principal["id"], principal)
+        
+        if self.redis is not None:
+            try:
+                await self.redis.setex(self._redis_key(principal["id"]), self.redis_ttl_seconds, json.dumps(principal))
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for principal write: {str(e)}")
+    
+    async def invalidate(self, user_id: str):
+        """Drop a user's principal from both tiers after the user row changes."""
+        self._entries.pop(user_id, None)
+        self.invalidations += 1
+        
+        if self.redis is not None:
+            try:
+                await self.redis.delete(self._redis_key(user_id))
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for principal invalidation: {str(e)}")
+    
+    async def load(self, user_id: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """Get a principal from the cache, falling back to the users table."""
+        if self.enabled:
+            principal = await self.get(user_id)
+            if principal is not None:
+                return principal
+        
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        
+        principal = self.principal_from_user(user)
+        if self.enabled:
+            await self.set(principal)
+        return principal
+    
+    def clear(self):
+        """Drop all in-process entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.invalidations = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "redis_enabled": self.redis is not None,
+            "enabled": self.enabled
+        }
+
+# Shared cache instance
+principal_cache = UserPrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    redis_ttl_seconds=settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+    redis_client=redis_client if settings.PRINCIPAL_CACHE_REDIS_ENABLED else None,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED
+)
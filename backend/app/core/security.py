@@ -17,6 +17,7 @@ from sqlalchemy import select
 
 from ..core.config import settings
 from ..core.database import get_db
+from ..core.principal_cache import principal_cache
 from ..models.user import User
 from ..models.event import Event
 
@@ -233,25 +234,25 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Resolve the caller from the principal cache, querying the users table on a miss
+    principal = await principal_cache.load(user_id, db)
     
-    if user is None:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user.is_active:
+    if not principal["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    # Transient user carrying id, role, tenant_id and is_active only
+    return principal_cache.user_from_principal(principal)
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user."""
@@ -6,8 +6,15 @@ import uvicorn
 from app.core.config import settings
 from app.core.middleware import setup_middleware
 from app.api.v1.api import api_router
+from app.websockets.router import router as websocket_router
 from app.core.database import engine
 from app.core.redis import redis_client
+from app.core.llm_clients import llm_clients
+from app.core.llm_rate_limit import load_encodings
+from app.workers.agent_executor import agent_executor
+from app.core.activity_buffer import activity_buffer
+from app.core.llm_cassette import cassette_recorder
+from app.agents.base_agent import add_llm_observer, remove_llm_observer
 
 app = FastAPI(
     title="Conference Planning Crew API",
@@ -23,6 +30,27 @@ setup_middleware(app, redis_client)
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Include WebSocket router
+app.include_router(websocket_router, prefix="/ws")
+
+@app.on_event("startup")
+async def startup():
+    await activity_buffer.start()
+    await load_encodings([settings.OPENAI_MODEL, settings.ANTHROPIC_MODEL])
+    if settings.LLM_CASSETTE_RECORD_PATH:
+        cassette_recorder.start(settings.LLM_CASSETTE_RECORD_PATH)
+        add_llm_observer(cassette_recorder)
+    if settings.AGENT_WORKERS > 0:
+        await agent_executor.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await agent_executor.stop()
+    await activity_buffer.stop()
+    remove_llm_observer(cassette_recorder)
+    cassette_recorder.stop()
+    await llm_clients.aclose()
+
 @app.get("/")
 async def root():
     return {
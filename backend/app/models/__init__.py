@@ -6,6 +6,7 @@ from .venue import Venue
 from .speaker import Speaker
 from .sponsor import Sponsor
 from .agent_activity import AgentActivity
+from .agent_checkpoint import AgentCheckpoint
 
 __all__ = [
     "User",
@@ -15,5 +16,6 @@ __all__ = [
     "Venue",
     "Speaker",
     "Sponsor",
-    "AgentActivity"
+    "AgentActivity",
+    "AgentCheckpoint"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,15 +6,20 @@ import uuid
 
 class Agent(Base):
     __tablename__ = "agents"
+    __table_args__ = (
+        Index("ix_agents_event_status_type", "event_id", "status", "type"),
+        Index("ix_agents_event_created", "event_id", "created_at", "id"),
+        Index("ix_agents_running", "event_id", postgresql_where=text("status = 'running'")),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, nullable=False, index=True)
+    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
     type = Column(String, nullable=False)  # venue_scout, speaker_outreach, etc.
     status = Column(String, default="idle")  # idle, running, completed, error, waiting_approval
     progress = Column(Integer, default=0)  # 0-100
     current_task = Column(Text, nullable=True)
     decisions = Column(JSON, default=list)  # Store decisions as JSON array
-    metadata = Column(JSON, nullable=True)  # Additional agent-specific data
+    metadata_ = Column("metadata", JSON, nullable=True)  # Additional agent-specific data
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,9 +6,12 @@ import uuid
 
 class AgentActivity(Base):
     __tablename__ = "agent_activities"
+    __table_args__ = (
+        Index("ix_agent_activities_agent_created", "agent_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    agent_id = Column(String, nullable=False, index=True)
+    agent_id = Column(String, ForeignKey("agents.id"), nullable=False, index=True)
     event_id = Column(String, nullable=False, index=True)
     type = Column(String, nullable=False)  # info, success, warning, error
     message = Column(Text, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+class AgentCheckpoint(Base):
+    __tablename__ = "agent_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("agent_id", "step", name="uq_agent_checkpoints_agent_step"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    agent_id = Column(String, nullable=False, index=True)
+    step = Column(String, nullable=False)
+    output = Column(Text, nullable=False)  # JSON-encoded step output
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<AgentCheckpoint(agent_id={self.agent_id}, step={self.step})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, JSON, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,11 +6,15 @@ import uuid
 
 class Approval(Base):
     __tablename__ = "approvals"
+    __table_args__ = (
+        Index("ix_approvals_event_status_created", "event_id", "status", "created_at"),
+        Index("ix_approvals_pending", "event_id", "created_at", postgresql_where=text("status = 'pending'")),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, nullable=False, index=True)
-    agent_id = Column(String, nullable=False, index=True)
-    approver_id = Column(String, nullable=True, index=True)  # User who approved/rejected
+    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
+    agent_id = Column(String, ForeignKey("agents.id"), nullable=False, index=True)
+    approver_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)  # User who approved/rejected
     type = Column(String, nullable=False)  # venue_selection, speaker_confirmation, budget_approval, etc.
     status = Column(String, default="pending")  # pending, approved, rejected
     title = Column(String, nullable=False)
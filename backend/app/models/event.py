@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,13 @@ import uuid
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Tenant listing, newest first, with keyset pagination on (created_at, id)
+        Index("ix_events_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_events_tenant_status_created", "tenant_id", "status", "created_at"),
+        # Backs the case-insensitive substring filter on city (requires pg_trgm)
+        Index("ix_events_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, index=True)
@@ -22,7 +29,7 @@ class Event(Base):
     budget_total = Column(Float, default=0.0)
     budget_spent = Column(Float, default=0.0)
     brief_json = Column(JSON, nullable=True)  # Store event brief as JSON
-    created_by = Column(String, nullable=False, index=True)
+    created_by = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     tenant_id = Column(String, index=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,7 +8,7 @@ class Speaker(Base):
     __tablename__ = "speakers"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, nullable=False, index=True)
+    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,7 +8,7 @@ class Sponsor(Base):
     __tablename__ = "sponsors"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, nullable=False, index=True)
+    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     contact_person = Column(String, nullable=True)
     contact_email = Column(String, nullable=True)
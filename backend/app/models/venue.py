@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,7 +8,7 @@ class Venue(Base):
     __tablename__ = "venues"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, nullable=False, index=True)
+    event_id = Column(String, ForeignKey("events.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     address = Column(Text, nullable=False)
     city = Column(String, nullable=False)
@@ -21,7 +21,7 @@ class Venue(Base):
     amenities = Column(JSON, nullable=True)  # List of available amenities
     status = Column(String, default="proposed")  # proposed, selected, rejected, booked
     notes = Column(Text, nullable=True)
-    metadata = Column(JSON, nullable=True)  # Additional venue data
+    metadata_ = Column("metadata", JSON, nullable=True)  # Additional venue data
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -6,7 +6,8 @@ class AgentBase(BaseModel):
     event_id: str
     type: str = Field(..., pattern="^(venue_scout|speaker_outreach|sponsorship_manager|budget_controller|marketing_ops|attendee_experience|logistics_travel|risk_compliance)$")
     current_task: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    # Mapped as Agent.metadata_ because "metadata" is reserved on declarative models
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias=AliasChoices("metadata_", "metadata"))
 
 class AgentCreate(AgentBase):
     pass
@@ -48,6 +49,7 @@ class Agent(AgentBase):
 
 class AgentList(BaseModel):
     agents: list[Agent]
-    total: int
+    total: Optional[int] = None  # None when total=none; planner estimate when total=estimated
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
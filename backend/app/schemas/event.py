@@ -61,6 +61,7 @@ class Event(EventBase):
 
 class EventList(BaseModel):
     events: list[Event]
-    total: int
+    total: Optional[int] = None  # None when total=none; planner estimate when total=estimated
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query, status
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.core.security import SecurityManager
+from app.core.principal_cache import principal_cache
+from app.core.agent_events import agent_events, agent_channel, event_channel
+from app.models.agent import Agent
+from app.models.event import Event
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+async def _authorize(token: str, resource_query) -> bool:
+    """Check a WebSocket token and that the user's tenant owns the requested resource.
+    
+    The session is closed before returning, so open sockets hold no database connection.
+    """
+    try:
+        payload = SecurityManager.verify_token(token)
+    except HTTPException:
+        return False
+    
+    async with AsyncSessionLocal() as db:
+        principal = await principal_cache.load(payload.get("sub"), db)
+        if principal is None or not principal["is_active"]:
+            return False
+        
+        user = principal_cache.user_from_principal(principal)
+        result = await db.execute(resource_query(user.tenant_id))
+        return result.scalar_one_or_none() is not None
+
+async def _forward_updates(websocket: WebSocket, channel: str):
+    """Relay published agent updates to the client until it disconnects."""
+    async def pump():
+        async for message in agent_events.subscribe(channel):
+            await websocket.send_json(message)
+    
+    pump_task = asyncio.create_task(pump())
+    try:
+        # Clients only listen; reading detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pump_task.cancel()
+
+@router.websocket("/agents/{agent_id}")
+async def agent_updates(
+    websocket: WebSocket,
+    agent_id: str,
+    token: str = Query(...)
+):
+    """Stream token deltas, progress, activities and status changes for one agent."""
+    authorized = await _authorize(
+        token,
+        lambda tenant_id: select(Agent.id).join(Event).where(Agent.id == agent_id, Event.tenant_id == tenant_id)
+    )
+    if not authorized:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    await _forward_updates(websocket, agent_channel(agent_id))
+
+@router.websocket("/events/{event_id}")
+async def event_updates(
+    websocket: WebSocket,
+    event_id: str,
+    token: str = Query(...)
+):
+    """Stream updates from every agent working on an event."""
+    authorized = await _authorize(
+        token,
+        lambda tenant_id: select(Event.id).where(Event.id == event_id, Event.tenant_id == tenant_id)
+    )
+    if not authorized:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    await _forward_updates(websocket, event_channel(event_id))
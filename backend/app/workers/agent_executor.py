@@ -0,0 +1,440 @@
+"""
+Agent Execution Engine for OrchestrateX
+
+This module runs agent workflows in the background. The API enqueues runs on a Redis
+list and a pool of async workers (in the API process or in dedicated worker processes)
+claims them onto a processing list and executes them, capping concurrent runs per tenant and writing status, progress and
+results back to the agent row.
+
+A tenant's run slots are leases in a sorted set scored by expiry. Workers renew their
+lease while a job runs, so a long run keeps its slot and a crashed worker's slot frees
+itself once its lease lapses. Jobs left on the processing list without a live lease are
+put back on the queue, so a crashed worker's run is picked up by another one.
+
+Jobs that cannot start yet, because upstream agents are still running or the tenant is
+at its cap, are parked in a sorted set scored by retry time instead of being spun on,
+and moved back onto the queue once they are due.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, List, Optional
+import redis.asyncio as redis
+from sqlalchemy import select, func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import redis_client
+from app.core.activity_buffer import activity_buffer
+from app.core.llm_cassette import cassette_recorder
+from app.core.llm_rate_limit import load_encodings
+from app.models.agent import Agent
+from app.models.event import Event
+from app.agents import create_agent, AGENT_DEPENDENCIES, BaseAgent
+from app.agents.base_agent import add_llm_observer, remove_llm_observer
+
+logger = logging.getLogger(__name__)
+
+# Take a run slot if the tenant holds fewer than the cap, dropping lapsed leases first
+_ACQUIRE_LEASE_SCRIPT = """
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[1])
+if redis.call("zcard", KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call("zadd", KEYS[1], ARGV[3], ARGV[4])
+redis.call("expire", KEYS[1], ARGV[5])
+return 1
+"""
+
+# Move a claimed job from the processing list back to the queue, unless someone already did
+_REQUEUE_SCRIPT = """
+if redis.call("lrem", KEYS[1], 1, ARGV[1]) == 1 then
+    redis.call("lpush", KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Move a claimed job from the processing list to the delayed set, scored by when to retry it
+_PARK_SCRIPT = """
+if redis.call("lrem", KEYS[1], 1, ARGV[1]) == 1 then
+    redis.call("zadd", KEYS[2], ARGV[3], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Move delayed jobs that are due back onto the queue
+_PROMOTE_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+for _, job in ipairs(due) do
+    redis.call("zrem", KEYS[1], job)
+    redis.call("lpush", KEYS[2], job)
+end
+return #due
+"""
+
+def _to_json_safe(value: Any) -> Any:
+    """Round-trip a value through JSON so it can be stored in a JSON column."""
+    return json.loads(json.dumps(value, default=str))
+
+def _serialize_event(event: Event) -> Dict[str, Any]:
+    """Convert an event row into the context dict agents expect."""
+    data = {}
+    for column in Event.__table__.columns:
+        value = getattr(event, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, (datetime, date)) else value
+    return data
+
+class AgentExecutionEngine:
+    """Redis-backed queue and async worker pool for agent workflows."""
+    
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        queue_name: str = "agent_jobs",
+        worker_count: int = 4,
+        max_runs_per_tenant: int = 4,
+        progress_sync_interval: float = 2.0,
+        lease_seconds: int = 60,
+        stale_run_seconds: int = 3600,
+        wait_retry_seconds: float = 2.0,
+        max_wait_retry_seconds: float = 30.0
+    ):
+        self.redis = redis_client
+        self.queue_name = queue_name
+        self.worker_count = worker_count
+        self.max_runs_per_tenant = max_runs_per_tenant
+        self.progress_sync_interval = progress_sync_interval
+        self.lease_seconds = lease_seconds
+        self.stale_run_seconds = stale_run_seconds
+        self.wait_retry_seconds = wait_retry_seconds
+        self.max_wait_retry_seconds = max_wait_retry_seconds
+        self.processing_name = f"{queue_name}:processing"
+        self.delayed_name = f"{queue_name}:delayed"
+        self._reap_suspects: set = set()
+        self._last_reap = 0.0
+        self._workers: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+    
+    def _tenant_key(self, tenant_id: Optional[str]) -> str:
+        return f"{self.queue_name}:leases:{tenant_id or 'default'}"
+    
+    async def _acquire_lease(self, tenant_key: str, job_id: str) -> bool:
+        """Take one of the tenant's run slots for a job."""
+        now = time.time()
+        acquired = await self.redis.eval(
+            _ACQUIRE_LEASE_SCRIPT, 1, tenant_key,
+            now, self.max_runs_per_tenant, now + self.lease_seconds, job_id, self.lease_seconds * 2
+        )
+        return bool(acquired)
+    
+    async def _hold_lease(self, tenant_key: str, job_id: str):
+        """Keep renewing a job's lease while it runs."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.redis.zadd(tenant_key, {job_id: time.time() + self.lease_seconds}, xx=True)
+                await self.redis.expire(tenant_key, self.lease_seconds * 2)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to renew run lease of job {job_id}: {str(e)}")
+    
+    async def _requeue(self, raw: str, job: Optional[Dict[str, Any]] = None) -> bool:
+        """Put a claimed job back on the queue, optionally rewritten.
+        
+        The requeued copy gets a new job_id, so its processing entry and lease never
+        collide with the claim being handed back, whose cleanup may still be pending.
+        """
+        job = {**(job if job is not None else json.loads(raw)), "job_id": uuid.uuid4().hex}
+        requeued = await self.redis.eval(
+            _REQUEUE_SCRIPT, 2, self.processing_name, self.queue_name, raw, json.dumps(job)
+        )
+        return bool(requeued)
+    
+    async def _park(self, raw: str, job: Dict[str, Any], delay: float) -> bool:
+        """Hand a claimed job back to be retried after a delay, with a new job_id."""
+        job = {**job, "job_id": uuid.uuid4().hex}
+        parked = await self.redis.eval(
+            _PARK_SCRIPT, 2, self.processing_name, self.delayed_name,
+            raw, json.dumps(job), time.time() + delay
+        )
+        return bool(parked)
+    
+    async def _promote_due_jobs(self, batch_size: int = 100) -> int:
+        """Move parked jobs whose retry time has passed back onto the queue."""
+        return await self.redis.eval(
+            _PROMOTE_SCRIPT, 2, self.delayed_name, self.queue_name, time.time(), batch_size
+        )
+    
+    async def _reap_abandoned_jobs(self):
+        """Requeue claimed jobs whose worker stopped renewing their lease."""
+        now = time.time()
+        suspects = set()
+        for raw in await self.redis.lrange(self.processing_name, 0, -1):
+            job = json.loads(raw)
+            expires = await self.redis.zscore(self._tenant_key(job.get("tenant_id")), job.get("job_id") or job["agent_id"])
+            if expires is not None and expires >= now:
+                continue
+            if expires is None and raw not in self._reap_suspects:
+                # May have been claimed a moment ago and not leased yet; check again next pass
+                suspects.add(raw)
+                continue
+            
+            resume = job.get("resume", False) or settings.CHECKPOINTS_ENABLED
+            if await self._requeue(raw, {**job, "resume": resume}):
+                logger.warning(f"Requeued run of agent {job.get('agent_id')} abandoned by a stopped worker")
+        self._reap_suspects = suspects
+    
+    async def enqueue(
+        self,
+        agent_id: str,
+        agent_type: str,
+        event_id: str,
+        tenant_id: Optional[str],
+        resume: bool = False,
+        wait_for: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Queue an agent run for the worker pool.
+        
+        Resume runs skip checkpointed steps. The run is held back while any agent in
+        wait_for is still running, so it reads their new results.
+        """
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "agent_id": agent_id,
+            "agent_type": agent_type,
+            "event_id": event_id,
+            "tenant_id": tenant_id,
+            "resume": resume,
+            "wait_for": wait_for or [],
+            "enqueued_at": datetime.utcnow().isoformat()
+        }
+        await self.redis.lpush(self.queue_name, json.dumps(job))
+        logger.info(f"Queued {agent_type} agent {agent_id} for event {event_id}")
+        return job
+    
+    async def start(self):
+        """Start the worker tasks in the current event loop."""
+        self._stopping.clear()
+        self._workers.append(asyncio.create_task(self._maintain()))
+        for index in range(self.worker_count):
+            self._workers.append(asyncio.create_task(self._worker(index)))
+        logger.info(f"Started {self.worker_count} agent workers on queue {self.queue_name}")
+    
+    async def stop(self, timeout: float = 30.0):
+        """Stop taking new jobs and wait for in-flight runs, cancelling them after the timeout."""
+        self._stopping.set()
+        if not self._workers:
+            return
+        
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers.clear()
+        logger.info("Stopped agent workers")
+    
+    async def _maintain(self):
+        """Release due parked jobs and reap abandoned ones until stopped."""
+        while not self._stopping.is_set():
+            try:
+                await self._promote_due_jobs()
+                if time.monotonic() - self._last_reap >= self.lease_seconds:
+                    self._last_reap = time.monotonic()
+                    await self._reap_abandoned_jobs()
+            except redis.RedisError as e:
+                logger.warning(f"Agent queue maintenance cannot reach Redis: {str(e)}")
+            await asyncio.sleep(0.5)
+    
+    async def _worker(self, index: int):
+        """Pull jobs off the queue until stopped."""
+        while not self._stopping.is_set():
+            try:
+                # Claim atomically so the job survives this worker dying mid-run
+                raw = await self.redis.blmove(self.queue_name, self.processing_name, 1, "RIGHT", "LEFT")
+            except redis.RedisError as e:
+                logger.warning(f"Agent worker {index} cannot reach Redis: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+            
+            if raw is None:
+                continue
+            
+            job = json.loads(raw)
+            job_id = job.get("job_id") or job["agent_id"]
+            tenant_key = self._tenant_key(job.get("tenant_id"))
+            
+            try:
+                if await self._waiting_on_upstream(job):
+                    # Upstream agents are still running; check again later, backing off while they run
+                    waits = job.get("waits", 0)
+                    delay = min(self.wait_retry_seconds * 2 ** waits, self.max_wait_retry_seconds)
+                    await self._park(raw, {**job, "waits": waits + 1}, delay)
+                    continue
+                if not await self._acquire_lease(tenant_key, job_id):
+                    # Tenant is at its cap; retry once a slot may have freed up
+                    await self._park(raw, job, self.wait_retry_seconds)
+                    continue
+            except Exception as e:
+                # The job stays on the processing list without a lease, so the reaper requeues it
+                logger.error(f"Agent worker {index} could not start job for agent {job.get('agent_id')}: {str(e)}")
+                continue
+            
+            lease_task = asyncio.create_task(self._hold_lease(tenant_key, job_id))
+            try:
+                await self.run_job(job)
+            except asyncio.CancelledError:
+                if settings.CHECKPOINTS_ENABLED:
+                    # Worker shutdown: requeue the run so another worker picks it up after its last completed step
+                    await self._requeue(raw, {**job, "resume": True})
+                    logger.info(f"Requeued interrupted run of agent {job.get('agent_id')} for resume")
+                raise
+            except Exception as e:
+                logger.error(f"Agent worker {index} failed job for agent {job.get('agent_id')}: {str(e)}")
+            finally:
+                lease_task.cancel()
+                await self.redis.lrem(self.processing_name, 1, raw)
+                await self.redis.zrem(tenant_key, job_id)
+    
+    async def _waiting_on_upstream(self, job: Dict[str, Any]) -> bool:
+        """Check whether any agent the job waits for is still running.
+        
+        Rows marked running that have not been updated for stale_run_seconds belong to a
+        run nothing is executing any more and do not hold the job back.
+        """
+        if not job.get("wait_for"):
+            return False
+        
+        stale_before = func.now() - timedelta(seconds=self.stale_run_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Agent.id).where(
+                    Agent.id.in_(job["wait_for"]),
+                    Agent.status == "running",
+                    func.coalesce(Agent.updated_at, Agent.started_at) > stale_before
+                ).limit(1)
+            )
+            return result.first() is not None
+    
+    async def run_job(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run one agent workflow and persist its outcome on the agent row."""
+        agent_id = job["agent_id"]
+        
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Event).where(Event.id == job["event_id"]))
+            event = result.scalar_one_or_none()
+            if event is None:
+                logger.warning(f"Skipping agent {agent_id}: event {job['event_id']} not found")
+                return None
+            
+            # Hand upstream agents' finished results to this one
+            dependencies = AGENT_DEPENDENCIES.get(job["agent_type"], ())
+            other_agents: Dict[str, Any] = {}
+            if dependencies:
+                result = await db.execute(
+                    select(Agent).where(
+                        Agent.event_id == job["event_id"],
+                        Agent.type.in_(dependencies),
+                        Agent.status == "completed"
+                    )
+                )
+                for upstream in result.scalars().all():
+                    if upstream.metadata_ and "result" in upstream.metadata_:
+                        other_agents[upstream.type] = upstream.metadata_["result"]
+            
+            context = {"event": _serialize_event(event), "other_agents": other_agents}
+        
+        agent = create_agent(job["agent_type"], agent_id, job["event_id"])
+        sync_task = asyncio.create_task(self._sync_progress(agent))
+        
+        try:
+            workflow_result = await agent.start_workflow(context, resume=job.get("resume", False))
+        except asyncio.CancelledError:
+            sync_task.cancel()
+            raise
+        except Exception as e:
+            sync_task.cancel()
+            await self._save_outcome(agent, error=str(e))
+            raise
+        
+        sync_task.cancel()
+        await self._save_outcome(agent, result=workflow_result)
+        return workflow_result
+    
+    async def _sync_progress(self, agent: BaseAgent):
+        """Periodically write the running agent's progress to its row."""
+        last_written = None
+        while True:
+            await asyncio.sleep(self.progress_sync_interval)
+            snapshot = (agent.status, agent.progress, agent.current_task)
+            if snapshot == last_written:
+                continue
+            
+            try:
+                async with AsyncSessionLocal() as db:
+                    row = await db.get(Agent, agent.agent_id)
+                    if row is not None:
+                        row.status, row.progress, row.current_task = snapshot
+                        await db.commit()
+                last_written = snapshot
+            except Exception as e:
+                logger.warning(f"Failed to sync progress for agent {agent.agent_id}: {str(e)}")
+    
+    async def _save_outcome(self, agent: BaseAgent, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Write the final status, decisions and result of a run."""
+        async with AsyncSessionLocal() as db:
+            row = await db.get(Agent, agent.agent_id)
+            if row is None:
+                return
+            
+            row.status = agent.status
+            row.progress = agent.progress
+            row.current_task = agent.current_task
+            row.decisions = _to_json_safe(agent.decisions)
+            row.completed_at = datetime.utcnow()
+            
+            metadata = dict(row.metadata_ or {})
+            if error is not None:
+                metadata["error"] = error
+            else:
+                metadata["result"] = _to_json_safe(result)
+                metadata.pop("error", None)
+            row.metadata_ = metadata
+            
+            await db.commit()
+
+# Shared engine instance
+agent_executor = AgentExecutionEngine(
+    redis_client=redis_client,
+    queue_name=settings.AGENT_QUEUE_NAME,
+    worker_count=settings.AGENT_WORKERS,
+    max_runs_per_tenant=settings.AGENT_MAX_RUNS_PER_TENANT,
+    progress_sync_interval=settings.AGENT_PROGRESS_SYNC_INTERVAL,
+    lease_seconds=settings.AGENT_LEASE_SECONDS,
+    stale_run_seconds=settings.AGENT_STALE_RUN_SECONDS,
+    wait_retry_seconds=settings.AGENT_WAIT_RETRY_SECONDS
+)
+
+async def run_worker():
+    """Run a dedicated worker process until interrupted."""
+    await activity_buffer.start()
+    await load_encodings([settings.OPENAI_MODEL, settings.ANTHROPIC_MODEL])
+    if settings.LLM_CASSETTE_RECORD_PATH:
+        cassette_recorder.start(settings.LLM_CASSETTE_RECORD_PATH)
+        add_llm_observer(cassette_recorder)
+    await agent_executor.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await agent_executor.stop()
+        await activity_buffer.stop()
+        remove_llm_observer(cassette_recorder)
+        cassette_recorder.stop()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    asyncio.run(run_worker())
@@ -0,0 +1,296 @@
+"""
+Agent Pipeline Benchmark for OrchestrateX
+
+Runs single agents or full eight-agent crews over N synthetic events against the fake
+LLM backend (no API keys, no network) and reports wall time, LLM call counts, estimated
+tokens and per-step latency percentiles.
+
+The fake backend answers each agent step with schema-valid JSON after a simulated
+lognormal latency; its latency, failure and 429 rates come from the LLM_FAKE_* settings
+and can be overridden with the flags below. The run is in-process only: agent events and
+checkpoints stay local, and activity persistence, the Redis cache tiers and the speaker
+directory (which reads the database) are off unless set otherwise in the environment.
+Rate limits, routing, coalescing and the in-process response cache behave as configured,
+so set e.g. LLM_RATE_LIMIT_ENABLED=false to measure without them.
+
+With --cassette the calls are served from a recorded cassette (LLM_CASSETTE_RECORD_PATH
+on the API or worker) instead, using real prompt and response sizes; --replay-speed 0
+replays instantly, leaving only the Python-side overhead, which --profile can break down.
+
+Usage (from backend/):
+    python scripts/benchmark_crew.py --events 20 --concurrency 5
+    python scripts/benchmark_crew.py --agent venue_scout --events 50 --latency-median 0.2
+    python scripts/benchmark_crew.py --step-latency _research_speakers=3.0:0.3 --failure-rate 0.02
+    python scripts/benchmark_crew.py --cassette recordings/run.jsonl.gz --replay-speed 0 --profile crew.prof
+"""
+
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+for name, value in {
+    "LLM_BACKEND": "fake",
+    "AGENT_EVENTS_BACKEND": "local",
+    "ACTIVITY_PERSISTENCE_ENABLED": "false",
+    "LLM_CACHE_REDIS_ENABLED": "false",
+    "LLM_SINGLEFLIGHT_REDIS_ENABLED": "false",
+    "CHECKPOINT_BACKEND": "local",
+    "SPEAKER_INDEX_ENABLED": "false"
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.core.config import settings
+from app.core.llm_clients import llm_clients
+from app.core.llm_cache import llm_cache
+from app.agents import AGENT_TYPES, CrewOrchestrator, create_agent
+from app.agents.base_agent import add_llm_observer, remove_llm_observer
+
+CITIES = [("Berlin", "Germany"), ("Lisbon", "Portugal"), ("Boston", "USA"), ("Toronto", "Canada"), ("Singapore", "Singapore"), ("Sydney", "Australia")]
+THEMES = ["AI", "Cloud", "Security", "Data", "DevOps", "Product"]
+
+def synthetic_event(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Build an event dict shaped like the one the agent executor passes to agents."""
+    city, country = rng.choice(CITIES)
+    theme = rng.choice(THEMES)
+    attendees = rng.choice([150, 300, 500, 1000, 2500])
+    start = datetime(2027, 1, 1) + timedelta(days=rng.randint(0, 364))
+    return {
+        "id": f"bench_event_{index}",
+        "name": f"{theme} Summit {city} #{index}",
+        "description": f"A {theme.lower()} conference for practitioners and leaders in {city}.",
+        "status": "planning",
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=rng.choice([1, 2, 3]))).isoformat(),
+        "city": city,
+        "country": country,
+        "expected_attendees": attendees,
+        "max_attendees": int(attendees * 1.2),
+        "budget_total": float(attendees * rng.randint(150, 600)),
+        "budget_spent": 0.0
+    }
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def parse_step_latency(entries: List[str]) -> Dict[str, Tuple[float, float]]:
+    """Parse --step-latency STEP=MEDIAN[:SIGMA] flags."""
+    step_latency = {}
+    for entry in entries:
+        step, _, spec = entry.partition("=")
+        median, _, sigma = spec.partition(":")
+        step_latency[step] = (float(median), float(sigma) if sigma else settings.LLM_FAKE_LATENCY_SIGMA)
+    return step_latency
+
+class CallRecorder:
+    """LLM call observer aggregating counts, tokens and latencies per agent step."""
+    
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+    
+    def __call__(self, call: Dict[str, Any]):
+        self.calls.append({
+            "step": f"{call['agent_type']}.{call['step']}",
+            "latency": call["latency"],
+            "prompt_tokens": call["prompt_tokens"],
+            "completion_tokens": call["completion_tokens"],
+            "cached": call["cached"],
+            "error": call["error"]
+        })
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        steps: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for call in self.calls:
+            steps[call["step"]].append(call)
+        
+        summary = {}
+        for step, calls in sorted(steps.items()):
+            latencies = [call["latency"] for call in calls]
+            summary[step] = {
+                "calls": len(calls),
+                "errors": sum(1 for call in calls if call["error"]),
+                "cached": sum(1 for call in calls if call["cached"]),
+                "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+                "completion_tokens": sum(call["completion_tokens"] for call in calls),
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99)
+            }
+        return summary
+
+async def run_event(args: argparse.Namespace, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the configured agent or crew for one event and return its timing and status."""
+    context = {"event": event, "other_agents": {}}
+    started = time.perf_counter()
+    
+    if args.agent:
+        agent = create_agent(args.agent, f"{event['id']}_{args.agent}", event["id"])
+        try:
+            await agent.start_workflow(context)
+            status = "completed"
+        except Exception:
+            status = "error"
+        return {"event_id": event["id"], "status": status, "wall_time": time.perf_counter() - started, "agents": {}}
+    
+    crew = CrewOrchestrator(event["id"])
+    outcome = await crew.run(context)
+    return {
+        "event_id": event["id"],
+        "status": outcome["status"],
+        "wall_time": outcome["wall_time"],
+        "agents": {agent_type: timing["duration"] for agent_type, timing in outcome["timings"].items()}
+    }
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.cassette:
+        settings.LLM_BACKEND = "replay"
+        settings.LLM_CASSETTE_REPLAY_PATH = args.cassette
+        settings.LLM_CASSETTE_REPLAY_SPEED = args.replay_speed
+    settings.LLM_FAKE_SEED = args.seed
+    if args.latency_median is not None:
+        settings.LLM_FAKE_LATENCY_MEDIAN = args.latency_median
+    if args.latency_sigma is not None:
+        settings.LLM_FAKE_LATENCY_SIGMA = args.latency_sigma
+    if args.failure_rate is not None:
+        settings.LLM_FAKE_FAILURE_RATE = args.failure_rate
+    if args.rate_limit_rate is not None:
+        settings.LLM_FAKE_RATE_LIMIT_RATE = args.rate_limit_rate
+    if args.no_cache:
+        settings.LLM_CACHE_ENABLED = False
+    
+    step_latency = parse_step_latency(args.step_latency)
+    clients = [client for client in (llm_clients.get_openai(), llm_clients.get_anthropic()) if client is not None]
+    for client in clients:
+        client.step_latency.update(step_latency)
+    
+    rng = random.Random(args.seed)
+    events = [synthetic_event(index, rng) for index in range(args.events)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    recorder = CallRecorder()
+    
+    async def bounded(event: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_event(args, event)
+    
+    add_llm_observer(recorder)
+    started = time.perf_counter()
+    try:
+        runs = await asyncio.gather(*(bounded(event) for event in events))
+    finally:
+        remove_llm_observer(recorder)
+    wall_time = time.perf_counter() - started
+    
+    agent_durations: Dict[str, List[float]] = defaultdict(list)
+    for event_run in runs:
+        for agent_type, duration in event_run["agents"].items():
+            agent_durations[agent_type].append(duration)
+    
+    event_times = [event_run["wall_time"] for event_run in runs]
+    steps = recorder.summary()
+    return {
+        "mode": f"agent:{args.agent}" if args.agent else "crew",
+        "events": args.events,
+        "concurrency": args.concurrency,
+        "wall_time": wall_time,
+        "completed": sum(1 for event_run in runs if event_run["status"] == "completed"),
+        "event_wall_time": {
+            "p50": percentile(event_times, 50),
+            "p95": percentile(event_times, 95),
+            "p99": percentile(event_times, 99)
+        },
+        "agents": {
+            agent_type: {"p50": percentile(durations, 50), "p95": percentile(durations, 95)}
+            for agent_type, durations in sorted(agent_durations.items())
+        },
+        "llm_calls": sum(step["calls"] for step in steps.values()),
+        "prompt_tokens": sum(step["prompt_tokens"] for step in steps.values()),
+        "completion_tokens": sum(step["completion_tokens"] for step in steps.values()),
+        "cache": llm_cache.get_stats(),
+        "cassette": clients[0].cassette.get_stats() if args.cassette else None,
+        "steps": steps
+    }
+
+def print_report(report: Dict[str, Any]):
+    print(f"{report['mode']}: {report['events']} events, concurrency {report['concurrency']}")
+    print(f"  wall time {report['wall_time']:.2f}s, {report['completed']}/{report['events']} completed")
+    print(
+        "  per event p50/p95/p99: "
+        + "/".join(f"{report['event_wall_time'][key]:.2f}s" for key in ("p50", "p95", "p99"))
+    )
+    print(
+        f"  LLM calls {report['llm_calls']}, prompt tokens {report['prompt_tokens']}, "
+        f"completion tokens {report['completion_tokens']}, cache hits {report['cache']['hits']}"
+    )
+    if report["cassette"]:
+        cassette = report["cassette"]
+        print(
+            f"  cassette: {cassette['interactions']} recorded, {cassette['prompt_hits']} exact matches, "
+            f"{cassette['step_hits']} matched by step, {cassette['misses']} misses"
+        )
+    
+    if report["agents"]:
+        print()
+        print(f"  {'agent':<24}{'p50':>9}{'p95':>9}")
+        for agent_type, timing in report["agents"].items():
+            print(f"  {agent_type:<24}{timing['p50']:>8.2f}s{timing['p95']:>8.2f}s")
+    
+    print()
+    print(f"  {'step':<58}{'calls':>7}{'errors':>8}{'tokens':>10}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for step, stats in report["steps"].items():
+        tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+        print(
+            f"  {step:<58}{stats['calls']:>7}{stats['errors']:>8}{tokens:>10}"
+            f"{stats['p50']:>8.2f}s{stats['p95']:>8.2f}s{stats['p99']:>8.2f}s"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent pipelines against the fake LLM backend.")
+    parser.add_argument("--agent", choices=sorted(AGENT_TYPES), help="Run a single agent instead of the full crew")
+    parser.add_argument("--events", type=int, default=10, help="Synthetic events to plan")
+    parser.add_argument("--concurrency", type=int, default=4, help="Events run at the same time")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic events and fake responses")
+    parser.add_argument("--latency-median", type=float, help="Median fake LLM latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, help="Lognormal spread of fake LLM latency")
+    parser.add_argument("--step-latency", action="append", default=[], metavar="STEP=MEDIAN[:SIGMA]", help="Latency override for one agent step (repeatable)")
+    parser.add_argument("--failure-rate", type=float, help="Fraction of fake calls raising a provider error")
+    parser.add_argument("--rate-limit-rate", type=float, help="Fraction of fake calls raising a 429")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the LLM response cache")
+    parser.add_argument("--cassette", help="Replay LLM calls from this recorded cassette instead of the fake backend")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Cassette replay speed (1 = recorded, 0 = instant)")
+    parser.add_argument("--profile", metavar="PATH", help="Write cProfile stats for the run to PATH")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if settings.LLM_BACKEND not in ("fake", "replay"):
+        parser.error("LLM_BACKEND must be 'fake' or 'replay' for benchmarks; unset it or use --cassette")
+    if settings.LLM_BACKEND == "replay" and not args.cassette:
+        args.cassette = settings.LLM_CASSETTE_REPLAY_PATH
+        args.replay_speed = settings.LLM_CASSETTE_REPLAY_SPEED
+    
+    if args.profile:
+        profiler = cProfile.Profile()
+        report = profiler.runcall(asyncio.run, run(args))
+        profiler.dump_stats(args.profile)
+    else:
+        report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Query Plan Benchmark for OrchestrateX
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the hot listing and queue queries twice: once with
+the indexes from migration 0002_query_indexes dropped and once with them present, and
+prints the scan types, timings and buffer counts side by side.
+
+Everything happens inside a single transaction that is rolled back, including the
+optional synthetic data set, so the database is left unchanged. DROP INDEX still takes
+an exclusive lock on the tables for the duration of the run: point this at a staging or
+scratch database, not at production.
+
+Usage (from backend/):
+    python scripts/benchmark_query_plans.py --seed-events 50000 --tenants 20
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+from typing import Dict, Any, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401
+
+MIGRATION_PATH = os.path.join(os.path.dirname(__file__), "..", "alembic", "versions", "0002_query_indexes.py")
+
+CITIES = ["Berlin", "Barcelona", "Boston", "Bangalore", "London", "Lisbon", "Toronto", "Tokyo", "Sydney", "Singapore"]
+
+QUERIES = {
+    "events_first_page": """
+        SELECT * FROM events WHERE tenant_id = :tenant_id
+        ORDER BY created_at DESC, id DESC LIMIT 11
+    """,
+    "events_by_status": """
+        SELECT * FROM events WHERE tenant_id = :tenant_id AND status = 'active'
+        ORDER BY created_at DESC, id DESC LIMIT 11
+    """,
+    "events_deep_offset": """
+        SELECT * FROM events WHERE tenant_id = :tenant_id
+        ORDER BY created_at DESC, id DESC OFFSET :deep_offset LIMIT 11
+    """,
+    "events_deep_keyset": """
+        SELECT * FROM events WHERE tenant_id = :tenant_id
+          AND (created_at, id) < (:cursor_created_at, :cursor_id)
+        ORDER BY created_at DESC, id DESC LIMIT 11
+    """,
+    "events_city_ilike": """
+        SELECT * FROM events WHERE tenant_id = :tenant_id AND city ILIKE '%ost%'
+        ORDER BY created_at DESC, id DESC LIMIT 11
+    """,
+    "agents_by_event_status_type": """
+        SELECT agents.* FROM agents JOIN events ON agents.event_id = events.id
+        WHERE events.tenant_id = :tenant_id AND agents.event_id = :event_id
+          AND agents.status = 'completed' AND agents.type = 'venue_scout'
+        ORDER BY agents.created_at DESC, agents.id DESC LIMIT 11
+    """,
+    "running_agents": """
+        SELECT id FROM agents WHERE event_id = :event_id AND status = 'running'
+    """,
+    "pending_approvals": """
+        SELECT * FROM approvals WHERE event_id = :event_id AND status = 'pending'
+        ORDER BY created_at
+    """,
+}
+
+def load_migration_indexes() -> List[Tuple[str, str, List[str], Dict[str, Any]]]:
+    """Read the index definitions straight from the migration so the two never drift."""
+    spec = importlib.util.spec_from_file_location("query_indexes_migration", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.INDEXES
+
+def create_index_sql(name: str, table: str) -> str:
+    """Render the model's declaration of a migration index as non-concurrent DDL."""
+    index = next(index for index in Base.metadata.tables[table].indexes if index.name == name)
+    sql = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    return sql.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1)
+
+async def seed(conn: AsyncConnection, events: int, tenants: int):
+    """Insert a synthetic data set (rolled back with everything else)."""
+    await conn.execute(text("""
+        INSERT INTO users (id, email, hashed_password, full_name, role, is_active, tenant_id)
+        SELECT 'bench-user-' || t, 'bench-' || t || '@example.com', 'x', 'Bench User', 'manager', true, 'bench-tenant-' || t
+        FROM generate_series(1, :tenants) AS t
+    """), {"tenants": tenants})
+    
+    await conn.execute(text("""
+        INSERT INTO events (id, name, status, start_date, end_date, city, country, created_by, tenant_id, created_at)
+        SELECT 'bench-event-' || n,
+               'Bench Event ' || n,
+               (ARRAY['planning', 'active', 'completed', 'cancelled'])[1 + n % 4],
+               now(), now() + interval '2 days',
+               (CAST(:cities AS text[]))[1 + n % :city_count],
+               'Nowhere',
+               'bench-user-' || (1 + n % :tenants),
+               'bench-tenant-' || (1 + n % :tenants),
+               now() - (n || ' minutes')::interval
+        FROM generate_series(1, :events) AS n
+    """), {"events": events, "tenants": tenants, "cities": CITIES, "city_count": len(CITIES)})
+    
+    await conn.execute(text("""
+        INSERT INTO agents (id, event_id, type, status, progress, decisions, created_at)
+        SELECT 'bench-agent-' || e || '-' || a,
+               'bench-event-' || e,
+               (ARRAY['venue_scout', 'speaker_outreach', 'sponsorship_manager', 'budget_controller',
+                      'marketing_ops', 'attendee_experience', 'logistics_travel', 'risk_compliance'])[a],
+               CASE WHEN (e + a) % 50 = 0 THEN 'running' ELSE 'completed' END,
+               100, '[]'::json, now() - (e || ' minutes')::interval
+        FROM generate_series(1, :events) AS e, generate_series(1, 8) AS a
+    """), {"events": events})
+    
+    await conn.execute(text("""
+        INSERT INTO approvals (id, event_id, agent_id, type, status, title, priority, created_at)
+        SELECT 'bench-approval-' || e || '-' || k,
+               'bench-event-' || e,
+               'bench-agent-' || e || '-1',
+               'venue_selection',
+               CASE WHEN (e + k) % 20 = 0 THEN 'pending' ELSE 'approved' END,
+               'Bench approval', 'normal', now() - (e || ' minutes')::interval
+        FROM generate_series(1, :events) AS e, generate_series(1, 3) AS k
+    """), {"events": events})
+    
+    for table in ("users", "events", "agents", "approvals"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+async def pick_parameters(conn: AsyncConnection, deep_offset: int) -> Dict[str, Any]:
+    """Pick the busiest tenant and event so the plans reflect realistic selectivity."""
+    tenant_id = (await conn.execute(text(
+        "SELECT tenant_id FROM events GROUP BY tenant_id ORDER BY count(*) DESC LIMIT 1"
+    ))).scalar()
+    event_id = (await conn.execute(text(
+        "SELECT event_id FROM agents GROUP BY event_id ORDER BY count(*) DESC LIMIT 1"
+    ))).scalar()
+    
+    deep_row = (await conn.execute(text("""
+        SELECT created_at, id FROM events WHERE tenant_id = :tenant_id
+        ORDER BY created_at DESC, id DESC OFFSET :deep_offset LIMIT 1
+    """), {"tenant_id": tenant_id, "deep_offset": deep_offset})).first()
+    if deep_row is None:
+        deep_row = (await conn.execute(text(
+            "SELECT created_at, id FROM events WHERE tenant_id = :tenant_id ORDER BY created_at, id LIMIT 1"
+        ), {"tenant_id": tenant_id})).first()
+    
+    return {
+        "tenant_id": tenant_id,
+        "event_id": event_id,
+        "deep_offset": deep_offset,
+        "cursor_created_at": deep_row.created_at if deep_row else None,
+        "cursor_id": deep_row.id if deep_row else None
+    }
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Collect the scan nodes and totals from an EXPLAIN (FORMAT JSON) plan."""
+    scans = []
+    
+    def walk(node: Dict[str, Any]):
+        if "Scan" in node["Node Type"]:
+            target = node.get("Index Name") or node.get("Relation Name", "")
+            scans.append(f"{node['Node Type']}({target})")
+        for child in node.get("Plans", []):
+            walk(child)
+    
+    walk(plan["Plan"])
+    root = plan["Plan"]
+    return {
+        "execution_ms": plan.get("Execution Time", 0.0),
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "scans": scans
+    }
+
+async def explain_all(conn: AsyncConnection, params: Dict[str, Any], repeat: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, sql in QUERIES.items():
+        best = None
+        for _ in range(repeat):
+            raw = (await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+            summary = summarize_plan(plan)
+            if best is None or summary["execution_ms"] < best["execution_ms"]:
+                best = summary
+        results[name] = best
+    return results
+
+async def run(args: argparse.Namespace):
+    indexes = load_migration_indexes()
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            if args.seed_events:
+                await seed(conn, args.seed_events, args.tenants)
+            
+            params = await pick_parameters(conn, args.deep_offset)
+            if params["tenant_id"] is None:
+                print("No events found; run with --seed-events to generate a data set.")
+                return
+            
+            # Before: none of the migration's indexes
+            savepoint = await conn.begin_nested()
+            for name, table, columns, options in indexes:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            for table in ("events", "agents", "approvals"):
+                await conn.execute(text(f"ANALYZE {table}"))
+            before = await explain_all(conn, params, args.repeat)
+            await savepoint.rollback()
+            
+            # After: every index from the migration present
+            savepoint = await conn.begin_nested()
+            for name, table, columns, options in indexes:
+                await conn.execute(text(create_index_sql(name, table)))
+            for table in ("events", "agents", "approvals"):
+                await conn.execute(text(f"ANALYZE {table}"))
+            after = await explain_all(conn, params, args.repeat)
+            await savepoint.rollback()
+        finally:
+            await transaction.rollback()
+    
+    await engine.dispose()
+    
+    if args.json:
+        print(json.dumps({"params": params, "before": before, "after": after}, indent=2, default=str))
+        return
+    
+    print(f"tenant={params['tenant_id']} event={params['event_id']} deep_offset={params['deep_offset']}")
+    print(f"{'query':32} {'before ms':>10} {'after ms':>10} {'buf before':>11} {'buf after':>10}  plan after")
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        print(
+            f"{name:32} {b['execution_ms']:>10.2f} {a['execution_ms']:>10.2f} "
+            f"{b['buffers']:>11} {a['buffers']:>10}  {', '.join(a['scans'])}"
+        )
+        print(f"{'':32} {'':>10} {'':>10} {'':>11} {'':>10}  (before: {', '.join(b['scans'])})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query plans with and without the 0002 index set.")
+    parser.add_argument("--seed-events", type=int, default=0, help="Synthetic events to insert (rolled back)")
+    parser.add_argument("--tenants", type=int, default=20, help="Tenants to spread synthetic events over")
+    parser.add_argument("--deep-offset", type=int, default=2000, help="Page depth for the offset/keyset comparison")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query; the fastest is reported")
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()